@@ -0,0 +1,37 @@
+#!/bin/sh
+# Times every context section on each fixture and stores the results in results/<fixture>.json
+# Usage: bench.sh [fixture...]
+set -e
+
+cd "$(dirname "$0")"
+make -s
+
+FIXTURES=${*:-"static pie threads heap remote"}
+PORT=${BENCH_PORT:-1234}
+mkdir -p results
+
+for fixture in $FIXTURES; do
+    echo "== $fixture"
+    export BENCH_FIXTURE=$fixture
+    export BENCH_OUTPUT=results/$fixture.json
+
+    case $fixture in
+        remote)
+            # Stand-in for a qemu-user target: the static fixture behind a gdb stub
+            if command -v qemu-x86_64 > /dev/null; then
+                qemu-x86_64 -g "$PORT" build/static &
+            else
+                gdbserver "localhost:$PORT" build/static > /dev/null &
+            fi
+            sleep 1
+            BENCH_REMOTE=localhost:$PORT gdb --batch --ex 'source gdbscript.py' build/static
+            kill $! 2> /dev/null || true
+            ;;
+        heap)
+            BENCH_TRACK_HEAP=1 gdb --batch --ex 'source gdbscript.py' --args build/heap
+            ;;
+        *)
+            gdb --batch --ex 'source gdbscript.py' --args "build/$fixture"
+            ;;
+    esac
+done
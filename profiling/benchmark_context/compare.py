@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Compares two directories of benchmark results and reports sections which got slower.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from argparse import ArgumentParser
+
+
+def parse_args():
+    parser = ArgumentParser(description="Compare context benchmark results")
+    parser.add_argument("old", help="directory with the baseline results")
+    parser.add_argument("new", help="directory with the results to check")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="new/old time ratio above which a section counts as a regression",
+    )
+    return parser.parse_args()
+
+
+def load(directory):
+    results = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as f:
+                data = json.load(f)
+            results[data["fixture"]] = data["sections"]
+    return results
+
+
+def main():
+    args = parse_args()
+    old = load(args.old)
+    new = load(args.new)
+
+    regressions = 0
+    print(f"{'fixture':<10} {'section':<14} {'run':<5} {'old ms':>9} {'new ms':>9} {'ratio':>6}")
+    for fixture, sections in new.items():
+        for section, runs in sections.items():
+            for run, stats in runs.items():
+                try:
+                    old_time = old[fixture][section][run]["time"]
+                except KeyError:
+                    continue
+                ratio = stats["time"] / old_time if old_time else float("inf")
+                marker = " <-- regression" if ratio > args.threshold else ""
+                regressions += bool(marker)
+                print(
+                    f"{fixture:<10} {section:<14} {run:<5} {old_time * 1000:9.2f} "
+                    f"{stats['time'] * 1000:9.2f} {ratio:6.2f}{marker}"
+                )
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
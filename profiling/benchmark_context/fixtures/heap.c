@@ -0,0 +1,24 @@
+#include <stdio.h>
+#include <stdlib.h>
+
+#define NUM_CHUNKS 20000
+
+void bench_point(void) {
+  __asm__ volatile("" ::: "memory");
+}
+
+int main(void) {
+  static void *chunks[NUM_CHUNKS];
+
+  for (int i = 0; i < NUM_CHUNKS; i++)
+    chunks[i] = malloc(0x10 + (i % 64) * 0x10);
+
+  // Leave holes of every size class, so all the bins get populated
+  for (int i = 0; i < NUM_CHUNKS; i += 3)
+    free(chunks[i]);
+
+  bench_point();
+
+  puts("heap");
+  return 0;
+}
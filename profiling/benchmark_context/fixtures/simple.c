@@ -0,0 +1,24 @@
+#include <stdio.h>
+#include <string.h>
+
+void bench_point(void) {
+  __asm__ volatile("" ::: "memory");
+}
+
+static int recurse(int depth, char *buf) {
+  char local[64];
+  snprintf(local, sizeof(local), "depth %d", depth);
+  strcat(buf, local);
+  if (depth == 0) {
+    bench_point();
+    return 0;
+  }
+  return recurse(depth - 1, buf) + 1;
+}
+
+int main(void) {
+  char buf[4096] = {0};
+  puts("simple");
+  recurse(16, buf);
+  return 0;
+}
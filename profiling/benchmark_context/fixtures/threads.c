@@ -0,0 +1,38 @@
+#include <pthread.h>
+#include <stdio.h>
+
+#define NUM_THREADS 32
+
+static pthread_barrier_t started;
+static pthread_barrier_t done;
+
+void bench_point(void) {
+  __asm__ volatile("" ::: "memory");
+}
+
+static void *worker(void *arg) {
+  (void)arg;
+  pthread_barrier_wait(&started);
+  pthread_barrier_wait(&done);
+  return NULL;
+}
+
+int main(void) {
+  pthread_t threads[NUM_THREADS];
+
+  pthread_barrier_init(&started, NULL, NUM_THREADS + 1);
+  pthread_barrier_init(&done, NULL, NUM_THREADS + 1);
+
+  for (int i = 0; i < NUM_THREADS; i++)
+    pthread_create(&threads[i], NULL, worker, NULL);
+
+  pthread_barrier_wait(&started);
+  bench_point();
+  pthread_barrier_wait(&done);
+
+  for (int i = 0; i < NUM_THREADS; i++)
+    pthread_join(threads[i], NULL);
+
+  puts("threads");
+  return 0;
+}
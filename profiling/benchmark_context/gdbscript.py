@@ -0,0 +1,175 @@
+"""
+Times every context section on the fixture gdb was started with and stores
+wall time, debugger call counts and cache statistics per section as JSON.
+
+Configured with environment variables, see README.md.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import io
+import json
+import os
+import subprocess
+import time
+
+import gdb
+
+import pwndbg
+import pwndbg.aglib.memory
+import pwndbg.commands.context
+import pwndbg.lib.cache
+
+FIXTURE = os.environ.get("BENCH_FIXTURE", "unknown")
+OUTPUT = os.environ.get("BENCH_OUTPUT", f"{FIXTURE}.json")
+REPEAT = int(os.environ.get("BENCH_REPEAT", "10"))
+REMOTE = os.environ.get("BENCH_REMOTE")
+TRACK_HEAP = os.environ.get("BENCH_TRACK_HEAP") == "1"
+WIDTH = 120
+
+ctx = pwndbg.commands.context
+SECTIONS = {
+    "regs": ctx.context_regs,
+    "disasm": ctx.context_disasm,
+    "stack": ctx.context_stack,
+    "backtrace": ctx.context_backtrace,
+    "code": ctx.context_code,
+    "heap_tracker": ctx.context_heap_tracker,
+    "threads": ctx.context_threads,
+}
+
+
+class DebuggerCallCounter:
+    """
+    Counts calls of the public methods of the debugger abstraction
+    (pwndbg.dbg_mod), which is where every request to the debugger goes through.
+    """
+
+    BASES = (
+        pwndbg.dbg_mod.Debugger,
+        pwndbg.dbg_mod.Process,
+        pwndbg.dbg_mod.Thread,
+        pwndbg.dbg_mod.Frame,
+        pwndbg.dbg_mod.Registers,
+        pwndbg.dbg_mod.MemoryMap,
+        pwndbg.dbg_mod.Type,
+        pwndbg.dbg_mod.Value,
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def install(self) -> None:
+        for base in self.BASES:
+            for cls in base.__subclasses__():
+                for name, attr in list(vars(cls).items()):
+                    if not name.startswith("_") and inspect.isfunction(attr):
+                        setattr(cls, name, self._wrap(attr))
+
+    def _wrap(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.count += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+
+def reset_stats() -> None:
+    for cache in pwndbg.lib.cache.ALL_CACHES:
+        cache.reset_stats()
+    pwndbg.aglib.memory.page_cache.reset_stats()
+
+
+def cache_stats() -> dict:
+    hits = sum(cache.hits for cache in pwndbg.lib.cache.ALL_CACHES)
+    misses = sum(cache.misses for cache in pwndbg.lib.cache.ALL_CACHES)
+    page_cache = pwndbg.aglib.memory.page_cache
+    return {
+        "cache_hits": hits,
+        "cache_misses": misses,
+        "cache_hit_rate": hits / (hits + misses) if hits + misses else None,
+        "page_cache_hits": page_cache.hits,
+        "page_cache_misses": page_cache.misses,
+    }
+
+
+def measure(func, counter: DebuggerCallCounter, clear: bool) -> dict:
+    if clear:
+        pwndbg.lib.cache.clear_caches()
+    reset_stats()
+    counter.count = 0
+
+    start = time.perf_counter()
+    func(target=io.StringIO(), width=WIDTH)
+    elapsed = time.perf_counter() - start
+
+    return {"time": elapsed, "debugger_calls": counter.count, **cache_stats()}
+
+
+def average(runs: list) -> dict:
+    return {
+        key: (sum(run[key] for run in runs) / len(runs) if runs[0][key] is not None else None)
+        for key in runs[0]
+    }
+
+
+def stop_at_bench_point() -> None:
+    start = "continue" if REMOTE else "run"
+    if REMOTE:
+        gdb.execute(f"target remote {REMOTE}")
+
+    if TRACK_HEAP:
+        # The tracker has to see the allocations, so it is enabled before they happen
+        gdb.execute("break main")
+        gdb.execute(start)
+        gdb.execute("track-heap enable")
+        start = "continue"
+
+    gdb.execute("break bench_point")
+    gdb.execute(start)
+    # Benchmark from the caller, so the backtrace and the code have something to show
+    gdb.execute("finish")
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(pwndbg.__file__),
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    stop_at_bench_point()
+
+    counter = DebuggerCallCounter()
+    counter.install()
+
+    results = {}
+    for name, func in SECTIONS.items():
+        cold = measure(func, counter, clear=True)
+        warm = average([measure(func, counter, clear=False) for _ in range(REPEAT)])
+        results[name] = {"cold": cold, "warm": warm}
+        print(f"{name:>14}: cold {cold['time'] * 1000:8.2f}ms, warm {warm['time'] * 1000:8.2f}ms")
+
+    with open(OUTPUT, "w") as f:
+        json.dump(
+            {
+                "fixture": FIXTURE,
+                "revision": git_revision(),
+                "repeat": REPEAT,
+                "sections": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Results saved to {OUTPUT}")
+
+
+main()
@@ -0,0 +1,9 @@
+#!/bin/sh
+# Compares the FindRangesInMemory and the chunked find_in_memory paths of the LLDB backend
+set -e
+
+cd "$(dirname "$0")"
+${CC:-cc} -O0 -g -o haystack haystack.c
+
+printf 'process launch\ncommand script import lldbscript.py\nprocess kill\nquit\n' |
+    python3 ../../pwndbg-lldb.py haystack
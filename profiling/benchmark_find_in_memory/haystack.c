@@ -0,0 +1,20 @@
+#include <signal.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define HAYSTACK_SIZE (256 << 20)
+#define NEEDLE_STRIDE (1 << 20)
+
+char *haystack;
+
+int main(void) {
+    haystack = malloc(HAYSTACK_SIZE);
+    memset(haystack, 'A', HAYSTACK_SIZE);
+
+    // One needle per MiB, at an 8-byte aligned offset
+    for (size_t i = 0; i < HAYSTACK_SIZE; i += NEEDLE_STRIDE)
+        memcpy(haystack + i + 0x1238, "PWNDBG!!", 8);
+
+    raise(SIGTRAP);
+    return 0;
+}
@@ -0,0 +1,42 @@
+import time
+
+import pwndbg
+import pwndbg.aglib.memory
+import pwndbg.aglib.symbol
+import pwndbg.aglib.vmmap
+
+HAYSTACK_SIZE = 256 << 20
+NEEDLE_STRIDE = 1 << 20
+
+inferior = pwndbg.dbg.selected_inferior()
+haystack = pwndbg.aglib.memory.u64(pwndbg.aglib.symbol.lookup_symbol_addr("haystack"))
+page = pwndbg.aglib.vmmap.find(haystack)
+
+# The whole mapping malloc() got the haystack from, like `search` would do
+start = page.start
+size = page.end - page.start
+expected = [haystack + i + 0x1238 for i in range(0, HAYSTACK_SIZE, NEEDLE_STRIDE)]
+
+
+def run(name, search):
+    begin = time.perf_counter()
+    found = list(search())
+    elapsed = time.perf_counter() - begin
+    assert found == expected, f"{name}: found {len(found)} matches, expected {len(expected)}"
+    print(f"{name:<24} {elapsed:8.3f}s")
+
+
+print(f"searching {size >> 20} MiB for {len(expected)} needles")
+for align in (1, 8):
+    print(f"align={align}")
+    run(
+        "chunked",
+        lambda: inferior._find_in_memory_chunked(bytearray(b"PWNDBG!!"), start, size, align),
+    )
+    if hasattr(inferior.process, "FindRangesInMemory"):
+        run(
+            "FindRangesInMemory",
+            lambda: inferior._find_in_memory_native(bytearray(b"PWNDBG!!"), start, size, align, -1),
+        )
+    else:
+        print("FindRangesInMemory       unavailable (needs LLDB 19.1+)")
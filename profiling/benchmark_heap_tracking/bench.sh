@@ -0,0 +1,10 @@
+#!/bin/sh
+# Times the heap tracker modes over the allocations of malloc_loop.c
+set -e
+
+cd "$(dirname "$0")"
+${CC:-cc} -O0 -g -o malloc_loop malloc_loop.c
+
+for mode in ${*:-"none full batched watch"}; do
+    BENCH_MODE=$mode gdb --batch --ex 'source gdbscript.py' --args ./malloc_loop
+done
@@ -0,0 +1,42 @@
+"""
+Runs the loop of malloc_loop.c with the heap tracker in the mode given by
+BENCH_MODE, and prints how many allocator calls per second it went through.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import gdb
+
+MODE = os.environ.get("BENCH_MODE", "batched")
+# One malloc() and one free() per iteration, plus the final frees
+NUM_EVENTS = 2 * 2000 + 32
+
+ENABLE = {
+    "none": None,
+    "full": "track-heap enable",
+    "batched": "track-heap enable --batched",
+    "watch": "track-heap enable --batched --watch-recent 4",
+}
+
+gdb.execute("set context-output /dev/null")
+gdb.execute("set pagination off")
+gdb.execute("break bench_start")
+gdb.execute("break bench_end")
+gdb.execute("run")
+
+if ENABLE[MODE]:
+    gdb.execute(ENABLE[MODE], to_string=True)
+    gdb.execute("track-heap toggle-break", to_string=True)
+
+start = time.perf_counter()
+# The full mode reports every call, keep that out of the terminal
+gdb.execute("continue", to_string=True)
+elapsed = time.perf_counter() - start
+
+if MODE in ("batched", "watch"):
+    gdb.execute("track-heap report -n 0")
+
+print(f"{MODE}: {NUM_EVENTS} calls in {elapsed:.3f}s, {NUM_EVENTS / elapsed:.0f} calls/s")
@@ -0,0 +1,30 @@
+#include <stdlib.h>
+
+#define NUM_CALLS 2000
+#define WINDOW 32
+
+void bench_start(void) {
+    __asm__ volatile("" ::: "memory");
+}
+
+void bench_end(void) {
+    __asm__ volatile("" ::: "memory");
+}
+
+int main(void) {
+    static void *chunks[WINDOW];
+
+    bench_start();
+
+    // NUM_CALLS allocations and as many frees, with a few chunks in use at all times
+    for (int i = 0; i < NUM_CALLS; i++) {
+        free(chunks[i % WINDOW]);
+        chunks[i % WINDOW] = malloc(0x10 + (i % 8) * 0x10);
+        ((char *)chunks[i % WINDOW])[0] = 1;
+    }
+    for (int i = 0; i < WINDOW; i++)
+        free(chunks[i]);
+
+    bench_end();
+    return 0;
+}
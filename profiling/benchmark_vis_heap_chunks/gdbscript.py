@@ -1,4 +1,8 @@
-import gdb, pwndbg
+import time
+
+import gdb
+
+import pwndbg
 
 pwndbg.profiling.profiler.start()
 result = gdb.execute("vis 2000", to_string=True)
@@ -7,3 +11,12 @@ pwndbg.profiling.profiler.stop('profile.prof')
 # Save result in case user wants to inspect it
 with open("result", "w") as f:
     f.write(result)
+
+# Time walking and rendering every chunk of the heap
+start = time.perf_counter()
+result = gdb.execute("vis -a", to_string=True)
+elapsed = time.perf_counter() - start
+print(f"vis -a: {result.count(chr(10))} lines in {elapsed:.3f}s")
+
+with open("result_all", "w") as f:
+    f.write(result)
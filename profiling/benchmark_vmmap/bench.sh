@@ -0,0 +1,2 @@
+#!/bin/sh
+gdb --batch --ex 'source gdbscript.py'
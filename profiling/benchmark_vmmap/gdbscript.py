@@ -0,0 +1,41 @@
+import random
+import timeit
+
+import pwndbg
+import pwndbg.lib.memory
+
+NUM_PAGES = 10_000
+NUM_LOOKUPS = 10_000
+
+random.seed(0)
+
+pages = []
+addr = 0x10000
+for _ in range(NUM_PAGES):
+    size = random.randint(1, 16) * pwndbg.lib.memory.PAGE_SIZE
+    pages.append(pwndbg.lib.memory.Page(addr, size, 4, 0))
+    # Leave random holes between mappings so that some lookups miss
+    addr += size + random.randint(0, 4) * pwndbg.lib.memory.PAGE_SIZE
+pages = tuple(pages)
+
+addresses = [random.randrange(0, addr + 0x100000) for _ in range(NUM_LOOKUPS)]
+
+
+def linear():
+    for address in addresses:
+        next((page for page in pages if address in page), None)
+
+
+def indexed():
+    index = pwndbg.lib.memory.PageIndex(pages)
+    for address in addresses:
+        index.find(address)
+
+
+check_index = pwndbg.lib.memory.PageIndex(pages)
+for address in addresses[:1000]:
+    assert next((page for page in pages if address in page), None) is check_index.find(address)
+
+print(f"{NUM_PAGES} mappings, {NUM_LOOKUPS} lookups")
+print(f"linear scan: {min(timeit.repeat(linear, repeat=3, number=1)):.4f}s")
+print(f"PageIndex (incl. build): {min(timeit.repeat(indexed, repeat=3, number=1)):.4f}s")
@@ -57,6 +57,9 @@ CapstoneMode = {4: CS_MODE_32, 8: CS_MODE_64}
 
 CapstoneSyntax = {"intel": CS_OPT_SYNTAX_INTEL, "att": CS_OPT_SYNTAX_ATT}
 
+# Maximum number of decoded instructions kept by `decode_instruction`
+DECODE_CACHE_SIZE = 0x4000
+
 # For variable-instruction-width architectures
 # (x86 and amd64), we keep a cache of instruction
 # sizes, and where the end of the instruction falls.
@@ -90,6 +93,7 @@ next_addresses_cache: Set[int] = set()
 def enhance_cache_listener() -> None:
     # Clear the register value cache to ensure we get the correct program counter value
     pwndbg.aglib.regs.read_reg.cache.clear()  # type: ignore[attr-defined]
+    pwndbg.aglib.regs.snapshot.cache.clear()  # type: ignore[attr-defined]
 
     if pwndbg.aglib.regs.pc not in next_addresses_cache:
         # Clear the enhanced instruction cache to ensure we don't use stale values
@@ -211,18 +215,34 @@ def get_one_instruction(
     md = get_disassembler(address)
     size = VariableInstructionSizeMax.get(pwndbg.aglib.arch.name, 4)
     data = pwndbg.aglib.memory.read(address, size, partial=True)
-    for ins in md.disasm(bytes(data), address, 1):
-        pwn_ins: PwndbgInstruction = PwndbgInstructionImpl(ins)
+    ins = decode_instruction(md, address, bytes(data))
+    if ins is None:
+        return None
+
+    pwn_ins: PwndbgInstruction = PwndbgInstructionImpl(ins)
+
+    if enhance:
+        pwndbg.aglib.disasm.arch.DisassemblyAssistant.enhance(pwn_ins, emu)
 
-        if enhance:
-            pwndbg.aglib.disasm.arch.DisassemblyAssistant.enhance(pwn_ins, emu)
+    if put_cache:
+        computed_instruction_cache[address] = pwn_ins
 
-        if put_cache:
-            computed_instruction_cache[address] = pwn_ins
+    return pwn_ins
 
-        return pwn_ins
 
-    # Make linter happy. This shouldn't occur as md.disasm would crash first.
+@pwndbg.lib.cache.cache_until("objfile", maxsize=DECODE_CACHE_SIZE)
+def decode_instruction(md: Cs, address: int, code: bytes) -> CsInsn | None:
+    """
+    Decodes the instruction at `address` from `code`.
+
+    Unlike the enhanced instructions in `computed_instruction_cache`, the decoding only
+    depends on the disassembler (architecture and mode), the address and the code bytes,
+    which are all part of the cache key. The result therefore stays valid across
+    continues and is recomputed automatically when the code is modified.
+    """
+    for ins in md.disasm(code, address, 1):
+        return ins
+
     return None
 
 
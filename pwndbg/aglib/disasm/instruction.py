@@ -217,10 +217,13 @@ class PwndbgInstructionImpl(PwndbgInstruction):
         # For ease, for x86 we will assume Intel syntax (destination operand first).
         # However, Capstone will disassemble using the `set disassembly-flavor` preference,
         # and the order of operands are read left to right into the .operands array. So we flip operand order if AT&T
+        # The Capstone instruction may be shared with other instances through the decoding cache,
+        # so the order is flipped in a copy
+        cs_operands = list(self.cs_insn.operands)
         if self.cs_insn._cs.syntax == CS_OPT_SYNTAX_ATT:
-            self.cs_insn.operands.reverse()
+            cs_operands.reverse()
 
-        self.operands: List[EnhancedOperand] = [EnhancedOperand(op) for op in self.cs_insn.operands]
+        self.operands: List[EnhancedOperand] = [EnhancedOperand(op) for op in cs_operands]
 
         # ***********
         # The following member variables are set during instruction enhancement
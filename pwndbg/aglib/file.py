@@ -127,6 +127,14 @@ def get(path: str) -> bytes:
             return f.read()
     except Exception:
         return b""
+    finally:
+        # Files downloaded from a remote target are only needed for this read,
+        # and files like /proc/$tid/maps are downloaded again on every stop
+        if _remote_files_dir is not None and os.path.dirname(local_path) == _remote_files_dir:
+            try:
+                os.remove(local_path)
+            except OSError:
+                pass
 
 
 def readlink(path: str) -> str:
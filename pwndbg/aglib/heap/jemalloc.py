@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import bisect
 from typing import Dict
+from typing import List
 
+import pwndbg.aglib.arch
 import pwndbg.aglib.memory
 import pwndbg.aglib.symbol
 import pwndbg.aglib.typeinfo
+import pwndbg.lib.cache
+import pwndbg.lib.memory
 
 # adapted from jemalloc source 5.3.0
 LG_VADDR = 48
@@ -181,6 +186,127 @@ rtree_levels = [
 ]
 
 
+@pwndbg.lib.cache.cache_until("start", "objfile")
+def load_type(name: str) -> pwndbg.dbg_mod.Type:
+    """
+    Loads one of the jemalloc structure types, raising an error if it's missing.
+    """
+    ty = pwndbg.aglib.typeinfo.load(name)
+    if ty is None:
+        raise pwndbg.dbg_mod.Error(f"{name.split()[-1]} type not found")
+    return ty
+
+
+def leaf_edata(le_bits: int) -> int:
+    """
+    Returns the address of the extent (edata) stored in the bits of an rtree leaf element.
+    """
+    # e_addr is 64 bits but
+    # e_addr is also page (4096) aligned which means last 12 bits are zero and therefore unused
+    # In rtree, each layer can be accessed using bits 0-16, 17-33 and 34-51
+    # When height of rtree is 3, level 1 can be accessed using bits 0-16, and so on for level 2 and 3
+    # When the height is 2, 0-15 bits are unused and level 1 can be accessed using bits 16-33 and level 2 using 34-51
+    ls = (le_bits << RTREE_NHIB) & ((2**64) - 1)
+    return ((ls >> RTREE_NHIB) >> 1) << 1
+
+
+def read_elements(address: int, count: int, size: int) -> List[int]:
+    """
+    Reads an array of `count` rtree elements of `size` bytes at once, and returns
+    the non-zero pointers they start with.
+
+    Most of the rtree is zeroes, so blocks of elements which are all zero are
+    skipped without being decoded.
+    """
+    data = pwndbg.aglib.memory.read(address, count * size)
+    ptrsize = pwndbg.aglib.arch.ptrsize
+    endian = pwndbg.aglib.arch.endian
+
+    block_size = size * 512
+    zeroes = bytes(block_size)
+    view = memoryview(data)
+
+    values: List[int] = []
+    for start in range(0, len(view), block_size):
+        block = view[start : start + block_size]
+        if block == zeroes[: len(block)]:
+            continue
+        words = pwndbg.lib.memory.unpack_words(block, ptrsize, endian, step=size)
+        values += [word for word in words if word]
+    return values
+
+
+class ExtentMap:
+    """
+    The extents found in the rtree, with a lookup of the extent which manages an address.
+    """
+
+    def __init__(self, extents: List[Extent]) -> None:
+        self.extents = extents
+
+        spans = sorted(
+            ((extent.allocated_address, extent.size, extent) for extent in extents),
+            key=lambda span: span[0],
+        )
+        self._starts = [start for start, _, _ in spans]
+        self._ends = [start + size for start, size, _ in spans]
+        self._sorted = [extent for _, _, extent in spans]
+
+    def find(self, addr: int) -> Extent | None:
+        """
+        Returns the extent whose memory contains `addr`, if any.
+        """
+        i = bisect.bisect_right(self._starts, addr) - 1
+        if i >= 0 and addr < self._ends[i]:
+            return self._sorted[i]
+        return None
+
+
+@pwndbg.lib.cache.cache_until("stop")
+def extent_map(root_address: int) -> ExtentMap:
+    """
+    Walks the whole rtree whose root is at `root_address`, reading every node
+    and leaf at once, and returns the extents it references. The result is
+    kept until the next stop.
+    """
+    extents: Dict[int, Extent] = {}
+    try:
+        node_size = load_type("struct rtree_node_elm_s").sizeof
+        leaf_size = load_type("struct rtree_leaf_elm_s").sizeof
+        levels = rtree_levels[RTREE_HEIGHT - 1]
+
+        seen = set()
+        for leaf0 in read_elements(root_address, 1 << levels[0]["bits"], node_size):
+            try:
+                leaves = read_elements(leaf0, 1 << levels[1]["bits"], leaf_size)
+            except pwndbg.dbg_mod.Error:
+                continue
+
+            for le_bits in leaves:
+                ptr = leaf_edata(le_bits)
+
+                # Every page of an extent may point at it
+                if ptr == 0 or ptr in seen:
+                    continue
+                seen.add(ptr)
+
+                extent = Extent(ptr)
+
+                # during initializations, addresses may get some alignment
+                # lets check if size makes sense, otherwise do page alignment and check if again
+                # TODO: better way to do this
+                if extent.size == 0:
+                    extent_tmp = Extent(RTree.alignment_addr2base(ptr))
+                    if extent_tmp.size != 0:
+                        extent = extent_tmp
+
+                extents.setdefault(extent.extent_address, extent)
+    except pwndbg.dbg_mod.Error:
+        pass
+
+    return ExtentMap(list(extents.values()))
+
+
 class RTree:
     """
     RTree is used by jemalloc to keep track of extents that are allocated by jemalloc.
@@ -193,9 +319,7 @@ class RTree:
     def __init__(self, addr: int) -> None:
         self._addr = addr
 
-        rtree_s = pwndbg.aglib.typeinfo.load("struct rtree_s")
-        if rtree_s is None:
-            raise pwndbg.dbg_mod.Error("rtree_s type not found")
+        rtree_s = load_type("struct rtree_s")
 
         # self._Value = pwndbg.aglib.memory.poi(emap_s, self._addr)
 
@@ -203,9 +327,7 @@ class RTree:
         #     "rtree_s", self._addr, include_only_fields={"root"}
         # )
         # pwndbg.aglib.memory
-        self._Value = pwndbg.aglib.memory.get_typed_pointer_value("struct rtree_s", self._addr)
-
-        self._extents = None
+        self._Value = pwndbg.aglib.memory.get_typed_pointer_value(rtree_s, self._addr)
 
     @staticmethod
     def get_rtree() -> RTree:
@@ -251,7 +373,7 @@ class RTree:
         return (key >> shiftbits) & mask
 
     @staticmethod
-    def __alignment_addr2base(addr, alignment=64):
+    def alignment_addr2base(addr, alignment=64):
         return addr - (addr - (addr & (~(alignment - 1))))
 
     def lookup_hard(self, key: int):
@@ -261,12 +383,8 @@ class RTree:
         How it works:
         - Jemalloc stores the extent address in the rtree as a node and to find a specific node we need a address key.
         """
-        rtree_node_elm_s = pwndbg.aglib.typeinfo.load("struct rtree_node_elm_s")
-        if rtree_node_elm_s is None:
-            raise pwndbg.dbg_mod.Error("rtree_node_elm_s type not found")
-        rtree_leaf_elm_s = pwndbg.aglib.typeinfo.load("struct rtree_leaf_elm_s")
-        if rtree_leaf_elm_s is None:
-            raise pwndbg.dbg_mod.Error("rtree_leaf_elm_s type not found")
+        rtree_node_elm_s = load_type("struct rtree_node_elm_s")
+        rtree_leaf_elm_s = load_type("struct rtree_leaf_elm_s")
 
         # Credits: 盏一's jegdb
         # https://web.archive.org/web/20221114090949/https://github.com/hidva/hidva.github.io/blob/dev/_drafts/jegdb.py
@@ -275,9 +393,7 @@ class RTree:
         subkey = self.__subkey(key, 1)
 
         addr = int(self.root.address) + subkey * rtree_node_elm_s.sizeof
-        fetched_struct = pwndbg.aglib.memory.get_typed_pointer_value(
-            "struct rtree_node_elm_s", addr
-        )
+        fetched_struct = pwndbg.aglib.memory.get_typed_pointer_value(rtree_node_elm_s, addr)
         child_repr = int(fetched_struct["child"]["repr"])
 
         # on node element, child contains the bits with which we can find another node or leaf element
@@ -287,9 +403,7 @@ class RTree:
         # For subkey 1
         subkey = self.__subkey(key, 2)
         addr = child_repr + subkey * rtree_leaf_elm_s.sizeof
-        fetched_struct = pwndbg.aglib.memory.get_typed_pointer_value(
-            "struct rtree_leaf_elm_s", addr
-        )
+        fetched_struct = pwndbg.aglib.memory.get_typed_pointer_value(rtree_leaf_elm_s, addr)
 
         # On leaf element, le_bits contains the virtual memory address bits so we can use it to find the extent address
         val = int(fetched_struct["le_bits"]["repr"])
@@ -298,15 +412,7 @@ class RTree:
 
         # In this function, we are trying to find the extent address given the address of memory block
         # that this extent is managing (which is represented by edata->e_addr in the extent structure)
-
-        # e_addr is 64 bits but
-        # e_addr is also page (4096) aligned which means last 12 bits are zero and therefore unused
-        # In rtree, each layer can be accessed using bits 0-16, 17-33 and 34-51
-        # When height of rtree is 3, level 1 can be accessed using bits 0-16, and so on for level 2 and 3
-        # When the height is 2, 0-15 bits are unused and level 1 can be accessed using bits 16-33 and level 2 using 34-51
-
-        ls = (val << RTREE_NHIB) & ((2**64) - 1)
-        ptr = ((ls >> RTREE_NHIB) >> 1) << 1
+        ptr = leaf_edata(val)
 
         if ptr == 0:
             return None
@@ -314,93 +420,28 @@ class RTree:
         # return Extent(ptr)
         extent = Extent(ptr)
         if extent.size == 0:
-            ptr = RTree.__alignment_addr2base(ptr)
+            ptr = RTree.alignment_addr2base(ptr)
             extent_tmp = Extent(ptr)
             if extent_tmp.size != 0:
                 return extent_tmp
 
         return extent
 
-    @property
-    def extents(self):
-        # NOTE: Generating whole extents list is slow as it requires parsing whole rtree
-
-        if self._extents is None:  # TODO: handling cache on extents changes
-            self._extents = []
-            try:
-                root = self.root
-                last_addr = None
-                extent_addresses = []
-
-                rtree_node_elm_s = pwndbg.aglib.typeinfo.load("struct rtree_node_elm_s")
-                if rtree_node_elm_s is None:
-                    raise pwndbg.dbg_mod.Error("rtree_node_elm_s type not found")
-                rtree_leaf_elm_s = pwndbg.aglib.typeinfo.load("struct rtree_leaf_elm_s")
-                if rtree_leaf_elm_s is None:
-                    raise pwndbg.dbg_mod.Error("rtree_leaf_elm_s type not found")
-
-                max_subkeys = 1 << rtree_levels[RTREE_HEIGHT - 1][0]["bits"]
-                # print("max_subkeys: ", max_subkeys)
-
-                for i in range(max_subkeys):
-                    node_address = int(root.address) + i * rtree_node_elm_s.sizeof
-                    # node = pwndbg.aglib.memory.poi(rtree_node_elm_s, node)
-                    fetched_struct = pwndbg.aglib.memory.get_typed_pointer_value(
-                        rtree_node_elm_s, node_address
-                    )
-                    leaf0 = int(fetched_struct["child"]["repr"])
-                    if leaf0 == 0:
-                        continue
-
-                    # print(hex(leaf0))
-                    # print("leaf0: ", leaf0)
-
-                    # level 1
-                    for j in range(max_subkeys):
-                        leaf_address = leaf0 + j * rtree_leaf_elm_s.sizeof
-                        # leaf = pwndbg.aglib.memory.poi(rtree_leaf_elm_s, leaf)
-                        fetched_struct = pwndbg.aglib.memory.get_typed_pointer_value(
-                            rtree_leaf_elm_s, leaf_address
-                        )
-                        val = int(fetched_struct["le_bits"]["repr"])
-                        if val == 0:
-                            continue
-
-                        # print("leaf: ", hex(leaf_address))
-                        # print(j, leaf)
-
-                        ls = (val << RTREE_NHIB) & ((2**64) - 1)
-                        ptr = ((ls >> RTREE_NHIB) >> 1) << 1
-
-                        if ptr == 0 or ptr == last_addr:
-                            continue
-
-                        last_addr = ptr
-
-                        extent = Extent(ptr)
-
-                        if extent.extent_address in extent_addresses:
-                            continue
-
-                        extent_addresses.append(extent.extent_address)
-
-                        # during initializations, addresses may get some alignment
-                        # lets check if size makes sense, otherwise do page alignment and check if again
-                        # TODO: better way to do this
-                        extent_tmp = extent
-                        if extent.size == 0:
-                            ptr = RTree.__alignment_addr2base(int(ptr))
-                            extent_tmp = Extent(ptr)
-                            if extent_tmp.size != 0:
-                                self._extents.append(extent_tmp)
-                                continue
-
-                        self._extents.append(extent_tmp)
+    def find_extent(self, addr: int) -> Extent | None:
+        """
+        Returns the extent which manages the memory at `addr`. Unlike `lookup_hard`,
+        this also finds large extents from pointers past their first page, which
+        the rtree doesn't map.
+        """
+        return self.extent_map.find(addr) or self.lookup_hard(addr)
 
-            except pwndbg.dbg_mod.Error:
-                pass
+    @property
+    def extent_map(self) -> ExtentMap:
+        return extent_map(int(self.root.address))
 
-        return self._extents
+    @property
+    def extents(self) -> List[Extent]:
+        return self.extent_map.extents
 
 
 class Extent:
@@ -417,7 +458,9 @@ class Extent:
         self._addr = addr
 
         # fetch_struct_as_dictionary does not support union currently
-        self._Value = pwndbg.aglib.memory.get_typed_pointer_value("struct edata_s", self._addr)
+        self._Value = pwndbg.aglib.memory.get_typed_pointer_value(
+            load_type("struct edata_s"), self._addr
+        )
 
         self._bitfields = None
 
@@ -17,7 +17,9 @@ from typing import Any
 from typing import Callable
 from typing import Dict
 from typing import Generic
+from typing import Iterable
 from typing import List
+from typing import NamedTuple
 from typing import OrderedDict as OrderedDictType
 from typing import Set
 from typing import Tuple
@@ -130,7 +132,11 @@ class Bins:
 
     # TODO: There's a bunch of bin-specific logic in here, maybe we should
     # subclass and put that logic in there
-    def contains_chunk(self, size: int, chunk: int):
+    def lookup_key(self, size: int, chunk: int) -> Tuple[int | str, int]:
+        """
+        Returns the key of the bin a chunk of this size would be in, and the
+        address the bin would hold for the chunk.
+        """
         # TODO: It will be the same thing, but it would be better if we used
         # pwndbg.aglib.heap.current.size_sz. I think each bin should already have a
         # reference to the allocator and shouldn't need to access the `current`
@@ -161,12 +167,77 @@ class Bins:
             # TODO: Can we use chunk_key_offset?
             chunk += ptr_size * 2
 
-        if size in self.bins:
-            return self.bins[size].contains_chunk(chunk)
+        return size, chunk
+
+    def contains_chunk(self, size: int, chunk: int) -> bool:
+        key, chunk = self.lookup_key(size, chunk)
+
+        if key in self.bins:
+            return self.bins[key].contains_chunk(chunk)
 
         return False
 
 
+class BinEntry(NamedTuple):
+    """Where an address was found in the bins."""
+
+    bin_type: BinType
+    #: The key of the bin in `Bins.bins`
+    size: int | str
+    #: The position of the address in the fd chain of the bin
+    index: int
+    #: The number of chunks in the bin, for tcache bins
+    count: int | None
+
+
+class FreeChunkIndex:
+    """
+    Every address found in the fd chains of a few `Bins`, mapped to where it was found.
+
+    The bins are traversed once, so that checking whether a chunk is free takes a
+    dictionary lookup instead of a scan of every bin.
+    """
+
+    def __init__(self, collections: Iterable[Bins | None]) -> None:
+        self.collections = [bins for bins in collections if bins is not None]
+        self.entries: Dict[int, List[BinEntry]] = {}
+
+        for bins in self.collections:
+            for size, b in bins.bins.items():
+                count = b.count if bins.bin_type == BinType.TCACHE else None
+                seen: Set[int] = set()
+                for index, address in enumerate(b.fd_chain):
+                    # Chains may loop, only the first position is of interest
+                    if address in seen:
+                        continue
+                    seen.add(address)
+                    self.entries.setdefault(address, []).append(
+                        BinEntry(bins.bin_type, size, index, count)
+                    )
+
+    def get(self, address: int) -> List[BinEntry]:
+        """Returns where the address was found, in the order the bins were traversed."""
+        return self.entries.get(address, [])
+
+    def bins_containing(self, size: int, chunk: int) -> List[BinType]:
+        """
+        Returns the types of the bins which contain the chunk, i.e. for which
+        `Bins.contains_chunk` would return True.
+        """
+        found: List[BinType] = []
+        for bins in self.collections:
+            key, address = bins.lookup_key(size, chunk)
+            if any(
+                entry.bin_type == bins.bin_type and entry.size == key
+                for entry in self.entries.get(address, ())
+            ):
+                found.append(bins.bin_type)
+        return found
+
+    def contains_chunk(self, size: int, chunk: int) -> bool:
+        return bool(self.bins_containing(size, chunk))
+
+
 def heap_for_ptr(ptr: int) -> int:
     """Round a pointer to a chunk down to find its corresponding heap_info
     struct, the pointer must point inside a heap which does not belong to
@@ -1225,6 +1296,29 @@ class GlibcMemoryAllocator(pwndbg.aglib.heap.heap.MemoryAllocator, Generic[TheTy
         else:
             return None
 
+    @pwndbg.lib.cache.cache_until("stop", "thread")
+    def free_chunks(self, arena_addr: int | None = None) -> FreeChunkIndex:
+        """
+        Returns an index of the free chunks of the arena at `arena_addr` (the
+        arena of the current thread by default), built with one traversal of the
+        tcache of the current thread and of the fast, unsorted, small and large
+        bins of the arena, in that order.
+
+        The index is kept until the next stop.
+        """
+        collections: List[Bins | None] = []
+        if self.has_tcache():
+            # Only the tcache of the current thread is known, it's difficult
+            # (impossible?) to find all the thread caches for a specific heap.
+            collections.append(self.tcachebins(None))
+        collections += [
+            self.fastbins(arena_addr),
+            self.unsortedbin(arena_addr),
+            self.smallbins(arena_addr),
+            self.largebins(arena_addr),
+        ]
+        return FreeChunkIndex(collections)
+
     def fastbin_index(self, size: int):
         if pwndbg.aglib.arch.ptrsize == 8:
             return (size >> 4) - 2
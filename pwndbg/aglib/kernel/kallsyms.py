@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
 from re import match
 from re import search
 from struct import unpack_from
@@ -10,19 +13,98 @@ from pwnlib.util.packing import p16
 from pwnlib.util.packing import u32
 from pwnlib.util.packing import u64
 
+import pwndbg
 import pwndbg.aglib
+import pwndbg.aglib.arch
 import pwndbg.aglib.kernel
 import pwndbg.aglib.memory
 import pwndbg.color.message as M
 import pwndbg.commands
 import pwndbg.lib.cache
+import pwndbg.lib.kernel.kallsyms
+import pwndbg.lib.tempfile
 import pwndbg.search
 
+log = logging.getLogger(__name__)
+
+kallsyms_cache = pwndbg.config.add_param(
+    "kallsyms-cache",
+    True,
+    "whether to store the parsed kallsyms on disk and reuse them for the same kernel",
+    help_docstring="""\
+The symbol table recovered from kallsyms is saved in the pwndbg cache directory,
+keyed by the kernel version banner, and loaded in later sessions instead of
+parsing the kernel memory again. The addresses are moved to the current kernel
+base, so the index stays valid when KASLR is enabled.
+""",
+)
+
+
+def _index_path() -> str:
+    # The banner contains the version, build number, compiler and build time,
+    # so it identifies a kernel build without reading the whole image
+    key = f"{pwndbg.aglib.arch.name}:{pwndbg.aglib.kernel.kversion()}"
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return os.path.join(pwndbg.lib.tempfile.cachedir("kallsyms"), digest)
+
+
+def _load_index(path: str, kbase: int) -> pwndbg.lib.kernel.kallsyms.SymbolIndex | None:
+    try:
+        idx = pwndbg.lib.kernel.kallsyms.SymbolIndex.load(path)
+    except (OSError, ValueError):
+        return None
+
+    idx = idx.rebase(kbase)
+
+    # Sanity check that the index describes the kernel we are debugging
+    banner = idx.address("linux_banner")
+    if banner is not None:
+        try:
+            if pwndbg.aglib.memory.read(banner, 13) != b"Linux version":
+                return None
+        except pwndbg.dbg_mod.Error:
+            return None
+
+    return idx
+
 
 @pwndbg.lib.cache.cache_until("start")
-def get() -> Dict[str, Tuple[int, str]]:
+def index() -> pwndbg.lib.kernel.kallsyms.SymbolIndex:
+    """
+    Returns the kernel symbols recovered from kallsyms, sorted by address.
+    """
+    kbase = pwndbg.aglib.kernel.kbase()
+    path = _index_path() if kallsyms_cache and kbase is not None else None
+
+    if path is not None:
+        idx = _load_index(path, kbase)
+        if idx is not None:
+            log.debug("Loaded %d ksymbols from %s", len(idx), path)
+            return idx
+
     ks = Kallsyms()
-    return ks.kallsyms
+    idx = pwndbg.lib.kernel.kallsyms.SymbolIndex.from_symbols(ks.kallsyms, ks.kbase)
+
+    if path is not None and len(idx):
+        try:
+            idx.save(path)
+        except OSError as e:
+            print(M.warn(f"Could not save the kallsyms index to {path}: {e}"))
+
+    return idx
+
+
+@pwndbg.lib.cache.cache_until("start")
+def get() -> Dict[str, Tuple[int, str]]:
+    return index().symbols()
+
+
+def lookup(address: int) -> Tuple[str, str, int] | None:
+    """
+    Returns the name, type and offset of the kernel symbol `address` is in, see
+    `SymbolIndex.lookup`.
+    """
+    return index().lookup(address)
 
 
 class Kallsyms:
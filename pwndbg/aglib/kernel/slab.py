@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+from typing import Dict
 from typing import Generator
+from typing import Iterator
 from typing import List
 from typing import Set
+from typing import Tuple
 
 import pwndbg
+import pwndbg.aglib.arch
 import pwndbg.aglib.memory
 import pwndbg.aglib.symbol
 import pwndbg.aglib.typeinfo
+import pwndbg.lib.cache
 from pwndbg.aglib import kernel
 from pwndbg.aglib.kernel.macros import compound_head
 from pwndbg.aglib.kernel.macros import for_each_entry
@@ -80,33 +85,108 @@ def get_flags_list(flags: int) -> List[str]:
     return [flag_name for flag_name, mask in _flags.items() if flags & mask]
 
 
+@pwndbg.lib.cache.cache_until("stop")
+def read_slab_memory(start: int, size: int) -> bytes:
+    """
+    Reads the memory of a slab at once, up to the first unreadable byte. The
+    result is kept until the next stop, so that all the freelists of the slab
+    can be decoded from it.
+    """
+    try:
+        return bytes(pwndbg.aglib.memory.read(start, size, partial=True))
+    except pwndbg.dbg_mod.Error:
+        return b""
+
+
+class FreelistWalk:
+    """
+    The objects of a freelist, in order, and whether following it stopped early
+    because it loops or points to unreadable memory.
+    """
+
+    def __init__(self, objects: Tuple[int, ...], is_corrupted: bool) -> None:
+        self.objects = objects
+        self.is_corrupted = is_corrupted
+        self._next: Dict[int, int] | None = None
+
+    def find_next(self, addr: int) -> int:
+        if self._next is None:
+            self._next = dict(zip(self.objects, self.objects[1:]))
+        return self._next.get(addr, 0)
+
+
+@pwndbg.lib.cache.cache_until("stop")
+def walk_freelist(
+    start_addr: int, offset: int, random: int, region_start: int, region_size: int
+) -> FreelistWalk:
+    """
+    Follows a freelist. The next pointers of the objects inside of the slab at
+    [region_start, region_start + region_size) are decoded from one read of the
+    slab, the others are read one by one. The result is kept until the next stop.
+    """
+    data = read_slab_memory(region_start, region_size) if start_addr and region_size else b""
+    ptrsize = pwndbg.aglib.arch.ptrsize
+    endian = pwndbg.aglib.arch.endian
+
+    objects: List[int] = []
+    seen: Set[int] = set()
+    current_object = start_addr
+    while current_object:
+        if current_object in seen:
+            return FreelistWalk(tuple(objects), True)
+        seen.add(current_object)
+        objects.append(current_object)
+
+        addr = current_object + offset
+        pos = addr - region_start
+        if 0 <= pos and pos + ptrsize <= len(data):
+            current_object = int.from_bytes(data[pos : pos + ptrsize], endian)
+        else:
+            try:
+                current_object = pwndbg.aglib.memory.pvoid(addr)
+            except pwndbg.dbg_mod.Error:
+                return FreelistWalk(tuple(objects), True)
+
+        if random:
+            current_object ^= random ^ swab(addr)
+
+    return FreelistWalk(tuple(objects), False)
+
+
 class Freelist:
-    def __init__(self, start_addr: int, offset: int, random: int = 0) -> None:
+    def __init__(
+        self,
+        start_addr: int,
+        offset: int,
+        random: int = 0,
+        region: Tuple[int, int] | None = None,
+    ) -> None:
         self.start_addr = start_addr
         self.offset = offset
         self.random = random
+        # The (start, size) of the slab the objects are in, if known
+        self.region = region
+
+    @property
+    def walk(self) -> FreelistWalk:
+        region_start, region_size = self.region or (0, 0)
+        return walk_freelist(self.start_addr, self.offset, self.random, region_start, region_size)
+
+    @property
+    def is_corrupted(self) -> bool:
+        return self.walk.is_corrupted
 
-    def __iter__(self) -> Generator[int, None, None]:
-        current_object = self.start_addr
-        while current_object:
-            addr = int(current_object)
-            yield current_object
-            current_object = pwndbg.aglib.memory.pvoid(addr + self.offset)
-            if self.random:
-                current_object ^= self.random ^ swab(addr + self.offset)
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.walk.objects)
 
     def __int__(self) -> int:
         return self.start_addr
 
     def __len__(self) -> int:
-        return sum(1 for _ in self)
+        return len(self.walk.objects)
 
     def find_next(self, addr: int) -> int:
-        freelist_iter = iter(self)
-        for obj in freelist_iter:
-            if obj == addr:
-                return next(freelist_iter, 0)
-        return 0
+        return self.walk.find_next(addr)
 
 
 class SlabCache:
@@ -206,10 +286,13 @@ class CpuCache:
 
     @property
     def freelist(self) -> Freelist:
+        # The objects of the CPU freelist are in the active slab
+        active_slab = self.active_slab
         return Freelist(
             int(self._cpu_cache["freelist"]),
             self.slab_cache.offset,
             self.slab_cache.random,
+            active_slab.region if active_slab else None,
         )
 
     @property
@@ -285,6 +368,11 @@ class Slab:
         end = start + self.object_count * size
         return (i for i in range(start, end, size))
 
+    @property
+    def region(self) -> Tuple[int, int]:
+        """The start and the size of the memory of the objects"""
+        return self.virt_address, self.object_count * self.slab_cache.size
+
     @property
     def frozen(self) -> int:
         return int(self._slab["frozen"])
@@ -321,6 +409,7 @@ class Slab:
             int(self._slab["freelist"]),
             self.slab_cache.offset,
             self.slab_cache.random,
+            self.region,
         )
 
     @property
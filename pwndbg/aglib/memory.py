@@ -17,6 +17,37 @@ GdbDict = Dict[str, Union["GdbDict", int]]
 
 MMAP_MIN_ADDR = 0x8000
 
+memory_cache = pwndbg.config.add_param(
+    "memory-cache",
+    True,
+    "whether to cache inferior memory pages until the next stop",
+    help_docstring="""\
+Reads of inferior memory are served from a page-granular cache which is
+flushed on every stop, continue, thread switch and memory write. Disable this
+when debugging targets whose memory may change while they are stopped (e.g.
+MMIO regions).
+""",
+)
+
+
+def _read_uncached(addr: int, count: int) -> bytearray:
+    return pwndbg.dbg.selected_inferior().read_memory(address=addr, size=count)
+
+
+#: Snapshot of the inferior memory shared by all readers until the next stop. It
+#: is also flushed when another thread is selected, as the vCPUs of a QEMU system
+#: target may each see a different address space.
+page_cache = pwndbg.lib.memory.PageCache(_read_uncached)
+pwndbg.lib.cache.register_cache(page_cache, "stop", "cont", "start", "exit", "thread")
+
+
+def _is_page_cache_enabled() -> bool:
+    return (
+        bool(memory_cache)
+        and pwndbg.lib.cache.IS_CACHING
+        and not pwndbg.lib.cache.IS_CACHING_DISABLED_FOR["stop"]
+    )
+
 
 def read(addr: int, count: int, partial: bool = False) -> bytearray:
     """read(addr, count, partial=False) -> bytearray
@@ -32,9 +63,76 @@ def read(addr: int, count: int, partial: bool = False) -> bytearray:
         :class:`bytearray`: The memory at the specified address,
         or ``None``.
     """
+    if count > 0 and _is_page_cache_enabled():
+        data = page_cache.read(addr, count)
+        if data is not None:
+            return data
+
     return pwndbg.dbg.selected_inferior().read_memory(address=addr, size=count, partial=partial)
 
 
+def _read_int(addr: int, type: pwndbg.dbg_mod.Type, signed: bool = False) -> int:
+    """
+    Read an integer of the size of ``type`` through the page cache, without
+    creating a debugger Value.
+    """
+    if not _is_page_cache_enabled():
+        return readtype(type, addr)
+    return int.from_bytes(read(addr, type.sizeof), pwndbg.aglib.arch.endian, signed=signed)
+
+
+class RegionReader:
+    """
+    Reads the memory of ``[start, end)`` lazily, in blocks of ``block_size`` bytes,
+    so that code parsing many small structures out of a large region issues a
+    few big reads instead of one read per field.
+    """
+
+    def __init__(self, start: int, end: int, block_size: int = 0x100000) -> None:
+        self.start = start
+        self.end = end
+        self.block_size = block_size
+        self.blocks: Dict[int, bytes] = {}
+
+    def _block(self, index: int) -> bytes:
+        block = self.blocks.get(index)
+        if block is None:
+            block_start = self.start + index * self.block_size
+            size = min(self.block_size, self.end - block_start)
+            try:
+                block = bytes(read(block_start, size, partial=True))
+            except pwndbg.dbg_mod.Error:
+                block = b""
+            self.blocks[index] = block
+        return block
+
+    def read(self, addr: int, size: int) -> bytes:
+        """
+        Read ``size`` bytes at ``addr``. Raises ``pwndbg.dbg_mod.Error`` if the
+        range is outside of the region or could not be read.
+        """
+        if addr < self.start or addr + size > self.end:
+            raise pwndbg.dbg_mod.Error(f"{addr:#x} is outside of the region being read")
+
+        data = b""
+        while len(data) < size:
+            index, offset = divmod(addr + len(data) - self.start, self.block_size)
+            part = self._block(index)[offset : offset + size - len(data)]
+            if not part:
+                # Blocks are read partially, so a short block ends at unreadable memory
+                raise pwndbg.dbg_mod.Error(f"Cannot access memory at address {addr + len(data):#x}")
+            data += part
+        return data
+
+    def unpack(self, addr: int, size: int | None = None) -> int:
+        """
+        Read an unsigned integer of ``size`` bytes (pointer size by default) at ``addr``.
+        """
+        if size is None:
+            size = pwndbg.aglib.arch.ptrsize
+        return int.from_bytes(self.read(addr, size), pwndbg.aglib.arch.endian)
+
+
 def readtype(type: pwndbg.dbg_mod.Type, addr: int) -> int:
     """readtype(type, addr) -> int
 
@@ -63,6 +161,7 @@ def write(addr: int, data: str | bytes | bytearray) -> None:
     if isinstance(data, str):
         data = bytes(data, "utf8")
 
+    page_cache.invalidate(addr, len(data))
     pwndbg.dbg.selected_inferior().write_memory(address=addr, data=bytearray(data), partial=False)
 
 
@@ -156,7 +255,7 @@ def byte(addr: int) -> int:
 
     Read one byte at the specified address
     """
-    return readtype(pwndbg.aglib.typeinfo.uchar, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.uchar)
 
 
 def uchar(addr: int) -> int:
@@ -164,7 +263,7 @@ def uchar(addr: int) -> int:
 
     Read one ``unsigned char`` at the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.uchar, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.uchar)
 
 
 def ushort(addr: int) -> int:
@@ -172,7 +271,7 @@ def ushort(addr: int) -> int:
 
     Read one ``unisgned short`` at the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.ushort, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.ushort)
 
 
 def uint(addr: int) -> int:
@@ -180,7 +279,7 @@ def uint(addr: int) -> int:
 
     Read one ``unsigned int`` at the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.uint, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.uint)
 
 
 def pvoid(addr: int) -> int:
@@ -188,7 +287,7 @@ def pvoid(addr: int) -> int:
 
     Read one pointer from the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.pvoid, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.pvoid)
 
 
 def u8(addr: int) -> int:
@@ -196,7 +295,7 @@ def u8(addr: int) -> int:
 
     Read one ``uint8_t`` from the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.uint8, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.uint8)
 
 
 def u16(addr: int) -> int:
@@ -204,7 +303,7 @@ def u16(addr: int) -> int:
 
     Read one ``uint16_t`` from the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.uint16, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.uint16)
 
 
 def u32(addr: int) -> int:
@@ -212,7 +311,7 @@ def u32(addr: int) -> int:
 
     Read one ``uint32_t`` from the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.uint32, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.uint32)
 
 
 def u64(addr: int) -> int:
@@ -220,7 +319,7 @@ def u64(addr: int) -> int:
 
     Read one ``uint64_t`` from the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.uint64, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.uint64)
 
 
 def u(addr: int, size: int | None = None) -> int:
@@ -240,7 +339,7 @@ def s8(addr: int) -> int:
 
     Read one ``int8_t`` from the specified address
     """
-    return readtype(pwndbg.aglib.typeinfo.int8, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.int8, signed=True)
 
 
 def s16(addr: int) -> int:
@@ -248,7 +347,7 @@ def s16(addr: int) -> int:
 
     Read one ``int16_t`` from the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.int16, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.int16, signed=True)
 
 
 def s32(addr: int) -> int:
@@ -256,7 +355,7 @@ def s32(addr: int) -> int:
 
     Read one ``int32_t`` from the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.int32, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.int32, signed=True)
 
 
 def s64(addr: int) -> int:
@@ -264,7 +363,7 @@ def s64(addr: int) -> int:
 
     Read one ``int64_t`` from the specified address.
     """
-    return readtype(pwndbg.aglib.typeinfo.int64, addr)
+    return _read_int(addr, pwndbg.aglib.typeinfo.int64, signed=True)
 
 
 def cast_pointer(
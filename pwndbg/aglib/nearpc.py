@@ -255,21 +255,10 @@ def nearpc(
                 # Bins track free chunks, so, whether or not we can find the
                 # chunk we're trying to access in a bin will tells us whether
                 # this access is a UAF.
-                bins_list = [
-                    allocator.fastbins(chunk.arena.address),
-                    allocator.smallbins(chunk.arena.address),
-                    allocator.largebins(chunk.arena.address),
-                    allocator.unsortedbin(chunk.arena.address),
-                ]
-                if allocator.has_tcache():
-                    bins_list.append(allocator.tcachebins(None))
-
-                bins_list = [x for x in bins_list if x is not None]
-                for bins in bins_list:
-                    if bins.contains_chunk(chunk.real_size, chunk.address):
-                        # This chunk is free. This is a UAF.
-                        accesses.append(f"[UAF] {address:#x}")
-                        continue
+                free_chunks = allocator.free_chunks(chunk.arena.address)
+                if free_chunks.contains_chunk(chunk.real_size, chunk.address):
+                    # This chunk is free. This is a UAF.
+                    accesses.append(f"[UAF] {address:#x}")
             # mem_access = " ".join(accesses)
 
         opcodes = ""
@@ -0,0 +1,62 @@
+"""
+Scanning inferior memory for pointers into a set of address ranges.
+"""
+
+from __future__ import annotations
+
+from typing import Generator
+from typing import Tuple
+
+import pwndbg
+import pwndbg.aglib.arch
+import pwndbg.aglib.memory
+import pwndbg.lib.memory
+
+#: Number of bytes fetched from the inferior with a single read
+CHUNK_SIZE = 0x100000
+
+
+def scan(
+    start: int,
+    end: int,
+    targets: pwndbg.lib.memory.PageIndex,
+    step: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Generator[Tuple[int, int], None, None]:
+    """
+    Yields ``(address, value)`` for every pointer stored at ``start, start + step, ...``
+    below ``end`` whose value lies within one of the ``targets`` ranges, in address order.
+
+    The memory is read in chunks of ``chunk_size`` bytes which are matched
+    against the targets all at once. Unreadable chunks are skipped.
+    """
+    ptrsize = pwndbg.aglib.arch.ptrsize
+    endian = pwndbg.aglib.arch.endian
+    if step is None:
+        step = ptrsize
+    if not len(targets) or end - start < ptrsize:
+        return
+
+    low = targets.pages[0].start
+    high = targets.max_ends[-1]
+
+    # Keep chunks aligned to the step, so that the words of every chunk
+    # continue the sequence of offsets of the previous one
+    chunk_size = max(chunk_size // step, 1) * step
+
+    for chunk_start in range(start, end - ptrsize + 1, chunk_size):
+        # A few extra bytes are needed to decode the words starting at the end of the chunk
+        chunk_end = min(chunk_start + chunk_size + ptrsize - 1, end)
+        try:
+            data = pwndbg.aglib.memory.read(chunk_start, chunk_end - chunk_start, partial=True)
+        except pwndbg.dbg_mod.Error:
+            continue
+
+        for offset, value in pwndbg.lib.memory.find_pointers(
+            data, ptrsize, low, high, endian, step
+        ):
+            # The last few words belong to the next chunk
+            if offset >= chunk_size:
+                break
+            if targets.find(value) is not None:
+                yield chunk_start + offset, value
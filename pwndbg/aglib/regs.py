@@ -27,6 +27,7 @@ import pwndbg.lib.cache
 from pwndbg.dbg import EventType
 from pwndbg.lib.regs import BitFlags
 from pwndbg.lib.regs import RegisterSet
+from pwndbg.lib.regs import RegisterSnapshot
 from pwndbg.lib.regs import reg_sets
 
 
@@ -90,18 +91,49 @@ gsbase: int
 current: RegisterSet
 fix: Callable[[str], str]
 items: Callable[[], Generator[Tuple[str, Any], None, None]]
-previous: Dict[str, int]
-last: Dict[str, int]
+snapshot: Callable[..., RegisterSnapshot]
+previous: RegisterSnapshot
+last: RegisterSnapshot
 pc: int | None
 
+#: An empty snapshot of the registers of each architecture, whose names and
+#: index are shared by all snapshots of that architecture
+_snapshot_templates: Dict[str, RegisterSnapshot] = {}
+
+
+def _snapshot_template() -> RegisterSnapshot:
+    template = _snapshot_templates.get(pwndbg.aglib.arch.name)
+    if template is None:
+        regs = reg_sets[pwndbg.aglib.arch.name]
+        names = tuple(dict.fromkeys(regs.common + list(regs.retaddr)))
+        template = RegisterSnapshot(names, (None,) * len(names))
+        _snapshot_templates[pwndbg.aglib.arch.name] = template
+    return template
+
 
 class module(ModuleType):
-    previous: Dict[str, int] = {}
-    last: Dict[str, int] = {}
+    previous: RegisterSnapshot = RegisterSnapshot()
+    last: RegisterSnapshot = RegisterSnapshot()
 
     @pwndbg.lib.cache.cache_until("stop", "prompt")
     def read_reg(self, reg: str, frame: pwndbg.dbg_mod.Frame | None = None) -> int | None:
         reg = reg.lstrip("$")
+        registers = self.snapshot(frame)
+        if reg in registers:
+            return registers[reg]
+        return self._read_reg(reg, frame)
+
+    @pwndbg.lib.cache.cache_until("stop", "prompt")
+    def snapshot(self, frame: pwndbg.dbg_mod.Frame | None = None) -> RegisterSnapshot:
+        """
+        Returns the values of the common and return address registers of the
+        current architecture in ``frame`` (the selected frame by default), read
+        together once per stop.
+        """
+        template = _snapshot_template()
+        return template.with_values(tuple(self._read_reg(name, frame) for name in template.names))
+
+    def _read_reg(self, reg: str, frame: pwndbg.dbg_mod.Frame | None = None) -> int | None:
         try:
             value = get_register(reg, frame)
             if value is None and reg.lower() == "xpsr":
@@ -113,9 +145,10 @@ class module(ModuleType):
             )
             value = value.cast(size)
             if reg == "pc" and pwndbg.aglib.arch.name == "i8086":
-                if self.cs is None:
+                cs = self._read_reg("cs", frame)
+                if cs is None:
                     return None
-                value += self.cs * 16
+                value += cs * 16
             return int(value) & pwndbg.aglib.arch.ptrmask
         except (ValueError, pwndbg.dbg_mod.Error):
             return None
@@ -219,11 +252,7 @@ class module(ModuleType):
 
     @property
     def changed(self) -> List[str]:
-        delta: List[str] = []
-        for reg, value in self.previous.items():
-            if self[reg] != value:
-                delta.append(reg)
-        return delta
+        return self.snapshot().changed(self.previous)
 
     @property
     @pwndbg.aglib.proc.OnlyWhenQemuKernel
@@ -291,7 +320,4 @@ sys.modules[__name__] = module(__name__, "")
 def update_last() -> None:
     M: module = cast(module, sys.modules[__name__])
     M.previous = M.last
-    M.last = {k: M[k] for k in M.common}
-    # TODO: Uncomment this once the LLDB command port PR for `context` is merged
-    # if pwndbg.config.show_retaddr_reg:
-    #    M.last.update({k: M[k] for k in M.retaddr})
+    M.last = M.snapshot()
@@ -35,11 +35,7 @@ def find(address: int) -> pwndbg.lib.memory.Page | None:
     Returns a pwndbg.lib.memory.Page object which corresponds to given address stack
     or None if it does not exist
     """
-    for stack in get().values():
-        if address in stack:
-            return stack
-
-    return None
+    return _index().find(address)
 
 
 def find_upper_stack_boundary(stack_ptr: int, max_pages: int = 1024) -> int:
@@ -68,6 +64,11 @@ def get() -> Dict[int, pwndbg.lib.memory.Page]:
     return _fetch_via_exploration()
 
 
+@pwndbg.lib.cache.cache_until("stop")
+def _index() -> pwndbg.lib.memory.PageIndex:
+    return pwndbg.lib.memory.PageIndex(get().values())
+
+
 @pwndbg.lib.cache.cache_until("stop")
 def current() -> pwndbg.lib.memory.Page | None:
     """
@@ -93,7 +94,7 @@ def is_executable() -> bool:
 def _fetch_via_vmmap() -> Dict[int, pwndbg.lib.memory.Page]:
     stacks: Dict[int, pwndbg.lib.memory.Page] = {}
 
-    pages = pwndbg.aglib.vmmap.get()
+    pages = pwndbg.aglib.vmmap.index()
 
     for thread in pwndbg.dbg.selected_inferior().threads():
         with thread.bottom_frame() as frame:
@@ -104,7 +105,7 @@ def _fetch_via_vmmap() -> Dict[int, pwndbg.lib.memory.Page]:
             continue
 
         # Find the given SP in pages
-        page = next((page for page in pages if sp in page), None)
+        page = pages.find(sp)
         if not page:
             # TODO: Handle case where the page is not found;
             #  consider exploring the `sp` register using method `_fetch_via_exploration`?
@@ -6,12 +6,34 @@ the debuggee's address space.
 from __future__ import annotations
 
 import string
+from typing import Dict
+from typing import Generator
+from typing import List
+from typing import Tuple
 
 import pwndbg
 import pwndbg.aglib.memory
+import pwndbg.lib.cache
+import pwndbg.lib.memory
+import pwndbg.lib.strings
 
 length = 15
 
+#: Number of bytes read at once when extracting the strings of a mapping
+CHUNK_SIZE = 0x100000
+
+strings_index = pwndbg.config.add_param(
+    "strings-index",
+    True,
+    "whether to keep the strings found in each mapping until the next stop",
+    help_docstring="""\
+The strings command indexes the strings it finds in every mapping. Running
+it again on the same mappings, with a larger minimum length or with --grep,
+is then answered from the index without reading memory. Disable this to save
+memory when extracting the strings of very large mappings.
+""",
+)
+
 
 def update_length() -> None:
     r"""
@@ -51,3 +73,61 @@ def get(address: int, maxlen: int | None = None, maxread: int | None = None) ->
         return sz
 
     return sz[:maxlen] + "..."
+
+
+class StringTable:
+    """
+    The strings of at least ``min_length`` characters found in a mapping.
+    """
+
+    def __init__(self, min_length: int) -> None:
+        self.min_length = min_length
+        self.addresses: List[int] = []
+        self.strings: List[bytes] = []
+
+
+#: Indexed strings, by mapping start, mapping end and encoding
+string_tables: Dict[Tuple[int, int, str], StringTable] = {}
+pwndbg.lib.cache.register_cache(string_tables, "stop", "cont", "start", "exit")
+
+
+def extract(
+    page: pwndbg.lib.memory.Page, min_length: int = 4, encoding: str = "ascii"
+) -> Generator[Tuple[int, bytes], None, None]:
+    """
+    Yields ``(address, string)`` for the printable strings of at least
+    ``min_length`` characters in the mapping, in address order. The strings
+    are raw bytes in the given encoding (see ``pwndbg.lib.strings.CHAR_SIZES``).
+
+    The mapping is read in chunks of ``CHUNK_SIZE`` bytes. With the
+    ``strings-index`` parameter enabled, the strings are indexed until the
+    next stop, and later calls with the same or a larger ``min_length`` don't
+    read memory at all.
+
+    Raises ``pwndbg.dbg_mod.Error`` if a part of the mapping can't be read.
+    """
+    key = (page.start, page.end, encoding)
+    table = string_tables.get(key)
+    if table is not None and table.min_length <= min_length:
+        size = pwndbg.lib.strings.CHAR_SIZES[encoding]
+        for address, value in zip(table.addresses, table.strings):
+            if len(value) >= min_length * size:
+                yield address, value
+        return
+
+    table = StringTable(min_length) if bool(strings_index) else None
+    extractor = pwndbg.lib.strings.StringExtractor(min_length, encoding)
+    for address in range(page.start, page.end, CHUNK_SIZE):
+        data = pwndbg.aglib.memory.read(address, min(CHUNK_SIZE, page.end - address))
+        found = extractor.feed(address, data)
+        if address + CHUNK_SIZE >= page.end:
+            found += extractor.finish()
+
+        for string_address, value in found:
+            if table is not None:
+                table.addresses.append(string_address)
+                table.strings.append(value)
+            yield string_address, value
+
+    if table is not None:
+        string_tables[key] = table
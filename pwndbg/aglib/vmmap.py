@@ -1,3 +1,14 @@
+"""
+The memory mappings of the debugged process.
+
+The mappings are fetched again on every stop, but :func:`get` keeps returning
+the same tuple for as long as they don't change. When they do, the ``vmmap``
+cache event is fired, so that caches derived only from the mappings can use
+``cache_until("start", "vmmap")`` and stay valid across steps which don't map
+or unmap anything. Such caches must call :func:`get` first, so that the
+mappings are checked for changes before the cache is looked up.
+"""
+
 from __future__ import annotations
 
 from typing import Tuple
@@ -7,10 +18,47 @@ import pwndbg.aglib.vmmap_custom
 import pwndbg.lib.cache
 import pwndbg.lib.memory
 
+#: The mappings last returned by `get()`
+_pages: Tuple[pwndbg.lib.memory.Page, ...] = ()
+
+
+def _same_pages(
+    a: Tuple[pwndbg.lib.memory.Page, ...], b: Tuple[pwndbg.lib.memory.Page, ...]
+) -> bool:
+    # `Page.__eq__` only compares the start addresses
+    return len(a) == len(b) and all(
+        x.vaddr == y.vaddr
+        and x.memsz == y.memsz
+        and x.flags == y.flags
+        and x.offset == y.offset
+        and x.objfile == y.objfile
+        for x, y in zip(a, b)
+    )
+
 
 @pwndbg.lib.cache.cache_until("start", "stop")
 def get() -> Tuple[pwndbg.lib.memory.Page, ...]:
-    return tuple(pwndbg.dbg.selected_inferior().vmmap().ranges())
+    global _pages
+
+    pages = tuple(pwndbg.dbg.selected_inferior().vmmap().ranges())
+    if not _same_pages(pages, _pages):
+        _pages = pages
+        pwndbg.lib.cache.clear_cache("vmmap")
+    return _pages
+
+
+def index() -> pwndbg.lib.memory.PageIndex:
+    """
+    Returns an interval index over the pages from `get()`, built again only
+    when the mappings change.
+    """
+    get()
+    return _index()
+
+
+@pwndbg.lib.cache.cache_until("start", "vmmap")
+def _index() -> pwndbg.lib.memory.PageIndex:
+    return pwndbg.lib.memory.PageIndex(get())
 
 
 @pwndbg.lib.cache.cache_until("start", "stop")
@@ -22,8 +70,8 @@ def find(address: int | pwndbg.dbg_mod.Value | None) -> pwndbg.lib.memory.Page |
     if address < 0:
         return None
 
-    for page in get():
-        if address in page:
-            return page
+    page = index().find(address)
+    if page is not None:
+        return page
 
     return pwndbg.aglib.vmmap_custom.explore(address)
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+from typing import Any
+from typing import Dict
 from typing import List
+from typing import Sequence
+from typing import Tuple
 
 import pwndbg.aglib.arch
 import pwndbg.aglib.memory
@@ -9,6 +13,8 @@ import pwndbg.aglib.vmmap
 import pwndbg.color.memory as M
 import pwndbg.enhance
 import pwndbg.integration
+import pwndbg.lib.cache
+import pwndbg.lib.memory
 from pwndbg.color import ColorConfig
 from pwndbg.color import ColorParamSpec
 from pwndbg.color import theme
@@ -27,6 +33,35 @@ c = ColorConfig(
     ],
 )
 
+#: Chains followed since the last stop, by the arguments of :func:`get`. They are
+#: kept as tuples, so that the callers can't modify them.
+memo: Dict[Tuple[Any, ...], Tuple[int, ...]] = {}
+pwndbg.lib.cache.register_cache(memo, "stop", "cont", "start", "exit")
+
+#: Number of chains served from ``memo`` instead of being followed again
+memo_hits = 0
+
+
+def _is_memo_enabled() -> bool:
+    return pwndbg.lib.cache.IS_CACHING and not pwndbg.lib.cache.IS_CACHING_DISABLED_FOR["stop"]
+
+
+def _memo_get(key: Tuple[Any, ...]) -> List[int] | None:
+    global memo_hits
+
+    if not _is_memo_enabled():
+        return None
+    chain = memo.get(key)
+    if chain is None:
+        return None
+    memo_hits += 1
+    return list(chain)
+
+
+def _memo_set(key: Tuple[Any, ...], chain: List[int]) -> None:
+    if _is_memo_enabled():
+        memo[key] = tuple(chain)
+
 
 def get(
     address: int | None,
@@ -58,6 +93,11 @@ def get(
 
     limit = int(limit)
 
+    key = (address, limit, offset, hard_stop, hard_end, include_start, safe_linking)
+    result = _memo_get(key)
+    if result is not None:
+        return result
+
     result = [address] if include_start else []
     for _ in range(limit):
         # Don't follow cycles, except to stop at the second occurrence.
@@ -87,9 +127,105 @@ def get(
         except pwndbg.dbg_mod.Error:
             break
 
+    _memo_set(key, result)
     return result
 
 
+def _read_pointers(addresses: Sequence[int], known: Dict[int, int | None]) -> None:
+    """
+    Read the pointers at the sorted ``addresses`` into ``known``, with one read
+    per span of nearby memory. Unreadable pointers are stored as None.
+    """
+    ptrsize = pwndbg.aglib.arch.ptrsize
+    for start, end, first, last in pwndbg.lib.memory.address_spans(addresses, ptrsize):
+        try:
+            data = pwndbg.aglib.memory.read(start, end - start, partial=True)
+        except pwndbg.dbg_mod.Error:
+            data = bytearray()
+
+        for address in addresses[first:last]:
+            offset = address - start
+            if offset + ptrsize <= len(data):
+                known[address] = int.from_bytes(
+                    data[offset : offset + ptrsize], pwndbg.aglib.arch.endian
+                )
+                continue
+
+            # The span was only read up to the first unreadable byte
+            try:
+                known[address] = pwndbg.aglib.memory.pvoid(address)
+            except pwndbg.dbg_mod.Error:
+                known[address] = None
+
+
+def get_many(
+    addresses: Sequence[int],
+    limit: int = LIMIT,
+    values: Dict[int, int] | None = None,
+) -> List[List[int]]:
+    """
+    Recursively dereferences many addresses at once. Returns the same chains as
+    calling :func:`get` on every address.
+
+    The chains are followed one level at a time, and the pointers needed by all
+    of them at that level are read together, in one read per span of nearby memory.
+
+    Arguments:
+        addresses(list): the addresses to begin dereferencing
+        limit(int): number of valid pointers
+        values(dict): pointers the caller already read, by their address
+
+    Returns:
+        A list with the chain of every address
+    """
+    limit = int(limit)
+    is_linux = pwndbg.dbg.selected_inferior().is_linux()
+    known: Dict[int, int | None] = dict(values) if values else {}
+
+    keys = [(address, limit, 0, None, 0, True, False) for address in addresses]
+    chains: List[List[int]] = []
+    missing: List[int] = []
+    for i, key in enumerate(keys):
+        chain = _memo_get(key)
+        if chain is None:
+            chain = [addresses[i]]
+            missing.append(i)
+        chains.append(chain)
+
+    active = [chains[i] for i in missing]
+    for _ in range(limit):
+        following = []
+        for chain in active:
+            address = chain[-1]
+            # Don't follow cycles, except to stop at the second occurrence.
+            if chain.count(address) >= 2:
+                continue
+
+            # Avoid redundant dereferences in bare metal mode by checking
+            # if address is in any of vmmap pages
+            if not is_linux and not pwndbg.aglib.vmmap.find(address):
+                continue
+
+            following.append(chain)
+
+        _read_pointers(sorted({chain[-1] for chain in following} - known.keys()), known)
+
+        active = []
+        for chain in following:
+            value = known[chain[-1]]
+            if value is not None:
+                chain.append(value & pwndbg.aglib.arch.ptrmask)
+                active.append(chain)
+
+        if not active:
+            break
+
+    for i in missing:
+        _memo_set(keys[i], chains[i])
+
+    return chains
+
+
 config_arrow_left = theme.add_param("chain-arrow-left", "◂—", "left arrow of chain formatting")
 config_arrow_right = theme.add_param("chain-arrow-right", "—▸", "right arrow of chain formatting")
 config_contiguous = theme.add_param(
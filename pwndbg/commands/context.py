@@ -33,6 +33,7 @@ import pwndbg.color.memory as M
 import pwndbg.color.syntax_highlight as H
 import pwndbg.commands
 import pwndbg.commands.telescope
+import pwndbg.enhance
 import pwndbg.integration
 import pwndbg.ui
 from pwndbg.aglib.arch import get_thumb_mode_string
@@ -642,6 +643,9 @@ def context(subcontext=None, enabled=None) -> None:
 
     sections += [(arg, context_sections.get(arg[0], None)) for arg in args]
 
+    chain_hits = pwndbg.chain.memo_hits
+    enhance_hits = pwndbg.enhance.resolve.cache.hits
+
     result = defaultdict(list)
     result_settings: DefaultDict[str, Dict[Any, Any]] = defaultdict(dict)
     for section, func in sections:
@@ -679,6 +683,12 @@ def context(subcontext=None, enabled=None) -> None:
                 out.write("\n")
             out.flush()
 
+    log.debug(
+        "context: reused %d pointer chains and %d enhanced values resolved earlier in this stop",
+        pwndbg.chain.memo_hits - chain_hits,
+        pwndbg.enhance.resolve.cache.hits - enhance_hits,
+    )
+
 
 pwndbg.config.add_param(
     "show-compact-regs", False, "whether to show a compact register view with columns"
@@ -25,7 +25,7 @@ def jemalloc_find_extent(addr) -> None:
 
     try:
         rtree = jemalloc.RTree.get_rtree()
-        extent = rtree.lookup_hard(addr)
+        extent = rtree.find_extent(addr)
         if extent is None:
             print(message.error("ERROR: Extent not found"))
             return
@@ -34,7 +34,7 @@ def jemalloc_find_extent(addr) -> None:
         print(f"Extent Address: {hex(extent.extent_address)}")
         print()
 
-        jemalloc_extent_info(extent.extent_address, header=False)
+        print_extent_info(extent)
     except pwndbg.dbg_mod.Error as e:
         print(message.error(f"ERROR: {e}"))
         return
@@ -55,25 +55,27 @@ def jemalloc_extent_info(addr, verbose=False, header=True) -> bool:
         print()
 
     try:
-        extent = jemalloc.Extent(int(addr))
-
-        print(f"Allocated Address: {hex(extent.allocated_address)}")
-        print(f"Extent Address: {hex(extent.extent_address)}")
-
-        print(f"Size: {hex(extent.size)}")
-        print(f"Small class: {extent.has_slab}")
-
-        print(f"State: {extent.state_name}")
-
-        if verbose:
-            for bit, val in extent.bitfields.items():
-                print(bit, val)
+        print_extent_info(jemalloc.Extent(int(addr)), verbose)
     except pwndbg.dbg_mod.Error as e:
         print(message.error(f"ERROR: {e}"))
         return False
     return True
 
 
+def print_extent_info(extent: jemalloc.Extent, verbose: bool = False) -> None:
+    print(f"Allocated Address: {hex(extent.allocated_address)}")
+    print(f"Extent Address: {hex(extent.extent_address)}")
+
+    print(f"Size: {hex(extent.size)}")
+    print(f"Small class: {extent.has_slab}")
+
+    print(f"State: {extent.state_name}")
+
+    if verbose:
+        for bit, val in extent.bitfields.items():
+            print(bit, val)
+
+
 parser = argparse.ArgumentParser(description="Prints all extents information")
 
 
@@ -90,9 +92,7 @@ def jemalloc_heap() -> None:
             print(message.warn("No extents found"))
             return
         for extent in extents:
-            # TODO: refactor so not create copies
-            if not jemalloc_extent_info(extent.extent_address, header=False):
-                return
+            print_extent_info(extent)
             print()
     except pwndbg.dbg_mod.Error as e:
         print(message.error(f"ERROR: {e}"))
@@ -16,15 +16,18 @@ parser.add_argument("symbol", type=str, help="Address or symbol name to lookup")
 @pwndbg.commands.OnlyWhenQemuKernel
 @pwndbg.commands.OnlyWhenPagingEnabled
 def klookup(symbol: str) -> None:
-    ksyms = pwndbg.aglib.kernel.kallsyms.get()
     try:
         symbol_addr = int(symbol, 0)
-        for ksym, v in ksyms.items():
-            if v[0] == symbol_addr:
-                print(message.success(f"{symbol_addr:#x} = {ksym}"))
-                return
-        print(message.error(f"No symbol found at {symbol_addr:#x}"))
+        result = pwndbg.aglib.kernel.kallsyms.lookup(symbol_addr)
+        if result is None:
+            print(message.error(f"No symbol found at {symbol_addr:#x}"))
+            return
+        ksym, _, offset = result
+        if offset:
+            ksym += f"+{offset:#x}"
+        print(message.success(f"{symbol_addr:#x} = {ksym}"))
     except ValueError:
+        ksyms = pwndbg.aglib.kernel.kallsyms.get()
         found = False
         for ksym, v in ksyms.items():
             if symbol not in ksym:
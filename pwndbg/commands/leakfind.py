@@ -5,14 +5,17 @@ Find a chain of leaks given some starting address.
 from __future__ import annotations
 
 import argparse
-import queue
 from typing import Dict
 from typing import List
+from typing import Tuple
 
 import pwndbg
+import pwndbg.aglib.arch
+import pwndbg.aglib.memory
 import pwndbg.aglib.vmmap
 import pwndbg.color.memory as M
 import pwndbg.commands
+import pwndbg.lib.memory
 from pwndbg.chain import c as C
 from pwndbg.color import message
 from pwndbg.commands import CommandCategory
@@ -47,6 +50,66 @@ def get_rec_addr_string(addr, visited_map):
         return ""
 
 
+def find_leak_chains(
+    address: int, max_offset: int, max_depth: int, stride: int, negative_offset: int
+) -> Dict[int, Tuple[int, int]]:
+    """
+    Breadth-first search for pointers reachable from `address`.
+
+    Returns a map of child address -> (parent_address, parent_start_address).
+    parent_address is the exact address with a pointer to the child address.
+    parent_start_address is an address that a previous address pointed to.
+    We need to store both so that we can nicely create our leak chain.
+    """
+    ptrsize = pwndbg.aglib.arch.ptrsize
+    ptrmask = pwndbg.aglib.arch.ptrmask
+    endian = pwndbg.aglib.arch.endian
+    pages = pwndbg.aglib.vmmap.index()
+
+    visited_map: Dict[int, Tuple[int, int]] = {}
+    visited_set = {address}
+    frontier = [address]
+
+    window_size = negative_offset + max_offset
+    if window_size <= 0:
+        return visited_map
+    # Reading a pointer at the last offset of the window needs a few more bytes
+    last_offset = (window_size - 1) // stride * stride
+
+    # Every level of the search is expanded from a plain list of addresses.
+    # Each window is fetched with a single read and decoded all at once.
+    for _ in range(max_depth):
+        next_frontier: List[int] = []
+        for cur_start_addr in frontier:
+            window_start = (cur_start_addr - negative_offset) & ptrmask
+            try:
+                data = pwndbg.aglib.memory.read(window_start, last_offset + ptrsize, partial=True)
+            except pwndbg.dbg_mod.Error:
+                # That means the memory was unmapped. Just skip it if we can't read it.
+                continue
+
+            # A partial read stops at the first unreadable address, like the
+            # per-pointer loop which stopped scanning a window at the first error
+            values = pwndbg.lib.memory.unpack_words(data, ptrsize, endian, stride)
+            for i, result in enumerate(values):
+                if result in visited_map or result in visited_set:
+                    continue
+
+                # Pointers outside of any known mapping can't lead anywhere
+                if len(pages) and pages.find(result) is None:
+                    continue
+
+                visited_map[result] = ((window_start + i * stride) & ptrmask, cur_start_addr)
+                next_frontier.append(result)
+                visited_set.add(result)
+
+        if not next_frontier:
+            break
+        frontier = next_frontier
+
+    return visited_map
+
+
 # Useful for debugging. Prints a map of child -> (parent, parent_start)
 def dbg_print_map(maps) -> None:
     for child, parent_info in maps.items():
@@ -136,45 +199,7 @@ def leakfind(
     if max_depth > 8:
         print(message.warn("leakfind may take a while to run on larger depths."))
 
-    stride = step
-
-    # The below map stores a map of child address->(parent_address,parent_start_address)
-    # In the above tuple, parent_address is the exact address with a pointer to the child address.
-    # parent_start_address is an address that a previous address pointed to.
-    # We need to store both so that we can nicely create our leak chain.
-    visited_map = {}
-    visited_set = {int(address)}
-    address_queue: "queue.Queue[int]" = queue.Queue()
-    address_queue.put(int(address))
-    depth = 0
-    time_to_depth_increase = 0
-
-    # Run a bfs
-    # TODO look into performance gain from checking if an address is mapped before calling pwndbg.aglib.memory.pvoid()
-    # TODO also check using pwndbg.aglib.memory.read for possible performance boosts.
-    while address_queue.qsize() > 0 and depth < max_depth:
-        if time_to_depth_increase == 0:
-            depth = depth + 1
-            time_to_depth_increase = address_queue.qsize()
-        cur_start_addr = address_queue.get()
-        time_to_depth_increase -= 1
-        for cur_addr in range(
-            cur_start_addr - negative_offset, cur_start_addr + max_offset, stride
-        ):
-            try:
-                cur_addr &= pwndbg.aglib.arch.ptrmask
-                result = int(pwndbg.aglib.memory.pvoid(cur_addr))
-                if result in visited_map or result in visited_set:
-                    continue
-                visited_map[result] = (
-                    cur_addr,
-                    cur_start_addr,
-                )  # map is of form child->(parent,parent_start)
-                address_queue.put(result)
-                visited_set.add(result)
-            except pwndbg.dbg_mod.Error:
-                # That means the memory was unmapped. Just skip it if we can't read it.
-                break
+    visited_map = find_leak_chains(address, max_offset, max_depth, step, negative_offset)
 
     # A map of length->list of lines. Used to let us print in a somewhat nice manner.
     output_map: Dict[int, List[str]] = {}
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 
+import pwndbg.aglib.memory
 import pwndbg.commands
 import pwndbg.lib.cache
 from pwndbg.color import message
@@ -26,3 +27,77 @@ def memoize() -> None:
         status = message.on("ON")
 
     print(f"Caching is now {status}")
+
+
+parser = argparse.ArgumentParser(
+    formatter_class=argparse.RawTextHelpFormatter,
+    description="""
+Show statistics of the caches used by pwndbg.
+
+Lists the hits, misses, number of entries and approximate memory usage
+of every function decorated with `cache_until`, as well as of the
+inferior memory page cache.
+""",
+)
+parser.add_argument(
+    "filter_pattern", type=str, nargs="?", default=None, help="Only show caches matching this name"
+)
+parser.add_argument(
+    "-s",
+    "--sort",
+    choices=["hits", "misses", "entries", "size", "name"],
+    default="misses",
+    help="Column to sort the caches by",
+)
+parser.add_argument(
+    "-a", "--all", dest="all_", action="store_true", help="Also show caches that were never used"
+)
+parser.add_argument(
+    "-r", "--reset", action="store_true", help="Reset the hit and miss counters after printing"
+)
+
+
+@pwndbg.commands.ArgparsedCommand(
+    parser, category=CommandCategory.PWNDBG, command_name="cache-stats"
+)
+def cache_stats(
+    filter_pattern: str | None = None, sort: str = "misses", all_: bool = False, reset: bool = False
+) -> None:
+    from tabulate import tabulate
+
+    rows = []
+    for cache in pwndbg.lib.cache.ALL_CACHES:
+        if filter_pattern and filter_pattern not in cache.name:
+            continue
+        if not all_ and cache.hits == 0 and cache.misses == 0:
+            continue
+        rows.append(
+            (
+                cache.name,
+                cache.hits,
+                cache.misses,
+                len(cache),
+                cache.approximate_size(),
+                "" if cache.maxsize is None else cache.maxsize,
+            )
+        )
+
+    column = {"name": 0, "hits": 1, "misses": 2, "entries": 3, "size": 4}[sort]
+    rows.sort(key=lambda row: row[column], reverse=column != 0)
+
+    headers = ["Function", "Hits", "Misses", "Entries", "Size (bytes)", "Max size"]
+    print(tabulate(rows, headers=headers))
+
+    page_cache = pwndbg.aglib.memory.page_cache
+    total = page_cache.hits + page_cache.misses
+    ratio = f"{page_cache.hits / total:.1%}" if total else "n/a"
+    print()
+    print(
+        f"Memory page cache: {page_cache.hits} hits, {page_cache.misses} misses ({ratio}), "
+        f"{len(page_cache)} pages cached"
+    )
+
+    if reset:
+        for cache in pwndbg.lib.cache.ALL_CACHES:
+            cache.reset_stats()
+        page_cache.reset_stats()
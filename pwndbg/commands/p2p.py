@@ -2,14 +2,15 @@ from __future__ import annotations
 
 import argparse
 from typing import List
-from typing import Tuple
 
 import pwndbg.aglib.arch
 import pwndbg.aglib.memory
+import pwndbg.aglib.ptrscan
 import pwndbg.aglib.vmmap
 import pwndbg.color
 import pwndbg.commands
 import pwndbg.commands.telescope
+import pwndbg.lib.memory
 from pwndbg.commands import CommandCategory
 
 ts = pwndbg.commands.telescope.telescope
@@ -20,6 +21,10 @@ class AddrRange:
         self.begin = begin
         self.end = end
 
+    @property
+    def start(self) -> int:
+        return self.begin
+
     def __repr__(self) -> str:
         return (self.begin, self.end).__repr__()
 
@@ -40,9 +45,9 @@ def address_range_explicit(section: str) -> AddrRange:
         )
 
 
-def address_range(section: str) -> List[AddrRange] | Tuple[int, int] | None:
+def address_range(section: str) -> List[AddrRange] | None:
     if section in ("*", "any"):
-        return (0, pwndbg.aglib.arch.ptrmask)
+        return [AddrRange(0, pwndbg.aglib.arch.ptrmask)]
 
     # User can use syntax: "begin:end" to specify explicit address range instead of named page.
     # TODO: handle page names that contains ':'.
@@ -67,20 +72,21 @@ Any chain length greater than 0 is valid. If only one mapping is given it just l
 parser.add_argument("mapping_names", type=address_range, nargs="+", help="Mapping name ")
 
 
-def maybe_points_to_ranges(ptr: int, rs: List[AddrRange]):
+def maybe_points_to_ranges(ptr: int, rs: pwndbg.lib.memory.PageIndex):
     try:
         pointee = pwndbg.aglib.memory.pvoid(ptr)
     except Exception:
         return None
 
-    for r in rs:
-        if r.begin <= pointee < r.end:
-            return pointee
+    if rs.find(pointee) is not None:
+        return pointee
 
     return None
 
 
-def p2p_walk(addr: int, ranges: List[List[AddrRange]], current_level: int) -> int | None:
+def p2p_walk(
+    addr: int, ranges: List[pwndbg.lib.memory.PageIndex], current_level: int
+) -> int | None:
     levels = len(ranges)
 
     if current_level >= levels:
@@ -106,9 +112,11 @@ def p2p(mapping_names: List[List[AddrRange]] | None = None) -> None:
     if len(mapping_names) == 1:
         mapping_names.append(get_addrrange_any_named())
 
-    for rng in mapping_names[0]:
-        for addr in range(rng.begin, rng.end):
-            maybe_pointer = p2p_walk(addr, mapping_names, current_level=1)
+    indexes = [pwndbg.lib.memory.PageIndex(ranges) for ranges in mapping_names]
 
-            if maybe_pointer is not None:
+    # The first hop is found by scanning the whole source mapping at once,
+    # only the (few) matching pointers are followed further one by one
+    for rng in mapping_names[0]:
+        for addr, pointee in pwndbg.aglib.ptrscan.scan(rng.begin, rng.end, indexes[1], step=1):
+            if len(indexes) == 2 or p2p_walk(pointee, indexes, current_level=2) is not None:
                 ts(address=addr, count=1)
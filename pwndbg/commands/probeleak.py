@@ -10,23 +10,19 @@ import pwndbg.aglib.symbol
 import pwndbg.aglib.vmmap
 import pwndbg.color.memory as M
 import pwndbg.commands
+import pwndbg.lib.memory
 from pwndbg.color import message
 from pwndbg.commands import CommandCategory
 
 
 def find_module(addr, max_distance):
-    mod_filter = lambda page: page.start <= addr < page.end
-    pages = list(filter(mod_filter, pwndbg.aglib.vmmap.get()))
+    pages = pwndbg.aglib.vmmap.index()
+    page = pages.find(addr)
 
-    if not pages:
-        if max_distance != 0:
-            mod_filter = lambda page: page.start - max_distance <= addr < page.end + max_distance
-            pages = list(filter(mod_filter, pwndbg.aglib.vmmap.get()))
+    if page is None and max_distance != 0:
+        page = pages.find_near(addr, max_distance)
 
-        if not pages:
-            return None
-
-    return pages[-1]
+    return page
 
 
 def satisfied_flags(require_flags, flags):
@@ -116,10 +112,20 @@ def probeleak(
         )
         return
 
+    # Only words within max_distance of the mapped address space can be leaks,
+    # so filter the whole buffer at once before looking up their pages
+    pages = pwndbg.aglib.vmmap.index()
+    candidates = []
+    if len(pages):
+        low = max(pages.pages[0].start - max_distance, 0)
+        high = pages.max_ends[-1] + max_distance
+        candidates = pwndbg.lib.memory.find_pointers(
+            data, ptrsize, low, high, pwndbg.aglib.arch.endian, step=1
+        )
+
     found = False
     find_cnt = 0
-    for i in range(0, len(data) - ptrsize + 1):
-        p = pwndbg.aglib.arch.unpack(data[i : i + ptrsize])
+    for i, p in candidates:
         page = find_module(p, max_distance)
         if page:
             if point_to is not None and point_to not in page.objfile:
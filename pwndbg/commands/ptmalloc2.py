@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import bisect
 import ctypes
 from string import printable
 from typing import Dict
 from typing import List
 from typing import Set
+from typing import Tuple
 
 from tabulate import tabulate
 
@@ -23,11 +25,15 @@ import pwndbg.commands
 import pwndbg.glibc
 import pwndbg.lib.heap.helpers
 from pwndbg.aglib.heap import heap_chain_limit
+from pwndbg.aglib.heap.ptmalloc import PREV_INUSE
+from pwndbg.aglib.heap.ptmalloc import SIZE_BITS
 from pwndbg.aglib.heap.ptmalloc import Arena
+from pwndbg.aglib.heap.ptmalloc import Bin
 from pwndbg.aglib.heap.ptmalloc import Bins
 from pwndbg.aglib.heap.ptmalloc import BinType
 from pwndbg.aglib.heap.ptmalloc import Chunk
 from pwndbg.aglib.heap.ptmalloc import DebugSymsHeap
+from pwndbg.aglib.heap.ptmalloc import FreeChunkIndex
 from pwndbg.aglib.heap.ptmalloc import GlibcMemoryAllocator
 from pwndbg.aglib.heap.ptmalloc import Heap
 from pwndbg.color import generateColorFunction
@@ -496,24 +502,21 @@ def malloc_chunk(
                 headers_to_print.append(message.off("Top chunk"))
 
         if not chunk.is_top_chunk and arena:
-            bins_list = [
-                allocator.fastbins(arena.address),
-                allocator.smallbins(arena.address),
-                allocator.largebins(arena.address),
-                allocator.unsortedbin(arena.address),
-            ]
-            if allocator.has_tcache():
-                bins_list.append(allocator.tcachebins(None))
-
-            bins_list = [x for x in bins_list if x is not None]
-            no_match = True
-            for bins in bins_list:
-                if bins.contains_chunk(chunk.real_size, chunk.address):
-                    no_match = False
-                    headers_to_print.append(message.on(f"Free chunk ({bins.bin_type})"))
+            found = allocator.free_chunks(arena.address).bins_containing(
+                chunk.real_size, chunk.address
+            )
+            for bin_type in (
+                BinType.FAST,
+                BinType.SMALL,
+                BinType.LARGE,
+                BinType.UNSORTED,
+                BinType.TCACHE,
+            ):
+                if bin_type in found:
+                    headers_to_print.append(message.on(f"Free chunk ({bin_type})"))
                     if not verbose:
-                        fields_to_print.update(bins.bin_type.valid_fields())
-            if no_match:
+                        fields_to_print.update(bin_type.valid_fields())
+            if not found:
                 headers_to_print.append(message.hint("Allocated chunk"))
 
     if verbose:
@@ -810,6 +813,16 @@ parser.add_argument(
     action="store_true",
     help="Consider partial overwrite candidates, default behavior only shows word-size overwrites.",
 )
+parser.add_argument(
+    "--target",
+    "-t",
+    dest="targets",
+    metavar="ADDRESS",
+    action="append",
+    type=int,
+    help="Another address to overlap, can be given many times. The memory searched for all of "
+    "the addresses is read at once.",
+)
 
 
 @pwndbg.commands.ArgparsedCommand(parser, category=CommandCategory.PTMALLOC2)
@@ -822,13 +835,13 @@ def find_fake_fast(
     align: bool = False,
     glibc_fastbin_bug: bool = False,
     partial_overwrite: bool = False,
+    targets: List[int] | None = None,
 ) -> None:
     """Find candidate fake fast chunks overlapping the specified address."""
     allocator = pwndbg.aglib.heap.current
     assert isinstance(allocator, GlibcMemoryAllocator)
 
     size_sz = allocator.size_sz
-    min_chunk_size = allocator.min_chunk_size
     global_max_fast = allocator.global_max_fast
     size_types = pwndbg.dbg.selected_inferior().types_with_name("unsigned int")
     size_field_width = (
@@ -854,7 +867,56 @@ def find_fake_fast(
                 )
             )
 
-    target_address = int(target_address)
+    # The (target address, search start, maximum candidate size) of every search
+    searches: List[Tuple[int, int, int]] = []
+    for target in [target_address, *(targets or [])]:
+        search = find_fake_fast_search_start(
+            int(target), max_candidate_size, align, partial_overwrite, size_field_width
+        )
+        if search is not None:
+            searches.append((int(target), *search))
+
+    if not searches:
+        return None
+
+    step = allocator.malloc_alignment if align else 1
+    candidates = find_fake_fast_candidates(searches, size_field_width, step)
+
+    for (target, search_start, max_size), found in zip(searches, candidates):
+        print(
+            message.notice(
+                f"Searching for fastbin size fields up to {max_size:#04x}, starting at {search_start:#x} resulting in an overlap of {target:#x}"
+            )
+        )
+
+        print(C.banner("FAKE CHUNKS"))
+        for candidate_address, size_field in found:
+            if partial_overwrite:
+                if (candidate_address + size_field) > target:
+                    malloc_chunk(candidate_address - size_sz, fake=True)
+            else:
+                if (candidate_address + size_field) >= (target + size_sz):
+                    malloc_chunk(candidate_address - size_sz, fake=True)
+
+
+def find_fake_fast_search_start(
+    target_address: int,
+    max_candidate_size: int,
+    align: bool,
+    partial_overwrite: bool,
+    size_field_width: int,
+) -> Tuple[int, int] | None:
+    """
+    Returns the address of the first size field to consider for fake chunks
+    overlapping `target_address`, and the maximum size of these chunks, or None
+    if no size field can be found before the target address.
+    """
+    allocator = pwndbg.aglib.heap.current
+    assert isinstance(allocator, GlibcMemoryAllocator)
+
+    size_sz = allocator.size_sz
+    min_chunk_size = allocator.min_chunk_size
+
     if max_candidate_size > target_address:
         print(
             message.warn(
@@ -906,37 +968,76 @@ def find_fake_fast(
             )
             return None
 
-    print(
-        message.notice(
-            f"Searching for fastbin size fields up to {max_candidate_size:#04x}, starting at {search_start:#x} resulting in an overlap of {target_address:#x}"
-        )
-    )
-
-    search_region = pwndbg.aglib.memory.read(search_start, search_end - search_start, partial=True)
+    return search_start, max_candidate_size
 
-    print(C.banner("FAKE CHUNKS"))
-    step = allocator.malloc_alignment if align else 1
-    for i in range(0, len(search_region), step):
-        candidate = search_region[i : i + size_field_width]
 
-        if len(candidate) == size_field_width:
-            size_field = pwndbg.aglib.arch.unpack_size(candidate, size_field_width)
-            size_field &= ~(allocator.malloc_align_mask)
+def find_fake_fast_candidates(
+    searches: List[Tuple[int, int, int]], size_field_width: int, step: int
+) -> List[List[Tuple[int, int]]]:
+    """
+    Returns the (address, size) of the candidate size fields of every search
+    given as (target address, search start, maximum candidate size). The
+    searches whose memory overlaps are served by one read of their union.
+    """
+    allocator = pwndbg.aglib.heap.current
+    assert isinstance(allocator, GlibcMemoryAllocator)
 
-            if size_field < min_chunk_size or size_field > max_candidate_size:
-                continue
+    # Merge the overlapping [search start, target address) windows
+    windows: List[List[int]] = []
+    for target, search_start, _ in sorted(searches, key=lambda search: search[1]):
+        if windows and search_start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], target)
+        else:
+            windows.append([search_start, target])
+
+    def scan(
+        start: int, end: int, scan_step: int, max_size: int
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """Returns where the readable memory ends, and the candidates in it."""
+        region = pwndbg.aglib.memory.read(start, end - start, partial=True)
+        return (
+            start + len(region),
+            pwndbg.lib.heap.helpers.find_fake_fast_sizes(
+                region,
+                start,
+                size_field_width,
+                allocator.min_chunk_size,
+                max_size,
+                allocator.malloc_align_mask,
+                pwndbg.aglib.arch.endian,
+                scan_step,
+            ),
+        )
 
-            candidate_address = search_start + i
+    max_size = max(search[2] for search in searches)
+    # A window can be scanned with the step of its searches only if they all
+    # start in the same place modulo the step
+    phases = {search_start % step for _, search_start, _ in searches}
+    scan_step = step if len(phases) == 1 else 1
+    # The readable end and the candidates of every window, by its start address
+    scanned = {start: scan(start, end, scan_step, max_size) for start, end in windows}
+
+    starts = sorted(scanned)
+    results: List[List[Tuple[int, int]]] = []
+    for target, search_start, max_candidate_size in searches:
+        window_start = starts[bisect.bisect_right(starts, search_start) - 1]
+        readable_end, candidates = scanned[window_start]
+        if search_start >= readable_end:
+            # The read of the window stopped at an unreadable byte before this
+            # search starts, so the memory of this search is read on its own
+            readable_end, candidates = scan(search_start, target, step, max_candidate_size)
+
+        results.append(
+            [
+                (address, size)
+                for address, size in candidates
+                if search_start <= address <= target - size_field_width
+                and (address - search_start) % step == 0
+                and size <= max_candidate_size
+            ]
+        )
 
-            if partial_overwrite:
-                if (candidate_address + size_field) > target_address:
-                    malloc_chunk(candidate_address - size_sz, fake=True)
-            else:
-                if (candidate_address + size_field) >= (target_address + size_sz):
-                    malloc_chunk(candidate_address - size_sz, fake=True)
-
-        else:
-            break
+    return results
 
 
 pwndbg.config.add_param(
@@ -1036,11 +1137,16 @@ def vis_heap_chunks(
         cursor = heap_region.start
 
     ptr_size = allocator.size_sz
+    top = arena.top if arena is not None else None
+
+    # The heap is read in large blocks and chunk headers are parsed straight
+    # from those buffers instead of creating a debugger Value for each chunk.
+    reader = pwndbg.aglib.memory.RegionReader(cursor, heap_region.end)
 
     # Build a list of addresses that delimit each chunk.
     chunk_delims = []
+    seen_delims: Set[int] = set()
     cursor_backup = cursor
-    chunk = Chunk(cursor)
 
     chunk_id = 0
     reached_mapping_end = False
@@ -1055,15 +1161,19 @@ def vis_heap_chunks(
             break
 
         # Don't repeatedly operate on the same address (e.g. chunk size of 0).
-        if cursor in chunk_delims or cursor + ptr_size in chunk_delims:
+        if cursor in seen_delims or cursor + ptr_size in seen_delims:
             break
 
-        if chunk.prev_inuse:
-            chunk_delims.append(cursor + ptr_size)
-        else:
-            chunk_delims.append(cursor)
+        try:
+            size_field = reader.unpack(cursor + ptr_size, ptr_size)
+        except pwndbg.dbg_mod.Error:
+            size_field = 0
+
+        delim = cursor + ptr_size if size_field & PREV_INUSE else cursor
+        chunk_delims.append(delim)
+        seen_delims.add(delim)
 
-        if chunk.is_top_chunk and not beyond_top:
+        if cursor == top and not beyond_top:
             chunk_delims.append(cursor + ptr_size * 2)
             break
 
@@ -1072,8 +1182,7 @@ def vis_heap_chunks(
             reached_mapping_end = True
             break
 
-        cursor += chunk.real_size
-        chunk = Chunk(cursor)
+        cursor += size_field & ~SIZE_BITS
         chunk_id += 1
 
     # Build the output buffer, changing color at each chunk delimiter.
@@ -1086,28 +1195,19 @@ def vis_heap_chunks(
         generateColorFunction("blue"),
     ]
 
-    bin_collections = []
     if arena is not None:
-        # Heap() Case 4; fake/mmapped chunk
-        bin_collections = [
-            allocator.fastbins(arena.address),
-            allocator.unsortedbin(arena.address),
-            allocator.smallbins(arena.address),
-            allocator.largebins(arena.address),
-        ]
-    if allocator.has_tcache():
-        # Only check for tcache entries belonging to the current thread,
-        # it's difficult (impossible?) to find all the thread caches for a
-        # specific heap.
-        bin_collections.insert(0, allocator.tcachebins(None))
+        free_chunks = allocator.free_chunks(arena.address)
+    else:
+        # Heap() Case 4; fake/mmapped chunk, only the tcache of the current
+        # thread can hold it
+        free_chunks = FreeChunkIndex([allocator.tcachebins(None)] if allocator.has_tcache() else [])
 
     printed = 0
-    out = ""
+    out: List[str] = []
     asc = ""
     labels = []
 
     cursor = cursor_backup
-    chunk = Chunk(cursor)
 
     reached_top = False
     has_huge_chunk = False
@@ -1116,7 +1216,7 @@ def vis_heap_chunks(
         pwndbg.lib.memory.round_up(int(pwndbg.config.max_visualize_chunk_size), ptr_size << 2) >> 1
     )
 
-    bin_labels_map: Dict[int, List[str]] = bin_labels_mapping(bin_collections)
+    bin_labels_map: Dict[int, List[str]] = bin_labels_mapping(free_chunks)
 
     for c, stop in enumerate(chunk_delims):
         color_func = color_funcs[c % len(color_funcs)]
@@ -1136,29 +1236,31 @@ def vis_heap_chunks(
                 and begin_addr + half_max_size <= cursor < end_addr - half_max_size
             ):
                 if first_cut:
-                    out += "\n" + "." * len(hex(cursor))
+                    out.append("\n" + "." * len(hex(cursor)))
                     first_cut = False
                 cursor += ptr_size
                 continue
 
             if printed % 2 == 0:
-                out += "\n0x%x" % cursor
+                out.append("\n0x%x" % cursor)
 
-            data = pwndbg.aglib.memory.read(cursor, ptr_size)
+            data = reader.read(cursor, ptr_size)
             cell = pwndbg.aglib.arch.unpack(data)
             cell_hex = f"\t0x{cell:0{ptr_size * 2}x}"
 
-            out += color_func(cell_hex)
+            out.append(color_func(cell_hex))
             printed += 1
 
             labels.extend(bin_labels_map.get(cursor, []))
-            if arena is not None and cursor == arena.top:
+            if cursor == top:
                 labels.append("Top chunk")
                 reached_top = True
 
             asc += bin_ascii(data)
             if printed % 2 == 0:
-                out += "\t" + color_func(asc) + ("\t <-- " + ", ".join(labels) if labels else "")
+                out.append(
+                    "\t" + color_func(asc) + ("\t <-- " + ", ".join(labels) if labels else "")
+                )
                 asc = ""
                 labels = []
 
@@ -1167,9 +1269,9 @@ def vis_heap_chunks(
     if printed % 2 != 0:
         # Alignment whitespace of ("0x" + "00" * ptr_size) length.
         machine_word_string_length = 2 + (2 * ptr_size)
-        out += "\t" + " " * machine_word_string_length + "\t" + color_func(asc)
+        out.append("\t" + " " * machine_word_string_length + "\t" + color_func(asc))
 
-    print(out)
+    print("".join(out))
 
     if reached_mapping_end:
         print(f"Reached end of memory mapping ({hex(heap_region.end)}).")
@@ -1187,12 +1289,15 @@ def vis_heap_chunks(
 
 VALID_CHARS = list(map(ord, set(printable) - set("\t\r\n\x0c\x0b")))
 
+# Maps every byte to itself if printable or to "." otherwise, for bytes.translate
+ASCII_TABLE = bytes(c if c in VALID_CHARS else ord(".") for c in range(256))
+
 
 def bin_ascii(bs):
-    return "".join(chr(c) if c in VALID_CHARS else "." for c in bs)
+    return bytes(bs).translate(ASCII_TABLE).decode("latin-1")
 
 
-def bin_labels_mapping(collections):
+def bin_labels_mapping(free_chunks: FreeChunkIndex) -> Dict[int, List[str]]:
     """
     Returns all potential bin labels for all potential addresses
     We precompute all of them because doing this on demand was too slow and inefficient
@@ -1200,21 +1305,12 @@ def bin_labels_mapping(collections):
     """
     labels_mapping: Dict[int, List[str]] = {}
 
-    for bins in collections:
-        if not bins:
-            continue
-        bins_type = bins.bin_type
-
-        for size in bins.bins.keys():
-            b = bins.bins[size]
-            if isinstance(size, int):
-                size = hex(size)
-            count = f"/{b.count:d}" if bins_type == BinType.TCACHE else None
-            chunks = b.fd_chain
-            for chunk_addr in chunks:
-                labels_mapping.setdefault(chunk_addr, []).append(
-                    f"{bins_type:s}[{size:s}][{chunks.index(chunk_addr):d}{count or ''}]"
-                )
+    for address, entries in free_chunks.entries.items():
+        labels_mapping[address] = [
+            f"{entry.bin_type:s}[{Bin.size_to_display_name(entry.size):s}]"
+            f"[{entry.index:d}{'' if entry.count is None else f'/{entry.count:d}'}]"
+            for entry in entries
+        ]
 
     return labels_mapping
 
@@ -1357,7 +1453,6 @@ def try_free(addr: str | int) -> None:
             e = pwndbg.aglib.memory.pvoid(e)
             tcache_addr = int(allocator.thread_cache.address)
             if e == tcache_addr:
-                # todo, actually do checks
                 print(
                     message.error(
                         "Will do checks for tcache double-free (memory_tcache_double_free)"
@@ -1365,6 +1460,13 @@ def try_free(addr: str | int) -> None:
                 )
                 errors_found += 1
 
+                found = allocator.free_chunks(arena.address).bins_containing(
+                    chunk_size_unmasked, addr
+                )
+                if BinType.TCACHE in found:
+                    err = "free(): double free detected in tcache 2 -> chunk is already in tcache"
+                    print(message.error(err))
+
             if int(allocator.get_tcache()["counts"][tc_idx]) < int(allocator.mp["tcache_count"]):
                 print(message.success("Using tcache_put"))
                 if errors_found == 0:
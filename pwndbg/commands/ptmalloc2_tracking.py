@@ -16,6 +16,11 @@ user errors such as double frees and use after frees.
 
 Currently, the following errors can be detected:
     - Use After Free
+
+In batched mode, the calls to the allocator are only recorded, and checked
+when the program stops or a report is asked for. Double frees and allocations
+overlapping chunks in use are detected as well, and use after free is only
+looked for in the chunks freed last, if asked to with --watch-recent.
 """,
 )
 
@@ -33,6 +38,23 @@ enable.add_argument(
     default=False,
     help="Force the tracker to use hardware breakpoints.",
 )
+enable.add_argument(
+    "--batched",
+    action="store_true",
+    help="Only record the calls to the allocator, and check them in batches.",
+)
+enable.add_argument(
+    "--buffer-size",
+    type=int,
+    default=4096,
+    help="Number of calls recorded before they are checked, in batched mode.",
+)
+enable.add_argument(
+    "--watch-recent",
+    type=int,
+    default=0,
+    help="Number of the chunks freed last to watch for use after free, in batched mode.",
+)
 enable.set_defaults(mode="enable")
 
 # Subcommand that disables the tracker.
@@ -45,13 +67,34 @@ toggle_break = subparsers.add_parser(
 )
 toggle_break.set_defaults(mode="toggle-break")
 
+# Subcommand that prints what the batched mode knows.
+report = subparsers.add_parser(
+    "report", help="Check the calls recorded in batched mode and print a summary"
+)
+report.add_argument(
+    "-n", "--count", type=int, default=10, help="Number of the last recorded calls to show."
+)
+report.set_defaults(mode="report")
+
 
 @pwndbg.commands.ArgparsedCommand(parser, category=CommandCategory.LINUX, command_name="track-heap")
 @pwndbg.commands.OnlyWhenRunning
-def track_heap(mode=None, use_hardware_breakpoints=False):
+def track_heap(
+    mode=None,
+    use_hardware_breakpoints=False,
+    batched=False,
+    buffer_size=4096,
+    watch_recent=0,
+    count=10,
+):
     if mode == "enable":
         # Enable the tracker.
-        pwndbg.gdblib.ptmalloc2_tracking.install()
+        pwndbg.gdblib.ptmalloc2_tracking.install(
+            disable_hardware_watchpoints=not use_hardware_breakpoints,
+            batched=batched,
+            capacity=buffer_size,
+            watch_recent=watch_recent,
+        )
     elif mode == "disable":
         # Disable the tracker.
         pwndbg.gdblib.ptmalloc2_tracking.uninstall()
@@ -64,5 +107,7 @@ def track_heap(mode=None, use_hardware_breakpoints=False):
             print("The program will stop when the heap tracker detects an error")
         else:
             print("The heap tracker will only print a message when it detects an error")
+    elif mode == "report":
+        pwndbg.gdblib.ptmalloc2_tracking.report(count)
     else:
         raise AssertionError(f"track-heap must never have invalid mode '{mode}'. this is a bug")
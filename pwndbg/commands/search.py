@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import argparse
+import array
 import binascii
 import codecs
 import os
 import struct
-from typing import Set
+from typing import Dict
+from typing import Generator
+from typing import List
+from typing import Tuple
 
 import pwnlib
 
@@ -16,6 +20,7 @@ import pwndbg.aglib.vmmap
 import pwndbg.color.memory as M
 import pwndbg.commands
 import pwndbg.enhance
+import pwndbg.lib.memory
 import pwndbg.search
 from pwndbg.color import message
 from pwndbg.commands import CommandCategory
@@ -23,14 +28,16 @@ from pwndbg.commands import CommandCategory
 if pwndbg.dbg.is_gdblib_available():
     import gdb
 
-saved: Set[int] = set()
+#: Sorted addresses of the hits saved with --save
+saved = array.array("Q")
 
 
-def print_search_hit(address) -> None:
+def print_search_hit(address, label: str | None = None) -> None:
     """Prints out a single search hit.
 
     Arguments:
         address(int): Address to print
+        label(str): Which of several searched values was found, if any
     """
     if not address:
         return
@@ -46,7 +53,130 @@ def print_search_hit(address) -> None:
     region = M.get(address, region)
     addr = M.get(address)
     display = pwndbg.enhance.enhance(address)
-    print(region, addr, display)
+    if label is None:
+        print(region, addr, display)
+    else:
+        print(region, addr, display, message.hint(f"[{label}]"))
+
+
+def pack_value(type: str, value: str, hex: bool, arch: str, asmbp: bool) -> bytes | None:
+    """Converts a search value given on the command line to the bytes to search for.
+
+    Prints an error and returns None if the value is not valid for the type.
+    """
+    if hex:
+        try:
+            value = codecs.decode(value, "hex")
+        except binascii.Error as e:
+            print(f"invalid input for type hex: {e}")
+            return None
+
+    # Convert to an integer if needed, and pack to bytes
+    if type not in ("string", "bytes", "asm"):
+        value = pwndbg.commands.fix_int(value)
+        value &= pwndbg.aglib.arch.ptrmask
+        fmt = {"little": "<", "big": ">"}[pwndbg.aglib.arch.endian] + {
+            "byte": "B",
+            "short": "H",
+            "word": "H",
+            "dword": "L",
+            "qword": "Q",
+        }[type]
+
+        try:
+            return struct.pack(fmt, value)
+        except struct.error as e:
+            print(f"invalid input for type {type}: {e}")
+            return None
+
+    # Null-terminate strings
+    elif type == "string":
+        return value.encode() + b"\x00"
+
+    elif type == "asm" or asmbp:
+        bits_for_arch = pwnlib.context.context.architectures.get(arch, {}).get("bits")
+        return pwnlib.asm.asm(value, arch=arch, bits=bits_for_arch)
+
+    # `pwndbg.search.search` expects a `bytes` object for its pattern. Convert the string pattern we
+    # were given to a bytes object by encoding it as an UTF-8 byte sequence. This matches the behavior
+    # we previously got by calling `gdb.Inferior.search_memory` with an `str`, since right about GDB
+    # version 7.x or 8.x[1], as it uses a `Py_buffer` object populated with an `'s*'` pattern, which
+    # has been encoding `str` object as a UTF-8 byte sequence since Python 3.1[2].
+    #
+    # [1]: https://sourceware.org/git/?p=binutils-gdb.git;a=blame;f=gdb/python/py-inferior.c;h=a1042ee72ac733091f7572bc04b072546d3c1519;hb=23c84db5b3cb4e8a0d555c76e1a0ab56dc8355f3
+    # [2]: https://docs.python.org/3.1/c-api/arg.html#strings-and-buffers
+
+    elif type == "bytes" and not hex:
+        try:
+            return value.encode("utf-8")
+        except UnicodeError as what:
+            print(
+                message.error(
+                    f"Invalid pattern '{value}'. Patterns of type `bytes` must be encodable in UTF-8: {what}"
+                )
+            )
+            return None
+
+    return value
+
+
+def load_many_values(values: List[str]) -> List[str]:
+    """Returns the values given to --many, reading them from a file if a single path was given.
+
+    The file holds one value per line. Empty lines and lines starting with `#` are ignored.
+    """
+    if len(values) != 1 or not os.path.isfile(values[0]):
+        return values
+
+    with open(values[0]) as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+def recheck_saved(labels: Dict[bytes, str]) -> Generator[Tuple[int, str], None, None]:
+    """Yields the saved addresses that still hold one of the patterns, with its label.
+
+    The saved addresses are grouped into spans of nearby memory that are read at once,
+    and each span is matched against all patterns in a single pass.
+    """
+    pattern_set = pwndbg.lib.memory.PatternSet(labels)
+
+    def pattern_at(address: int) -> bytes | None:
+        try:
+            data = pwndbg.aglib.memory.read(address, pattern_set.max_length, partial=True)
+        except pwndbg.dbg_mod.Error:
+            return None
+        matches = pattern_set.find(data, address)
+        return matches[0][1] if matches and matches[0][0] == 0 else None
+
+    for start, end, first, last in pwndbg.lib.memory.address_spans(saved, pattern_set.max_length):
+        try:
+            data = pwndbg.aglib.memory.read(start, end - start, partial=True)
+        except pwndbg.dbg_mod.Error:
+            data = bytearray()
+
+        # The first pattern given wins if several match at the same address
+        found: Dict[int, bytes] = {}
+        for offset, pattern in pattern_set.find(data, start):
+            found.setdefault(offset, pattern)
+
+        for address in saved[first:last]:
+            offset = address - start
+            if offset + pattern_set.max_length <= len(data):
+                pattern = found.get(offset)
+            else:
+                # The span was only read up to the first unreadable byte
+                pattern = pattern_at(address)
+            if pattern is not None:
+                yield address, labels[pattern]
+
+
+def set_search_breakpoint(address: int) -> None:
+    if pwndbg.dbg.is_gdblib_available():
+        # set breakpoint on the instruction
+        gdb.Breakpoint("*%#x" % address, temporary=False)
+    else:
+        print(f"breakpoints are not supported outside of GDB yet, would be set at {address:#x}")
 
 
 auto_save = pwndbg.config.add_param(
@@ -149,7 +279,13 @@ parser.add_argument(
 parser.add_argument(
     "-a", "--aligned", default=None, type=str, help="Result must be aligned to this byte boundary"
 )
-parser.add_argument("value", type=str, help="Value to search for")
+parser.add_argument(
+    "value",
+    type=str,
+    nargs="?",
+    default=None,
+    help="Value to search for. With --many, the mapping to search instead",
+)
 parser.add_argument(
     "mapping_name", type=str, nargs="?", default=None, help="Mapping to search [e.g. libc]"
 )
@@ -175,6 +311,13 @@ parser.add_argument(
     default=False,
     help="Truncate the output to 20 results. Differs from --limit in that it will first save all search results",
 )
+parser.add_argument(
+    "--many",
+    nargs="+",
+    default=None,
+    metavar="FILE|VALUE",
+    help="Search for all of these values in a single pass over memory, or for the values listed in FILE, one per line. Every hit is labeled with the value found",
+)
 
 
 @pwndbg.commands.ArgparsedCommand(parser, category=CommandCategory.MEMORY)
@@ -194,8 +337,18 @@ def search(
     save,
     next,
     trunc_out,
+    many,
 ) -> None:
     global saved
+    if many is not None:
+        if mapping_name is not None:
+            print(message.error("Only a mapping name can be given together with --many"))
+            return
+        mapping_name = value
+    elif value is None:
+        print(message.error("A value to search for is required"))
+        return
+
     if next and not saved:
         print(
             "WARNING: cannot filter previous search results as they were empty. Performing new search saving results."
@@ -216,13 +369,6 @@ def search(
     if save is None:
         save = bool(pwndbg.config.auto_save_search)
 
-    if hex:
-        try:
-            value = codecs.decode(value, "hex")
-        except binascii.Error as e:
-            print(f"invalid input for type hex: {e}")
-            return
-
     if step:
         step = pwndbg.commands.fix_int(step)
 
@@ -231,52 +377,24 @@ def search(
 
     if limit:
         limit = pwndbg.commands.fix_int(limit)
-    # Convert to an integer if needed, and pack to bytes
-    if type not in ("string", "bytes", "asm"):
-        value = pwndbg.commands.fix_int(value)
-        value &= pwndbg.aglib.arch.ptrmask
-        fmt = {"little": "<", "big": ">"}[pwndbg.aglib.arch.endian] + {
-            "byte": "B",
-            "short": "H",
-            "word": "H",
-            "dword": "L",
-            "qword": "Q",
-        }[type]
 
-        try:
-            value = struct.pack(fmt, value)
-        except struct.error as e:
-            print(f"invalid input for type {type}: {e}")
+    # Maps every pattern to the value it was made from
+    labels: Dict[bytes, str] = {}
+    for item in load_many_values(many) if many is not None else [value]:
+        packed = pack_value(type, item, hex, arch, asmbp)
+        if packed is None:
             return
+        labels.setdefault(packed, item)
 
-    # Null-terminate strings
-    elif type == "string":
-        value = value.encode()
-        value += b"\x00"
-
-    elif type == "asm" or asmbp:
-        bits_for_arch = pwnlib.context.context.architectures.get(arch, {}).get("bits")
-        value = pwnlib.asm.asm(value, arch=arch, bits=bits_for_arch)
+    if many is not None and not labels:
+        print(message.error("No values to search for"))
+        return
 
-    # `pwndbg.search.search` expects a `bytes` object for its pattern. Convert the string pattern we
-    # were given to a bytes object by encoding it as an UTF-8 byte sequence. This matches the behavior
-    # we previously got by calling `gdb.Inferior.search_memory` with an `str`, since right about GDB
-    # version 7.x or 8.x[1], as it uses a `Py_buffer` object populated with an `'s*'` pattern, which
-    # has been encoding `str` object as a UTF-8 byte sequence since Python 3.1[2].
-    #
-    # [1]: https://sourceware.org/git/?p=binutils-gdb.git;a=blame;f=gdb/python/py-inferior.c;h=a1042ee72ac733091f7572bc04b072546d3c1519;hb=23c84db5b3cb4e8a0d555c76e1a0ab56dc8355f3
-    # [2]: https://docs.python.org/3.1/c-api/arg.html#strings-and-buffers
+    if many is not None and step:
+        print(message.error("--step is not supported together with --many"))
+        return
 
-    elif type == "bytes" and not hex:
-        try:
-            value = value.encode("utf-8")
-        except UnicodeError as what:
-            print(
-                message.error(
-                    f"Invalid pattern '{value}'. Patterns of type `bytes` must be encodable in UTF-8: {what}"
-                )
-            )
-            return
+    value = list(labels)[0] if many is None else None
 
     # Find the mappings that we're looking for
     mappings = pwndbg.aglib.vmmap.get()
@@ -289,7 +407,9 @@ def search(
         return
 
     # Output appropriate messages based on the detected search type for better clarity
-    if is_pointer:
+    if many is not None:
+        print(f"Searching for {len(labels)} values of type {type} at once")
+    elif is_pointer:
         print("Searching for a pointer-width integer: " + repr(value))
     elif type == "word" or type == "short":
         print("Searching for a 2-byte integer: " + repr(value))
@@ -306,51 +426,60 @@ def search(
         print("Searching for byte: " + repr(value))
 
     if next:
-        val_len = len(value)
-        new_saved = set()
+        new_saved = array.array("Q")
 
         i = 0
-        for addr in saved:
-            try:
-                val = pwndbg.aglib.memory.read(addr, val_len)
-            except Exception:
-                continue
-            if val == value:
-                new_saved.add(addr)
-                if not trunc_out or i < 20:
-                    print_search_hit(addr)
-                i += 1
+        for addr, found in recheck_saved(labels):
+            new_saved.append(addr)
+            if not trunc_out or i < 20:
+                print_search_hit(addr, found if many is not None else None)
+            i += 1
 
         print("Search found %d items" % i)
         saved = new_saved
         return
 
-    # Prep the saved set if necessary
-    if save:
-        saved = set()
+    # Hits to save for --next, if necessary
+    hits: List[int] = []
 
     # Perform the search
     i = 0
-    for address in pwndbg.search.search(
-        value,
-        mappings=mappings,
-        executable=executable,
-        writable=writable,
-        step=step,
-        aligned=aligned,
-        limit=limit,
-    ):
-        if save:
-            saved.add(address)
-        if asmbp:
-            if pwndbg.dbg.is_gdblib_available():
-                # set breakpoint on the instruction
-                gdb.Breakpoint("*%#x" % address, temporary=False)
-            else:
-                print(
-                    f"breakpoints are not supported outside of GDB yet, would be set at {address:#x}"
-                )
+    try:
+        if many is not None:
+            for address, pattern in pwndbg.search.search_many(
+                labels,
+                mappings=mappings,
+                executable=executable,
+                writable=writable,
+                aligned=aligned,
+                limit=limit,
+            ):
+                if save:
+                    hits.append(address)
+                if asmbp:
+                    set_search_breakpoint(address)
+                if not trunc_out or i < 20:
+                    print_search_hit(address, labels[pattern])
+                i += 1
+        else:
+            for address in pwndbg.search.search(
+                value,
+                mappings=mappings,
+                executable=executable,
+                writable=writable,
+                step=step,
+                aligned=aligned,
+                limit=limit,
+            ):
+                if save:
+                    hits.append(address)
+                if asmbp:
+                    set_search_breakpoint(address)
 
-        if not trunc_out or i < 20:
-            print_search_hit(address)
-        i += 1
+                if not trunc_out or i < 20:
+                    print_search_hit(address)
+                i += 1
+    finally:
+        # Keep the hits found so far when the search is interrupted
+        if save:
+            saved = array.array("Q", sorted(set(hits)))
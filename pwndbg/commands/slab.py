@@ -104,6 +104,14 @@ def print_slab(slab: Slab, indent, verbose: bool) -> None:
         indent.print(f"{C.blue('Freelist')}: {_yx(int(slab.freelist))}")
 
         if verbose:
+            for freelist in slab.freelists:
+                if freelist.is_corrupted:
+                    indent.print(
+                        M.warn(
+                            f"Freelist {int(freelist):#x} is corrupted: it loops or points to unreadable memory"
+                        )
+                    )
+
             with indent:
                 free_objects = slab.free_objects
                 for addr in slab.objects:
@@ -22,6 +22,7 @@ import pwndbg.aglib.vmmap
 import pwndbg.chain
 import pwndbg.color.telescope as T
 import pwndbg.commands
+import pwndbg.lib.memory
 from pwndbg.color import theme
 from pwndbg.commands import CommandCategory
 
@@ -221,8 +222,20 @@ def telescope(
         # regs.frame can be None on aarch64
         bp = pwndbg.aglib.regs[pwndbg.aglib.regs.frame]
 
-    for i, addr in enumerate(range(start, stop, step)):
-        if not pwndbg.aglib.memory.peek(addr):
+    # Read all lines at once and follow their pointer chains together
+    addresses = range(start, stop, step)
+    window_start = min(start, stop - step)
+    try:
+        window = pwndbg.aglib.memory.read(window_start, len(addresses) * ptrsize, partial=True)
+    except pwndbg.dbg_mod.Error:
+        window = bytearray()
+    words = pwndbg.lib.memory.unpack_words(window, ptrsize, pwndbg.aglib.arch.endian)
+    values = {window_start + i * ptrsize: word for i, word in enumerate(words)}
+    chains = dict(zip(values, pwndbg.chain.get_many(list(values), values=values)))
+
+    for i, addr in enumerate(addresses):
+        chain = chains.get(addr)
+        if chain is None and not pwndbg.aglib.memory.peek(addr):
             collapse_repeating_values()
             result.append("<Could not read memory at %#x>" % addr)
             break
@@ -243,13 +256,13 @@ def telescope(
         ) + " ".join(
             (
                 regs_or_frame_offset(addr, bp, regs, longest_regs),
-                pwndbg.chain.format(addr),
+                pwndbg.chain.format(addr if chain is None else chain),
             )
         )
 
         # Buffer repeating values.
         if skip_repeating_values:
-            value = pwndbg.aglib.memory.pvoid(addr)
+            value = values[addr] if addr in values else pwndbg.aglib.memory.pvoid(addr)
             if last == value and addr != input_address:
                 collapse_buffer.append(line)
                 continue
@@ -39,6 +39,10 @@ T = TypeVar("T")
 # newer versions.
 LLDB_VERSION: Tuple[int, int] = None
 
+# How much memory `LLDBProcess.find_in_memory` reads at once when it has to do
+# the search on the Python side.
+FIND_IN_MEMORY_WINDOW_SIZE = 4 * 1024 * 1024
+
 
 def rename_register(name: str, proc: LLDBProcess) -> str:
     """
@@ -88,16 +92,28 @@ class LLDBRegisters(pwndbg.dbg_mod.Registers):
     def __init__(self, groups: lldb.SBValueList, proc: LLDBProcess):
         self.groups = groups
         self.proc = proc
+        self.members: Dict[str, lldb.SBValue] | None = None
+
+    def _members(self) -> Dict[str, lldb.SBValue]:
+        # List the registers of all groups once, instead of searching every
+        # group again for each register that is looked up
+        if self.members is None:
+            self.members = {}
+            for i in range(self.groups.GetSize()):
+                group = self.groups.GetValueAtIndex(i)
+                for j in range(group.GetNumChildren()):
+                    member = group.GetChildAtIndex(j)
+                    if member is not None and member.IsValid():
+                        self.members.setdefault(member.GetName(), member)
+        return self.members
 
     @override
     def by_name(self, name: str) -> pwndbg.dbg_mod.Value | None:
         name = rename_register(name, self.proc)
 
-        for i in range(self.groups.GetSize()):
-            group = self.groups.GetValueAtIndex(i)
-            member = group.GetChildMemberWithName(name)
-            if member is not None and member.IsValid():
-                return LLDBValue(member, self.proc)
+        member = self._members().get(name)
+        if member is not None:
+            return LLDBValue(member, self.proc)
 
         return None
 
@@ -1019,74 +1035,107 @@ class LLDBProcess(pwndbg.dbg_mod.Process):
             # Nothing to match.
             return
 
-        # LLDB 19.1 and greater has a FindRangesInMemory function[1], but, as of
-        # the writing of this comment, that verson is still in RC1 stage, so new
-        # that it is not reasonable for us to depend on that function being
-        # available. So what we do here is mostly the same search procedure
-        # done by LLDB, but much slower on account of FFI and Python.
-        #
-        # This really is not ideal for large ranges and smaller alignments.
-        #
-        # [1]: https://github.com/llvm/llvm-project/commit/0d4da0df166ea7512c6e97e182b21cd706293eaa
+        if step <= 0 and hasattr(self.process, "FindRangesInMemory"):
+            # LLDB 19.1 and greater has a FindRangesInMemory function[1], which
+            # does the whole search on the LLDB side. It has no notion of a step,
+            # so searches with a step always go through our own engine.
+            #
+            # [1]: https://github.com/llvm/llvm-project/commit/0d4da0df166ea7512c6e97e182b21cd706293eaa
+            found = self._find_in_memory_native(pattern, start, size, align, max_matches)
+            if found is not None:
+                yield from found
+                return
+
+        yield from self._find_in_memory_chunked(pattern, start, size, align, max_matches, step)
+
+    def _find_in_memory_native(
+        self, pattern: bytearray, start: int, size: int, align: int, max_matches: int
+    ) -> List[int] | None:
+        """
+        Searches using `SBProcess.FindRangesInMemory`. Returns None if LLDB
+        failed the search, in which case the caller should fall back to
+        `_find_in_memory_chunked`.
+        """
+        ranges = lldb.SBAddressRangeList()
+        ranges.Append(lldb.SBAddressRange(start, size))
 
-        offset = start - pwndbg.lib.memory.round_up(start, align)
-        moffset = 0
-        matched = 0
+        e = lldb.SBError()
+        found = self.process.FindRangesInMemory(
+            bytes(pattern),
+            ranges,
+            align,
+            max_matches if max_matches > 0 else 0xFFFFFFFF,
+            e,
+        )
+        if not e.success:
+            return None
+
+        return [
+            found.GetAddressRangeAtIndex(i).GetBaseAddress().GetLoadAddress(self.target)
+            for i in range(found.GetSize())
+        ]
+
+    def _find_in_memory_chunked(
+        self,
+        pattern: bytearray,
+        start: int,
+        size: int,
+        align: int,
+        max_matches: int = -1,
+        step: int = -1,
+    ) -> Generator[int, None, None]:
+        """
+        Searches by reading the range in large windows and scanning them on
+        the Python side. Consecutive windows overlap by `len(pattern) - 1`
+        bytes so that matches crossing a window boundary are found, and a match
+        is always reported by the window it starts in.
+        """
+        end = start + size
+        window = FIND_IN_MEMORY_WINDOW_SIZE
+        overlap = len(pattern) - 1
+        # Lowest address at which the next match may start.
+        resume = start
+        pos = start
         yielded = 0
 
         e = lldb.SBError()
-        while offset < size and (max_matches < 0 or yielded < max_matches):
-            # Because we would reject any match that is not correctly aligned
-            # anyway, we can perform the search in alignment-sized chunks,
-            # rather than one byte at a time. This is a nice little optimization
-            # that allows us to cut the number of iterations by a factor of
-            # `align`. Additionally, we can read only as much as we'd need to
-            # complete the match if that is smaller than the alignment.
-            to_read = min(len(pattern) - matched, align)
-            if to_read > size - offset:
-                # Even if we found a match here, part of it would be outside the
-                # range specified for the search, and we should not yield it.
-                break
+        while pos + len(pattern) <= end:
+            to_read = min(window + overlap, end - pos)
+            data = self.process.ReadMemory(pos, to_read, e)
 
-            read = self.process.ReadMemory(start + offset, to_read, e)
-            offset += align
-
-            if e.success:
-                if pattern[matched : matched + len(read)] == read:
-                    # This part of the slice matches the continuation of the
-                    # pattern.
-                    matched += len(read)
-                elif pattern[: len(read)] == read:
-                    # The pattern may start in the slice we reject, so we have
-                    # to account for that.
-                    offset -= align
-                    moffset = offset
-                    matched = 0
+            if not e.success:
+                if window > pwndbg.lib.memory.PAGE_SIZE:
+                    # Part of the window may still be readable, so go over it
+                    # again one page at a time.
+                    window = pwndbg.lib.memory.PAGE_SIZE - pwndbg.lib.memory.page_offset(pos)
+                elif overlap > 0 and to_read > window:
+                    # The overlap may reach into an unreadable page. Matches
+                    # can't span into it anyway, so only read this page.
+                    overlap = 0
                 else:
-                    # This part of the slice doesn't match the continuation of
-                    # the pattern. Restart the match.
-                    moffset = offset
-                    matched = 0
-
-                if matched == len(pattern):
-                    # We have a complete sequence. Yield the address at which it
-                    # was found.
-                    yield start + moffset
-                    yielded += 1
-
-                    if step > 0:
-                        # Step on success if a step amount was given.
-                        offset -= align
-                        offset = pwndbg.lib.memory.round_up(
-                            pwndbg.lib.memory.round_down(offset, step) + step, align
-                        )
+                    pos = pwndbg.lib.memory.page_align(pos) + pwndbg.lib.memory.PAGE_SIZE
+                    window = pwndbg.lib.memory.PAGE_SIZE
+                    overlap = len(pattern) - 1
+                continue
 
-                    moffset = offset
-                    matched = 0
-            else:
-                # We couldn't read this slice, move on.
-                moffset = offset
-                matched = 0
+            overlap = len(pattern) - 1
+            for address in pwndbg.lib.memory.find_in_buffer(
+                data, pattern, pos, resume, align, step
+            ):
+                yield address
+                yielded += 1
+                if yielded == max_matches:
+                    return
+                resume = pwndbg.lib.memory.next_match_address(address, len(pattern), align, step)
+
+            pos = max(pos + window, resume)
+            if window < FIND_IN_MEMORY_WINDOW_SIZE:
+                # Go back to large windows once we're past the page-by-page
+                # section, and keep windows within a page until then.
+                offset = pwndbg.lib.memory.page_offset(pos)
+                window = (
+                    pwndbg.lib.memory.PAGE_SIZE - offset if offset else FIND_IN_MEMORY_WINDOW_SIZE
+                )
 
     @override
     def is_remote(self) -> bool:
@@ -58,6 +58,7 @@ pwndbg.lib.cache.connect_clear_caching_events(
         ),
         "prompt": (),
         "forever": (),
+        "vmmap": (),
     },
 )
 
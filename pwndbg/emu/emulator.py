@@ -8,8 +8,10 @@ import binascii
 import re
 import string
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import NamedTuple
+from typing import Set
 from typing import Tuple
 
 import capstone as C
@@ -195,6 +197,13 @@ BANNED_INSTRUCTIONS = {
 # https://github.com/unicorn-engine/unicorn/issues/550
 blacklisted_regs = ["ip", "cs", "ds", "es", "fs", "gs", "ss"]
 
+# Bytes of the stack below and above $sp which are mapped before emulation starts
+PREFETCH_STACK_BELOW = 0x100
+PREFETCH_STACK_ABOVE = 2 * pwndbg.lib.memory.PAGE_SIZE
+
+# Bytes of the same mapping which are mapped past a faulting access
+FAULT_READAHEAD = 2 * pwndbg.lib.memory.PAGE_SIZE
+
 """
 e = pwndbg.emu.emulator.Emulator()
 e.until_jump()
@@ -241,43 +250,81 @@ class Emulator:
         # (address_successfully_executed, size_of_instruction)
         self.last_single_step_result = InstructionExecutedResult(None, None)
 
-        # Initialize the register state
-        for reg in self.regs.emulated_regs_order:
-            enum = self.get_reg_enum(reg)
+        # Page addresses which are mapped in Unicorn
+        self.mapped_pages: Set[int] = set()
 
-            if not reg:
-                debug(DEBUG_INIT, "# Could not set register %r", reg)
-                continue
+        # Initialize the register state with a single write
+        snapshot = self.register_snapshot()
+        debug(DEBUG_INIT, "uc.reg_write_batch(%r)", (snapshot,))
+        self.uc.reg_write_batch([(enum, value) for _, enum, value in snapshot])
+
+        # Add a hook for unmapped memory
+        self.hook_add(U.UC_HOOK_MEM_UNMAPPED, self.hook_mem_invalid)
+
+        # Always stop executing as soon as there's an interrupt.
+        self.hook_add(U.UC_HOOK_INTR, self.hook_intr)
+
+        # Map in the page that $pc is on, the top of the stack and the memory registers point to
+        self.prefetch(value for _, _, value in snapshot)
 
+        # Instruction tracing
+        if DEBUG & DEBUG_TRACE:
+            self.hook_add(U.UC_HOOK_CODE, self.trace_hook)
+
+    def register_snapshot(self) -> List[Tuple[str, int, int]]:
+        """
+        Returns ``(name, unicorn enum, value)`` of every emulated register with a
+        non-zero value in the current processor state. All Unicorn registers start at zero.
+        """
+        registers = pwndbg.aglib.regs.snapshot()
+        snapshot = []
+        for reg in self.regs.emulated_regs_order:
             if reg in blacklisted_regs:
                 debug(DEBUG_INIT, "Skipping blacklisted register %r", reg)
                 continue
-            value = getattr(pwndbg.aglib.regs, reg)
+
+            enum = self.get_reg_enum(reg)
+            value = registers[reg] if reg in registers else getattr(pwndbg.aglib.regs, reg)
             if None in (enum, value):
-                if reg not in blacklisted_regs:
-                    debug(DEBUG_INIT, "# Could not set register %r", reg)
+                debug(DEBUG_INIT, "# Could not set register %r", reg)
                 continue
 
-            # All registers are initialized to zero.
-            if value == 0:
-                continue
+            if value != 0:
+                snapshot.append((reg, enum, value))
 
-            name = f"U.x86_const.UC_X86_REG_{reg.upper()}"
-            debug(DEBUG_INIT, "uc.reg_write(%(name)s, %(value)#x)", locals())
-            self.uc.reg_write(enum, value)
+        return snapshot
 
-        # Add a hook for unmapped memory
-        self.hook_add(U.UC_HOOK_MEM_UNMAPPED, self.hook_mem_invalid)
+    def prefetch(self, values: Iterable[int] = ()) -> None:
+        """
+        Maps the memory the emulation is most likely to touch with as few reads as possible:
+        the page $pc is on, the stack window around $sp and the pages that any of the
+        `values` (usually register values) point into.
+        """
+        pages = set()
 
-        # Always stop executing as soon as there's an interrupt.
-        self.hook_add(U.UC_HOOK_INTR, self.hook_intr)
+        pc = pwndbg.aglib.regs.pc
+        if pc is not None:
+            pages.add(pwndbg.lib.memory.page_align(pc))
+
+        sp = pwndbg.aglib.regs.sp
+        stack = pwndbg.aglib.vmmap.find(sp) if sp is not None else None
+        if stack is not None:
+            start = max(sp - PREFETCH_STACK_BELOW, stack.start)
+            end = min(sp + PREFETCH_STACK_ABOVE, stack.end)
+            pages.update(
+                range(
+                    pwndbg.lib.memory.page_align(start),
+                    pwndbg.lib.memory.page_size_align(end),
+                    pwndbg.lib.memory.PAGE_SIZE,
+                )
+            )
 
-        # Map in the page that $pc is on
-        self.map_page(pwndbg.aglib.regs.pc)
+        for value in values:
+            page = pwndbg.aglib.vmmap.find(value)
+            if page is not None and page.read:
+                pages.add(pwndbg.lib.memory.page_align(value))
 
-        # Instruction tracing
-        if DEBUG & DEBUG_TRACE:
-            self.hook_add(U.UC_HOOK_CODE, self.trace_hook)
+        self._map_pages(sorted(pages - self.mapped_pages))
 
     @property
     def last_step_succeeded(self) -> bool:
@@ -308,16 +355,8 @@ class Emulator:
             # Attempt to map the page manually and try again
             if e.errno == U.UC_ERR_READ_UNMAPPED:
                 try:
-                    first_page = pwndbg.lib.memory.page_align(address)
-                    last_page_exclusive = pwndbg.lib.memory.page_align(
-                        address + size + pwndbg.lib.memory.PAGE_SIZE
-                    )
-
-                    for page_addr in range(
-                        first_page, last_page_exclusive, pwndbg.lib.memory.PAGE_SIZE
-                    ):
-                        if not (self.map_page(page_addr)):
-                            return None
+                    if not self.map_range(address, address + size):
+                        return None
 
                     # Pages are mapped, try again
                     value = self.uc.mem_read(address, size)
@@ -602,49 +641,87 @@ class Emulator:
         return mode
 
     def map_page(self, page) -> bool:
-        page = pwndbg.lib.memory.page_align(page)
-        size = pwndbg.lib.memory.PAGE_SIZE
+        return self.map_range(page, page + 1)
 
-        debug(DEBUG_MEM_MAP, "# Mapping %#x-%#x", (page, page + size))
+    def map_range(self, start: int, end: int) -> bool:
+        """
+        Maps the pages covering ``[start, end)`` which are not mapped yet.
+        Returns whether all of them are mapped afterwards.
+        """
+        pages = range(
+            pwndbg.lib.memory.page_align(start),
+            pwndbg.lib.memory.page_size_align(end),
+            pwndbg.lib.memory.PAGE_SIZE,
+        )
+        self._map_pages([page for page in pages if page not in self.mapped_pages])
+        return all(page in self.mapped_pages for page in pages)
+
+    def _map_pages(self, pages: List[int]) -> None:
+        """
+        Maps the sorted, page-aligned addresses in `pages`, reading every run
+        of adjacent pages from the inferior at once.
+        """
+        run_start = None
+        run_end = None
+        for page in pages:
+            if page != run_end:
+                if run_start is not None:
+                    self._map_run(run_start, run_end)
+                run_start = page
+            run_end = page + pwndbg.lib.memory.PAGE_SIZE
+
+        if run_start is not None:
+            self._map_run(run_start, run_end)
+
+    def _map_run(self, start: int, end: int) -> None:
+        debug(DEBUG_MEM_MAP, "# Mapping %#x-%#x", (start, end))
 
         try:
-            data = pwndbg.aglib.memory.read(page, size)
-            data = bytes(data)
+            data = pwndbg.aglib.memory.read(start, end - start, partial=True)
         except pwndbg.dbg_mod.Error:
-            debug(DEBUG_MEM_MAP, "Could not map page %#x during emulation! [exception]", page)
-            return False
+            debug(DEBUG_MEM_MAP, "Could not map page %#x during emulation! [exception]", start)
+            return
 
-        if not data:
-            debug(DEBUG_MEM_MAP, "Could not map page %#x during emulation! [no data]", page)
-            return False
+        # Only map the pages which were read completely
+        size = len(data) - len(data) % pwndbg.lib.memory.PAGE_SIZE
+        if not size:
+            debug(DEBUG_MEM_MAP, "Could not map page %#x during emulation! [no data]", start)
+            return
 
-        debug(DEBUG_MEM_MAP, "uc.mem_map(%(page)#x, %(size)#x)", locals())
-        self.uc.mem_map(page, size)
+        debug(DEBUG_MEM_MAP, "uc.mem_map(%(start)#x, %(size)#x)", locals())
+        self.uc.mem_map(start, size)
 
-        debug(DEBUG_MEM_MAP, "# Writing %#x bytes", len(data))
-        debug(DEBUG_MEM_MAP, "uc.mem_write(%(page)#x, ...)", locals())
-        self.uc.mem_write(page, data)
+        debug(DEBUG_MEM_MAP, "# Writing %#x bytes", size)
+        debug(DEBUG_MEM_MAP, "uc.mem_write(%(start)#x, ...)", locals())
+        self.uc.mem_write(start, bytes(data[:size]))
 
-        return True
+        self.mapped_pages.update(range(start, start + size, pwndbg.lib.memory.PAGE_SIZE))
 
     def hook_mem_invalid(self, uc, access, address, size: int, value, user_data) -> bool:
         debug(DEBUG_MEM_MAP, "# Invalid access at %#x, attempting to map the page", address)
 
-        # Page-align the start address
-        start = pwndbg.lib.memory.page_align(address)
-        size = pwndbg.lib.memory.page_size_align(address + size - start)
-        stop = start + size
+        # Accesses tend to continue in the same direction, so map a few more pages
+        # of the same mapping along with the faulting ones, in a single read
+        end = address + size
+        mapping = pwndbg.aglib.vmmap.find(address)
+        if mapping is not None:
+            readahead = pwndbg.lib.memory.page_size_align(end) + FAULT_READAHEAD
+            end = max(end, min(readahead, mapping.end))
 
-        # Map each page with the permissions that we think it has.
-        for page in range(start, stop, pwndbg.lib.memory.PAGE_SIZE):
-            if not self.map_page(page):
-                return False
+        self.map_range(address, end)
 
         # Demonstrate that it's mapped
         # data = binascii.hexlify(self.uc.mem_read(address, size))
         # debug("# Memory is mapped: %#x --> %r", (address, data))
 
-        return True
+        return all(
+            page in self.mapped_pages
+            for page in range(
+                pwndbg.lib.memory.page_align(address),
+                pwndbg.lib.memory.page_size_align(address + size),
+                pwndbg.lib.memory.PAGE_SIZE,
+            )
+        )
 
     def hook_intr(self, uc, intno, user_data) -> None:
         """
@@ -10,6 +10,7 @@ supplemental information sources (e.g. active IDA Pro connection).
 from __future__ import annotations
 
 import string
+from typing import Any
 from typing import Tuple
 
 import pwndbg
@@ -55,32 +56,28 @@ def int_str(value: int) -> str:
     return retval
 
 
-# @pwndbg.lib.cache.cache_until("stop")
-def enhance(
+@pwndbg.lib.cache.cache_until("stop")
+def resolve(
     value: int,
     code: bool = True,
     safe_linking: bool = False,
-    attempt_dereference=True,
-    enhance_string_len: int = None,
-) -> str:
+    attempt_dereference: bool = True,
+    enhance_string_len: int | None = None,
+) -> Tuple[Any, ...]:
     """
-    Given the last pointer in a chain, attempt to characterize
-
-    Note that 'the last pointer in a chain' may not at all actually be a pointer.
-
-    Additionally, optimizations are made based on various sources of data for
-    'value'. For example, if it is set to RWX, we try to get information on whether
-    it resides on the stack, or in a RW section that *happens* to be RWX, to
-    determine which order to print the fields.
-
-    Arguments:
-        value(obj): Value to enhance
-        code(bool): Hint that indicates the value may be an instruction
-        safe_linking(bool): Whether this chain use safe-linking
-        enhance_string_len(int): The length of string to display for enhancement of the last pointer
+    Read everything :func:`enhance` needs to know about ``value``, without
+    formatting it. The result is kept until the next stop, so that enhancing
+    the same value again doesn't read the memory again, while changes to the
+    colors or to the configuration still apply to it.
+
+    Returns one of:
+
+    - ``("pointer", address)``: an address to show with its symbol
+    - ``("integer", value)``: a plain integer
+    - ``("fields", fields)``: the ``(kind, value)`` pairs to show, where kind is
+      ``"instr"``, ``"int"`` or ``"str"``; the first one is the main description
+      and the others go into a comment
     """
-    value = int(value)
-
     page = pwndbg.aglib.vmmap.find(value)
 
     # If it's not in a page we know about, try to dereference
@@ -91,10 +88,10 @@ def enhance(
 
     # If it's a pointer that we told we cannot deference, then color it accordingly and add symbol if can
     if page and not attempt_dereference:
-        return pwndbg.color.memory.get_address_and_symbol(value)
+        return ("pointer", value)
 
     if not can_read:
-        return E.integer(int_str(value))
+        return ("integer", value)
 
     # It's mapped memory, or we can at least read it.
     # Try to find out if it's a string.
@@ -119,69 +116,104 @@ def enhance(
             instr = " ".join(pwndbg_instr.asm_string.split())
 
     szval = pwndbg.aglib.strings.get(value, maxlen=enhance_string_len) or None
-    szval0 = szval
-    if szval:
-        szval = E.string(repr(szval))
 
     # Fix for case when we can't read the end address anyway (#946)
     if value + pwndbg.aglib.arch.ptrsize > page.end:
-        return E.integer(int_str(value))
+        return ("integer", value)
 
-    intval = int(pwndbg.aglib.memory.get_typed_pointer_value(pwndbg.aglib.typeinfo.pvoid, value))
+    intval = pwndbg.aglib.memory.pvoid(value)
     if safe_linking:
         intval ^= value >> 12
-    intval0 = intval
-    if 0 <= intval < 10:
-        intval = E.integer(str(intval))
-    else:
-        intval = E.integer("%#x" % int(intval & pwndbg.aglib.arch.ptrmask))
 
-    retval = []
+    intfield = ("int", intval)
+    strfield = ("str", szval)
+    retval: Tuple[Tuple[str, Any], ...] = ()
 
-    # print([instr,intval0,szval])
     if not code:
         instr = None
 
     # If it's on the stack, don't display it as code in a chain.
     if instr and "[stack" in page.objfile:
-        retval = [intval, szval]
+        retval = (intfield, strfield)
 
     # If it's RWX but a small value, don't display it as code in a chain.
-    elif instr and rwx and intval0 < 0x1000:
-        retval = [intval, szval]
+    elif instr and rwx and intval < 0x1000:
+        retval = (intfield, strfield)
 
     # If it's an instruction and *not* RWX, display it unconditionally
     elif instr and exe:
         if not rwx:
-            if szval:
-                retval = [instr, szval]
-            else:
-                retval = [instr]
+            retval = (("instr", instr), strfield)
         else:
-            retval = [instr, intval, szval]
+            retval = (("instr", instr), intfield, strfield)
 
     # Otherwise strings have preference
     elif szval:
-        if len(szval0) < pwndbg.aglib.arch.ptrsize:
-            retval = [intval, szval]
+        if len(szval) < pwndbg.aglib.arch.ptrsize:
+            retval = (intfield, strfield)
         else:
-            retval = [szval]
+            retval = (strfield,)
 
     # And then integer
     else:
         # It might be a pointer or just a plain integer
-        new_page = pwndbg.aglib.vmmap.find(intval0)
+        new_page = pwndbg.aglib.vmmap.find(intval)
         if new_page:
-            return pwndbg.color.memory.get_address_and_symbol(intval0)
+            return ("pointer", intval)
         else:
-            return E.integer(int_str(intval0))
+            return ("integer", intval)
+
+    return ("fields", tuple(field for field in retval if field[1] is not None))
+
+
+def format_field(kind: str, value: Any) -> str:
+    if kind == "instr":
+        return value
+    if kind == "str":
+        return E.string(repr(value))
+    if 0 <= value < 10:
+        return E.integer(str(value))
+    return E.integer("%#x" % int(value & pwndbg.aglib.arch.ptrmask))
+
+
+def enhance(
+    value: int,
+    code: bool = True,
+    safe_linking: bool = False,
+    attempt_dereference=True,
+    enhance_string_len: int = None,
+) -> str:
+    """
+    Given the last pointer in a chain, attempt to characterize
+
+    Note that 'the last pointer in a chain' may not at all actually be a pointer.
+
+    Additionally, optimizations are made based on various sources of data for
+    'value'. For example, if it is set to RWX, we try to get information on whether
+    it resides on the stack, or in a RW section that *happens* to be RWX, to
+    determine which order to print the fields.
+
+    Arguments:
+        value(obj): Value to enhance
+        code(bool): Hint that indicates the value may be an instruction
+        safe_linking(bool): Whether this chain use safe-linking
+        enhance_string_len(int): The length of string to display for enhancement of the last pointer
+    """
+    kind, result = resolve(
+        int(value), bool(code), bool(safe_linking), bool(attempt_dereference), enhance_string_len
+    )
+
+    if kind == "pointer":
+        return pwndbg.color.memory.get_address_and_symbol(result)
 
-    retval = tuple(filter(lambda x: x is not None, retval))
+    if kind == "integer":
+        return E.integer(int_str(result))
 
-    if len(retval) == 0:
+    if len(result) == 0:
         return E.unknown("???")
 
-    if len(retval) == 1:
-        return retval[0]  # type: ignore[return-value]
+    fields = [format_field(*field) for field in result]
+    if len(fields) == 1:
+        return fields[0]
 
-    return retval[0] + E.comment(color.strip(f" /* {'; '.join(retval[1:])} */"))  # type: ignore[arg-type]
+    return fields[0] + E.comment(color.strip(f" /* {'; '.join(fields[1:])} */"))
@@ -36,6 +36,20 @@ known-good information as possible about them. Keep in mind that, although it is
 much faster than going to libc every time we need to know the allocation status
 of a chunk, this approach does have drawbacks when it comes to memory usage.
 
+# Batched mode
+Stopping into Python for every call to the allocator, and single stepping the
+inferior for the software watchpoints on every free chunk, make the approach
+above very slow on programs which allocate a lot. In batched mode, the hooks
+only append the calls they see to a ring buffer of `HeapEvent`s, and the events
+are replayed (see `pwndbg.lib.heap.tracking`) when the inferior stops, when a
+report is asked for, or when the buffer is full. Double frees, frees of unknown
+pointers and allocations overlapping chunks in use are found by the replay.
+
+Use after free is only looked for if asked to, with watchpoints on the few
+chunks freed last. In that case every call is replayed as soon as it returns,
+so that the watchpoints follow the frees as they happen, and like in the
+default mode, accesses made while the allocator runs don't trigger them.
+
 # Compatibility
 Currently module assumes the inferior is using GLibc.
 
@@ -55,6 +69,7 @@ from typing import List
 import gdb
 from sortedcontainers import SortedDict
 
+import pwndbg.aglib.arch
 import pwndbg.aglib.heap
 import pwndbg.aglib.heap.ptmalloc
 import pwndbg.aglib.memory
@@ -62,8 +77,13 @@ import pwndbg.aglib.proc
 import pwndbg.aglib.symbol
 import pwndbg.aglib.typeinfo
 import pwndbg.aglib.vmmap
+import pwndbg.arguments
+import pwndbg.lib.abi
 import pwndbg.lib.cache
 from pwndbg.color import message
+from pwndbg.lib.heap.tracking import EventLog
+from pwndbg.lib.heap.tracking import HeapEvent
+from pwndbg.lib.heap.tracking import HeapState
 
 LIBC_NAME = "libc.so.6"
 MALLOC_NAME = "malloc"
@@ -294,15 +314,7 @@ class Tracker:
                 assert isinstance(
                     allocator, pwndbg.aglib.heap.ptmalloc.GlibcMemoryAllocator
                 ), "malloc allocator assert failed"
-                bins_list = [
-                    allocator.fastbins(lo_heap.arena.address),
-                    allocator.smallbins(lo_heap.arena.address),
-                    allocator.largebins(lo_heap.arena.address),
-                    allocator.unsortedbin(lo_heap.arena.address),
-                ]
-                if allocator.has_tcache():
-                    bins_list.append(allocator.tcachebins(None))
-                bins_list = [x for x in bins_list if x is not None]
+                free_chunks = allocator.free_chunks(lo_heap.arena.address)
 
                 for ch in lo_heap:
                     # Check for range overlap.
@@ -323,18 +335,14 @@ class Tracker:
                         continue
 
                     # Check if the chunk is free.
-                    for b in bins_list:
-                        if b.contains_chunk(ch.real_size, ch.address):
-                            # The chunk is free. Add it to the free list and install
-                            # a new watch point for it.
-                            nch = Chunk(ch.address, ch.size, ch.real_size, 0)
-                            wp = FreeChunkWatchpoint(nch, self)
-
-                            self.free_chunks[ch.address] = nch
-                            self.free_watchpoints[ch.address] = wp
-
-                            # Move on to the next chunk.
-                            break
+                    if free_chunks.contains_chunk(ch.real_size, ch.address):
+                        # The chunk is free. Add it to the free list and install
+                        # a new watch point for it.
+                        nch = Chunk(ch.address, ch.size, ch.real_size, 0)
+                        wp = FreeChunkWatchpoint(nch, self)
+
+                        self.free_chunks[ch.address] = nch
+                        self.free_watchpoints[ch.address] = wp
         except IndexError:
             import traceback
 
@@ -590,6 +598,192 @@ class FreeExitBreakpoint(gdb.FinishBreakpoint):
         self.tracker.exit_memory_management()
 
 
+def read_argument(n: int) -> int:
+    """
+    Reads the nth argument of the call being made, straight from the selected
+    frame when it's in a register, so that recording a call doesn't have to
+    clear and fill the register cache again.
+    """
+    regs = pwndbg.lib.abi.ABI.default().register_arguments
+    if n < len(regs):
+        return int(gdb.selected_frame().read_register(regs[n])) & pwndbg.aglib.arch.ptrmask
+
+    pwndbg.lib.cache.clear_cache("stop")
+    return pwndbg.arguments.argument(n)
+
+
+class BatchedTracker(Tracker):
+    """
+    Tracker for the batched mode, which records the calls to the allocator
+    and only replays them in batches.
+    """
+
+    def __init__(self, capacity: int, watch_recent: int) -> None:
+        super().__init__()
+        self.log = EventLog(capacity)
+        self.state = HeapState()
+        self.issues: List[str] = []
+        self.watch_recent = watch_recent
+        self.recent_watchpoints: Dict[int, RecentFreeWatchpoint] = {}
+
+    def record(self, event: HeapEvent) -> bool:
+        """
+        Records an event, replaying the pending ones if the log is full or if
+        the chunks freed last are watched. Returns whether the inferior should
+        stop.
+        """
+        if self.log.append(event) or self.watch_recent:
+            return self.flush()
+        return False
+
+    def flush(self) -> bool:
+        """
+        Replays the pending events, updates the watchpoints and reports the
+        issues the events show. Returns whether the inferior should stop.
+        """
+        issues = self.state.replay(self.log.take())
+        if self.watch_recent:
+            self.sync_watchpoints()
+        if not issues:
+            return False
+
+        for issue in issues:
+            print(f"[!] {issue}")
+        self.issues += issues
+
+        global stop_on_error
+        if stop_on_error:
+            global last_issue
+            last_issue = message.error(issues[-1])
+        return stop_on_error
+
+    def sync_watchpoints(self) -> None:
+        """
+        Watches the chunks freed last, and stops watching the ones which were
+        allocated again or aren't among them anymore.
+        """
+        wanted = self.state.recently_freed(self.watch_recent)
+        for address in set(self.recent_watchpoints) - set(wanted):
+            wp = self.recent_watchpoints.pop(address)
+            wp.enabled = False
+            DEFERED_DELETE.append(wp)
+
+        for address in wanted:
+            if address not in self.recent_watchpoints:
+                size = self.state.freed[address]
+                chunk = Chunk(address, size, size, 0)
+                self.recent_watchpoints[address] = RecentFreeWatchpoint(chunk, self)
+
+    def remove_watchpoints(self) -> None:
+        for wp in self.recent_watchpoints.values():
+            wp.delete()
+        self.recent_watchpoints.clear()
+
+
+class RecentFreeWatchpoint(FreeChunkWatchpoint):
+    tracker: BatchedTracker
+
+    def stop(self) -> bool:
+        pwndbg.lib.cache.clear_cache("stop")
+        if not in_program_code_stack():
+            # Untracked.
+            return False
+
+        # The allocator keeps its lists in the free chunks.
+        if self.tracker.is_performing_memory_management():
+            return False
+
+        should_stop = self.tracker.flush()
+        if self.chunk.address not in self.tracker.state.freed:
+            # The chunk was allocated again since the watchpoint was installed.
+            return should_stop
+
+        msg = f"Possible use-after-free in {self.chunk.size}-byte chunk at address {self.chunk.address:#x}"
+        print(f"[!] {msg}")
+        self.tracker.issues.append(msg)
+
+        global stop_on_error
+        if stop_on_error:
+            global last_issue
+            last_issue = message.error(msg)
+        return stop_on_error
+
+
+class RecordEnterBreakpoint(gdb.Breakpoint):
+    def __init__(self, address: int, tracker: BatchedTracker, name: str) -> None:
+        super().__init__(f"*{address:#x}", internal=True)
+        self.tracker = tracker
+        self.name = name
+
+    def stop(self) -> bool:
+        if self.tracker.is_performing_memory_management():
+            # This call was made from inside another memory management call.
+            # Ignore it.
+            return False
+
+        freed = 0
+        requested_size = 0
+        kind = self.name
+        if self.name == FREE_NAME:
+            freed = read_argument(0)
+            if freed == 0:
+                return False
+        elif self.name == CALLOC_NAME:
+            requested_size = read_argument(0) * read_argument(1)
+        elif self.name == REALLOC_NAME:
+            freed = read_argument(0)
+            requested_size = read_argument(1)
+            if requested_size == 0 and freed != 0:
+                # GLibc frees the chunk and returns NULL.
+                kind = FREE_NAME
+        else:
+            requested_size = read_argument(0)
+
+        if kind == FREE_NAME and not self.tracker.watch_recent:
+            # Without watchpoints, nothing needs to know when free() returns.
+            thread = gdb.selected_thread().global_num
+            return self.tracker.record(HeapEvent(FREE_NAME, freed, thread=thread))
+
+        self.tracker.enter_memory_management(self.name)
+        RecordExitBreakpoint(self.tracker, kind, requested_size, freed)
+        return False
+
+
+class RecordExitBreakpoint(gdb.FinishBreakpoint):
+    def __init__(self, tracker: BatchedTracker, name: str, requested_size: int, freed: int) -> None:
+        super().__init__(internal=True)
+        self.tracker = tracker
+        self.name = name
+        self.requested_size = requested_size
+        self.freed = freed
+
+    def stop(self) -> bool:
+        self.tracker.exit_memory_management()
+
+        thread = gdb.selected_thread().global_num
+        if self.name == FREE_NAME:
+            return self.tracker.record(HeapEvent(FREE_NAME, self.freed, thread=thread))
+
+        ret_ptr = int(self.return_value)
+        if ret_ptr == 0:
+            # No change.
+            return False
+
+        return self.tracker.record(
+            HeapEvent(self.name, ret_ptr, self.requested_size, self.freed, thread)
+        )
+
+    def out_of_scope(self) -> None:
+        print(message.warn(f"warning: could not follow {self.name}() call"))
+        self.tracker.exit_memory_management()
+
+
+@pwndbg.dbg.event_handler(pwndbg.dbg_mod.EventType.STOP)
+def _flush_batched() -> None:
+    if batched_tracker is not None:
+        batched_tracker.flush()
+
+
 def in_program_code_stack() -> bool:
     exe = pwndbg.aglib.proc.exe
     binary_exec_page_ranges = tuple(
@@ -612,11 +806,19 @@ calloc_enter = None
 realloc_enter = None
 free_enter = None
 
+# The tracker installed in batched mode, if any.
+batched_tracker: BatchedTracker | None = None
+
 # Whether the inferior should be stopped when an error is detected.
 stop_on_error = True
 
 
-def install(disable_hardware_watchpoints=True) -> None:
+def install(
+    disable_hardware_watchpoints=True,
+    batched: bool = False,
+    capacity: int = 4096,
+    watch_recent: int = 0,
+) -> None:
     global malloc_enter
     global calloc_enter
     global realloc_enter
@@ -652,6 +854,12 @@ def install(disable_hardware_watchpoints=True) -> None:
     print(message.warn("diagnostics it procudes with a grain of salt. Use at your own risk."))
     print()
 
+    if batched:
+        install_batched(available[0], available[1], capacity, watch_recent)
+        if watch_recent == 0:
+            print("Heap tracker installed in batched mode.")
+            return
+
     # Disable hardware watchpoints.
     #
     # We don't really know how to make sure that the hardware watchpoints
@@ -675,6 +883,10 @@ def install(disable_hardware_watchpoints=True) -> None:
         )
         print()
 
+    if batched:
+        print(f"Heap tracker installed in batched mode, watching the last {watch_recent} frees.")
+        return
+
     # Install the heap tracker.
     tracker = Tracker()
 
@@ -692,13 +904,69 @@ def install(disable_hardware_watchpoints=True) -> None:
     print("Heap tracker installed.")
 
 
+def install_batched(malloc_address: int, free_address: int, capacity: int, watch_recent: int):
+    global malloc_enter
+    global calloc_enter
+    global realloc_enter
+    global free_enter
+    global batched_tracker
+
+    batched_tracker = BatchedTracker(capacity, watch_recent)
+
+    malloc_enter = RecordEnterBreakpoint(malloc_address, batched_tracker, MALLOC_NAME)
+    free_enter = RecordEnterBreakpoint(free_address, batched_tracker, FREE_NAME)
+
+    calloc_address = resolve_address(CALLOC_NAME)
+    if calloc_address:
+        calloc_enter = RecordEnterBreakpoint(calloc_address, batched_tracker, CALLOC_NAME)
+
+    realloc_address = resolve_address(REALLOC_NAME)
+    if realloc_address:
+        realloc_enter = RecordEnterBreakpoint(realloc_address, batched_tracker, REALLOC_NAME)
+
+
+def report(count: int = 10) -> None:
+    """
+    Replays the events recorded in batched mode and prints what is known about the heap.
+    """
+    if batched_tracker is None:
+        print(message.error("The heap tracker is not enabled in batched mode."))
+        return
+
+    batched_tracker.flush()
+    log = batched_tracker.log
+    state = batched_tracker.state
+
+    print(f"Events recorded: {log.total}")
+    print(f"Chunks in use:   {len(state.live)}")
+    print(f"Chunks freed:    {len(state.freed)}")
+    print(f"Chunks watched:  {len(batched_tracker.recent_watchpoints)}")
+
+    if batched_tracker.issues:
+        print()
+        print(message.error(f"Issues found ({len(batched_tracker.issues)}):"))
+        for issue in batched_tracker.issues:
+            print(f"    {issue}")
+
+    recent = log.recent(count)
+    if recent:
+        print()
+        print(f"Last {len(recent)} events:")
+        for event in recent:
+            print(f"    [thread {event.thread}] {event}")
+
+
 def uninstall() -> None:
     global malloc_enter
     global calloc_enter
     global realloc_enter
     global free_enter
+    global batched_tracker
 
     if is_enabled():
+        if batched_tracker is not None:
+            batched_tracker.remove_watchpoints()
+            batched_tracker = None
         malloc_enter.delete()
         free_enter.delete()
 
@@ -8,6 +8,7 @@ system has /proc/$$/maps, which backs 'info proc mapping'.
 
 from __future__ import annotations
 
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Set
@@ -296,7 +297,7 @@ def proc_tid_maps() -> Tuple[pwndbg.lib.memory.Page, ...] | None:
 
     for location in locations:
         try:
-            data = pwndbg.aglib.file.get(location).decode()
+            data = pwndbg.aglib.file.get(location)
             break
         except OSError:
             continue
@@ -304,38 +305,78 @@ def proc_tid_maps() -> Tuple[pwndbg.lib.memory.Page, ...] | None:
         return None
 
     # Process hasn't been fully created yet; it is in Z (zombie) state
-    if data == "":
+    if data == b"":
         return ()
 
-    pages: List[pwndbg.lib.memory.Page] = []
-    for line in data.splitlines():
-        maps, perm, offset, dev, inode_objfile = line.split(maxsplit=4)
+    return _proc_maps.update(data)
 
-        start, stop = maps.split("-")
 
-        try:
-            inode, objfile = inode_objfile.split(maxsplit=1)
-        except Exception:
-            # Name unnamed anonymous pages so they can be used e.g. with search commands
-            objfile = "[anon_" + start[:-3] + "]"
+def parse_proc_maps_line(line: str) -> pwndbg.lib.memory.Page:
+    """
+    Parse one line of /proc/$TID/maps into a pwndbg.lib.memory.Page object.
+    """
+    maps, perm, offset, dev, inode_objfile = line.split(maxsplit=4)
 
-        start = int(start, 16)
-        stop = int(stop, 16)
-        offset = int(offset, 16)
-        size = stop - start
+    start, stop = maps.split("-")
 
-        flags = 0
-        if "r" in perm:
-            flags |= 4
-        if "w" in perm:
-            flags |= 2
-        if "x" in perm:
-            flags |= 1
+    try:
+        inode, objfile = inode_objfile.split(maxsplit=1)
+    except Exception:
+        # Name unnamed anonymous pages so they can be used e.g. with search commands
+        objfile = "[anon_" + start[:-3] + "]"
 
-        page = pwndbg.lib.memory.Page(start, size, flags, offset, objfile)
-        pages.append(page)
+    start = int(start, 16)
+    stop = int(stop, 16)
+    offset = int(offset, 16)
+    size = stop - start
 
-    return tuple(pages)
+    flags = 0
+    if "r" in perm:
+        flags |= 4
+    if "w" in perm:
+        flags |= 2
+    if "x" in perm:
+        flags |= 1
+
+    return pwndbg.lib.memory.Page(start, size, flags, offset, objfile)
+
+
+class ProcMaps:
+    """
+    The pages parsed from the last contents of a /proc/$TID/maps file.
+
+    The file rarely changes between two stops, so the pages are only parsed
+    again when its contents are different, and even then only the lines which
+    were not there before are parsed.
+    """
+
+    def __init__(self) -> None:
+        self.data = b""
+        self.lines: Dict[str, pwndbg.lib.memory.Page] = {}
+        self.pages: Tuple[pwndbg.lib.memory.Page, ...] = ()
+
+    def update(self, data: bytes) -> Tuple[pwndbg.lib.memory.Page, ...]:
+        if data == self.data:
+            return self.pages
+
+        lines: Dict[str, pwndbg.lib.memory.Page] = {}
+        for line in data.decode().splitlines():
+            page = self.lines.get(line)
+            lines[line] = page if page is not None else parse_proc_maps_line(line)
+
+        self.data = data
+        self.lines = lines
+        self.pages = tuple(lines.values())
+        return self.pages
+
+    def clear(self) -> None:
+        self.data = b""
+        self.lines = {}
+        self.pages = ()
+
+
+_proc_maps = ProcMaps()
+pwndbg.lib.cache.register_cache(_proc_maps, "start", "exit")
 
 
 @pwndbg.lib.cache.cache_until("stop")
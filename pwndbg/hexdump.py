@@ -6,14 +6,17 @@ from __future__ import annotations
 
 import math
 import string
+import struct
+from typing import Dict
+from typing import Tuple
 
 import pwnlib.util.lists
 
 import pwndbg
 import pwndbg.aglib.arch
 import pwndbg.aglib.memory
-import pwndbg.aglib.typeinfo
 import pwndbg.color.hexdump as H
+import pwndbg.lib.arch
 from pwndbg.color import theme
 from pwndbg.commands.windbg import enhex
 
@@ -94,7 +97,7 @@ def hexdump(
             # Don't allow iterating over this generator again
             return
 
-        data = list(bytearray(data))
+        data = bytes(data)
 
         # Hexdump lines to skip_lines values and yields:
         #
@@ -108,14 +111,45 @@ def hexdump(
         config_separator_str = H.separator(str(config_separator))
         config_byte_separator_str = str(config_byte_separator)
 
-        groupped = groupby(width, data, fill=-1)
-        before_last_idx = len(groupped) - 2
+        # Formatted cells of every byte value, and of the padding after the last byte
+        hex_cells = [color_scheme[c] + config_byte_separator_str for c in range(256)]
+        lsb_cells = [
+            H.highlight_group_lsb(color_scheme[c]) + config_byte_separator_str for c in range(256)
+        ]
+        ascii_cells = [printable[c] for c in range(256)]
+        fill_hex = color_scheme[-1] + config_byte_separator_str
+        fill_lsb = H.highlight_group_lsb(color_scheme[-1]) + config_byte_separator_str
+        fill_ascii = printable[-1]
+
+        def format_group(group: bytes) -> Tuple[str, str]:
+            missing = group_width - len(group)
+            if not flip_group_endianness:
+                hexcells = "".join(map(hex_cells.__getitem__, group)) + fill_hex * missing
+            elif group:
+                # The first byte of the group is shown last and highlighted
+                hexcells = (
+                    fill_hex * missing
+                    + "".join(map(hex_cells.__getitem__, reversed(group[1:])))
+                    + lsb_cells[group[0]]
+                )
+            else:
+                hexcells = fill_hex * (missing - 1) + fill_lsb
+            asciicells = "".join(map(ascii_cells.__getitem__, group)) + fill_ascii * missing
+            return hexcells + " ", asciicells + config_separator_str
+
+        # Memory tends to repeat the same groups (zeroes, pointers), so the
+        # formatted groups are reused
+        group_cells: Dict[bytes, Tuple[str, str]] = {}
+
+        line_count = (len(data) + width - 1) // width
+        for i in range(line_count):
+            increment = i * width
+            line = data[increment : increment + width]
 
-        for i, line in enumerate(groupped):
             # Handle skipping of identical lines (see skip_lines comment above)
             if skip:
                 # Count lines to be skipped by checking next/future line
-                if i <= before_last_idx and line == groupped[i + 1]:
+                if i < line_count - 1 and line == data[increment + width : increment + 2 * width]:
                     skip_lines += 1
 
                     # Since we count from -1 then 0 means we are on first line
@@ -129,34 +163,26 @@ def hexdump(
                     yield out
                     # Fallthrough (do not continue) so we yield the current line too
 
-            increment = i * width
             hexline = [
                 H.offset(f"+{offset + increment:04x} "),
                 H.address(f"{address + increment:#08x}  "),
             ]
+            asciiline = [config_separator_str]
 
-            for group in groupby(group_width, line):
-                group = reversed(group) if flip_group_endianness else group
-                for idx, char in enumerate(group):
-                    if flip_group_endianness and idx == group_width - 1:
-                        hexline.append(H.highlight_group_lsb(color_scheme[char]))
-                    else:
-                        hexline.append(color_scheme[char])
-                    hexline.append(config_byte_separator_str)
-                hexline.append(" ")
-
-            hexline.append(config_separator_str)
-            for group in groupby(group_width, line):
-                for char in group:
-                    hexline.append(printable[char])
-                hexline.append(config_separator_str)
+            for group_start in range(0, width, group_width):
+                group = line[group_start : group_start + group_width]
+                cells = group_cells.get(group)
+                if cells is None:
+                    if len(group_cells) >= 0x10000:
+                        group_cells.clear()
+                    cells = group_cells[group] = format_group(group)
+                hexline.append(cells[0])
+                asciiline.append(cells[1])
 
-            yield "".join(hexline)
+            yield "".join(hexline) + "".join(asciiline)
 
     else:
         # Traditionally, windbg will display 16 bytes of data per line.
-        values = []
-
         if repeat:
             count = hexdump.last_count
             address = hexdump.last_address
@@ -164,14 +190,19 @@ def hexdump(
             address = int(address) & pwndbg.aglib.arch.ptrmask
             count = int(count)
 
-        size_type = pwndbg.aglib.typeinfo.get_type(size)
+        # Read everything at once, and keep the values before the first unreadable one
+        try:
+            data = pwndbg.aglib.memory.read(address, count * size, partial=True)
+        except pwndbg.dbg_mod.Error:
+            data = b""
 
-        for i in range(count):
-            try:
-                gval = pwndbg.aglib.memory.get_typed_pointer_value(size_type, address + i * size)
-                values.append(int(gval))
-            except pwndbg.dbg_mod.Error:
-                break
+        fmts = (
+            pwndbg.lib.arch.FMT_LITTLE_ENDIAN
+            if pwndbg.aglib.arch.endian == "little"
+            else pwndbg.lib.arch.FMT_BIG_ENDIAN
+        )
+        end = len(data) // size * size
+        values = [value for (value,) in struct.iter_unpack(fmts[size], memoryview(data)[:end])]
 
         if not values:
             print("Could not access the provided address")
@@ -2,19 +2,27 @@
 Caches return values until some event in the inferior happens,
 e.g. execution stops because of a SIGINT or breakpoint, or a
 new library/objfile are loaded, etc.
+
+Every event keeps a generation counter which is incremented when the event
+fires. Caches remember the generation they were filled in and drop their
+entries lazily, on the first access after the generation has changed, so
+firing an event does not need to touch every registered cache.
 """
 
 from __future__ import annotations
 
-from collections import UserDict
+import sys
+import weakref
+from collections import OrderedDict
 from functools import wraps
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Protocol
 from typing import Tuple
 from typing import TypeVar
-from typing import Union
 
 from typing_extensions import ParamSpec
 
@@ -29,44 +37,17 @@ debug = NO_DEBUG
 debug_name = "regs"
 
 
-class DebugCacheDict(UserDict):  # type: ignore[type-arg]
-    def __init__(self, func: Callable[P, T], *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
-        self.hits = 0
-        self.misses = 0
-        self.func = func
-        self.name = f'{func.__module__.split(".")[-1]}.{func.__name__}'
-
-    def __getitem__(self, key: Tuple[Any, ...]) -> Any:
-        if debug & DEBUG_GET and (not debug_name or debug_name in self.name):
-            print(f"GET {self.name}: {key}")
-        try:
-            value = self.data[key]
-            self.hits += 1
-            return value
-        except KeyError:
-            self.misses += 1
-            raise
-
-    def __setitem__(self, key: Tuple[Any, ...], value: Any) -> None:
-        if debug & DEBUG_SET and (not debug_name or debug_name in self.name):
-            print(f"SET {self.name}: {key}={value}")
-        self.data[key] = value
-
-    def clear(self) -> None:
-        if debug & DEBUG_CLEAR and (not debug_name or debug_name in self.name):
-            print(f"CLEAR {self.name} (hits: {self.hits}, misses: {self.misses})")
-        self.data.clear()
-        self.hits = 0
-        self.misses = 0
-
-
-Cache = Union[Dict[Tuple[Any, ...], Any], DebugCacheDict]
+class Clearable(Protocol):
+    def clear(self) -> None: ...
 
 
 class _CacheUntilEvent:
     def __init__(self) -> None:
-        self.caches: List[Cache] = []
+        # Incremented every time the event fires, which invalidates all
+        # `CacheDict`s registered for this event
+        self.generation = 0
+        # Caches not created by `cache_until` which have to be cleared eagerly
+        self.caches: List[Clearable] = []
 
     def connect_event_hooks(self, event_hooks: Tuple[Any, ...], **kwargs: Any) -> None:
         """
@@ -78,12 +59,16 @@ class _CacheUntilEvent:
             event_hook(self.clear, **kwargs)
 
     def clear(self) -> None:
+        self.generation += 1
         for cache in self.caches:
             cache.clear()
 
-    def add_cache(self, cache: Cache) -> None:
+    def add_cache(self, cache: Clearable) -> None:
         self.caches.append(cache)
 
+    def remove_cache(self, cache: Clearable) -> None:
+        self.caches.remove(cache)
+
 
 _ALL_CACHE_UNTIL_EVENTS: Dict[str, _CacheUntilEvent] = {
     "stop": _CacheUntilEvent(),
@@ -94,10 +79,123 @@ _ALL_CACHE_UNTIL_EVENTS: Dict[str, _CacheUntilEvent] = {
     "thread": _CacheUntilEvent(),
     "prompt": _CacheUntilEvent(),
     "forever": _CacheUntilEvent(),
+    # Fired by `pwndbg.aglib.vmmap` when it finds the memory mappings changed
+    "vmmap": _CacheUntilEvent(),
 }
 _ALL_CACHE_EVENT_NAMES = tuple(_ALL_CACHE_UNTIL_EVENTS.keys())
 
 
+class CacheDict:
+    """
+    Storage of a function decorated with `cache_until`.
+
+    Entries are dropped lazily once any of the `events` fired since they
+    were stored. If `maxsize` is given, the least recently used entries
+    are evicted once the cache grows beyond it.
+    """
+
+    def __init__(
+        self, func: Callable[..., Any], events: Tuple[_CacheUntilEvent, ...], maxsize: int | None
+    ) -> None:
+        self.func = func
+        self.name = f'{func.__module__.split(".")[-1]}.{func.__name__}'
+        self.events = events
+        self.maxsize = maxsize
+        self.data: Dict[Any, Any] = OrderedDict() if maxsize is not None else {}
+        self.generation = self._current_generation()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _current_generation(self) -> int:
+        # Generations never decrease, so the sum changes whenever any event fires
+        if len(self.events) == 1:
+            return self.events[0].generation
+        return sum(event.generation for event in self.events)
+
+    def _validate(self) -> None:
+        generation = self._current_generation()
+        if generation != self.generation:
+            if debug & DEBUG_CLEAR and (not debug_name or debug_name in self.name):
+                print(f"CLEAR {self.name} (hits: {self.hits}, misses: {self.misses})")
+            self.data.clear()
+            self.generation = generation
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        self._validate()
+        if debug & DEBUG_GET and (not debug_name or debug_name in self.name):
+            print(f"GET {self.name}: {key}")
+
+        value = self.data.get(key, default)
+        if value is default:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if self.maxsize is not None:
+                self.data.move_to_end(key)  # type: ignore[attr-defined]
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._validate()
+        if debug & DEBUG_SET and (not debug_name or debug_name in self.name):
+            print(f"SET {self.name}: {key}={value}")
+
+        self.data[key] = value
+        if self.maxsize is not None and len(self.data) > self.maxsize:
+            self.data.popitem(last=False)  # type: ignore[call-arg]
+            self.evictions += 1
+
+    def __getitem__(self, key: Any) -> Any:
+        self._validate()
+        return self.data[key]
+
+    def __contains__(self, key: Any) -> bool:
+        self._validate()
+        return key in self.data
+
+    def __len__(self) -> int:
+        self._validate()
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[Any]:
+        self._validate()
+        return iter(self.data)
+
+    def values(self) -> Iterator[Any]:
+        self._validate()
+        return iter(self.data.values())
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        self._validate()
+        return iter(self.data.items())
+
+    def clear(self) -> None:
+        if debug & DEBUG_CLEAR and (not debug_name or debug_name in self.name):
+            print(f"CLEAR {self.name} (hits: {self.hits}, misses: {self.misses})")
+        self.data.clear()
+        self.generation = self._current_generation()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def approximate_size(self) -> int:
+        """
+        Shallow estimate of the memory used by the cached keys and values, in bytes.
+        """
+        self._validate()
+        size = sys.getsizeof(self.data)
+        for key, value in self.data.items():
+            size += sys.getsizeof(key) + sys.getsizeof(value)
+        return size
+
+
+#: All live caches created by the `cache_until` decorator. The references are
+#: weak, so that functions decorated at runtime can be freed with their cache.
+ALL_CACHES: weakref.WeakSet[CacheDict] = weakref.WeakSet()
+
+
 def connect_clear_caching_events(event_dicts: Dict[str, Tuple[Any, ...]], **kwargs: Any) -> None:
     """
     Connect given debugger event hooks to correspoonding _CacheUntilEvent instances
@@ -124,16 +222,22 @@ IS_CACHING_DISABLED_FOR: Dict[str, bool] = {
     "thread": False,
     "prompt": False,
     "forever": False,
+    "vmmap": False,
 }
 
 
-def cache_until(*event_names: str) -> Callable[[Callable[P, T]], Callable[P, T]]:
+def cache_until(
+    *event_names: str, maxsize: int | None = None
+) -> Callable[[Callable[P, T]], Callable[P, T]]:
     if any(event_name not in _ALL_CACHE_EVENT_NAMES for event_name in event_names):
         raise ValueError(
             f"Unknown event name[s] passed to the `cache_until` decorator: {event_names}.\n"
             f"Expected: {_ALL_CACHE_EVENT_NAMES}"
         )
 
+    if maxsize is not None and maxsize <= 0:
+        raise ValueError(f"maxsize must be a positive number, got {maxsize}")
+
     def inner(func: Callable[P, T]) -> Callable[P, T]:
         if hasattr(func, "cache"):
             raise ValueError(
@@ -141,12 +245,17 @@ def cache_until(*event_names: str) -> Callable[[Callable[P, T]], Callable[P, T]]
                 "Pass multiple event names to the `cache_until` decorator."
             )
 
-        cache: Cache = {} if not debug else DebugCacheDict(func)
+        cache = CacheDict(
+            func, tuple(_ALL_CACHE_UNTIL_EVENTS[e] for e in event_names), maxsize=maxsize
+        )
+        ALL_CACHES.add(cache)
 
         @wraps(func)
         def decorator(*a: P.args, **kw: P.kwargs) -> T:
-            if IS_CACHING and not any((IS_CACHING_DISABLED_FOR[e] for e in event_names)):
-                key: Tuple[Any, ...] = (a, _KWARGS_SEPARATOR, *kw.items())
+            if IS_CACHING and not any(IS_CACHING_DISABLED_FOR[e] for e in event_names):
+                # Positional arguments are used as the key as they are, so
+                # calls without arguments don't have to build a new tuple
+                key: Tuple[Any, ...] = (a, _KWARGS_SEPARATOR, *kw.items()) if kw else a
 
                 # Check if the value is in the cache; if we have a cache miss,
                 # we return a special singleton object `_NOT_FOUND_IN_CACHE`. This way
@@ -176,15 +285,34 @@ def cache_until(*event_names: str) -> Callable[[Callable[P, T]], Callable[P, T]]
         # this may be useful for tests
         decorator.cache = cache  # type: ignore[attr-defined]
 
-        # Register the cache for the given event so it can be cleared
-        for event_name in event_names:
-            _ALL_CACHE_UNTIL_EVENTS[event_name].add_cache(cache)
-
         return decorator
 
     return inner
 
 
+def register_cache(cache: Clearable, *event_names: str) -> None:
+    """
+    Register a cache object that is not created by the `cache_until` decorator
+    so it gets cleared on the given events. The object only needs a `clear` method.
+    """
+    if any(event_name not in _ALL_CACHE_EVENT_NAMES for event_name in event_names):
+        raise ValueError(
+            f"Unknown event name[s] passed to `register_cache`: {event_names}.\n"
+            f"Expected: {_ALL_CACHE_EVENT_NAMES}"
+        )
+
+    for event_name in event_names:
+        _ALL_CACHE_UNTIL_EVENTS[event_name].add_cache(cache)
+
+
+def unregister_cache(cache: Clearable, *event_names: str) -> None:
+    """
+    Stop clearing a cache registered with `register_cache` on the given events.
+    """
+    for event_name in event_names:
+        _ALL_CACHE_UNTIL_EVENTS[event_name].remove_cache(cache)
+
+
 def clear_caches() -> None:
     for cache in _ALL_CACHE_UNTIL_EVENTS.values():
         cache.clear()
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from typing import Generator
+from typing import List
+from typing import Tuple
 
 import pwndbg.aglib.arch
+import pwndbg.lib.memory
 
 
 def find_fastbin_size(mem: bytes, max_size: int, step: int) -> Generator[int, None, None]:
@@ -24,3 +27,34 @@ def find_fastbin_size(mem: bytes, max_size: int, step: int) -> Generator[int, No
             # for, but still be able to reach the target address
             if value <= max_size <= i + value:
                 yield i - psize
+
+
+def find_fake_fast_sizes(
+    mem: bytes | bytearray | memoryview,
+    address: int,
+    size_field_width: int,
+    min_size: int,
+    max_size: int,
+    align_mask: int,
+    endian: str = "little",
+    step: int = 1,
+) -> List[Tuple[int, int]]:
+    """
+    Returns (address, size) for every size field in `mem`, which was read from
+    `address`, whose size without the flags is between `min_size` and `max_size`.
+    Size fields are looked for at every `step` bytes from the start of `mem`.
+
+    The size fields are decoded by `find_pointers` with one C-level unpack pass
+    per alignment, instead of slicing the buffer and calling `unpack_size` at
+    every offset.
+    """
+    low = min_size & ~align_mask
+    high = (max_size | align_mask) + 1
+    results = []
+    for offset, value in pwndbg.lib.memory.find_pointers(
+        mem, size_field_width, low, high, endian, step
+    ):
+        size = value & ~align_mask
+        if min_size <= size <= max_size:
+            results.append((address + offset, size))
+    return results
@@ -0,0 +1,153 @@
+"""
+Bookkeeping for the batched mode of the heap tracker.
+
+In that mode, the breakpoints on the allocator functions only append an
+`HeapEvent` to an `EventLog`, and the events are replayed into a `HeapState`
+in batches: when the inferior stops, when a report is asked for, or when the
+log is about to overwrite events that weren't replayed yet.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from itertools import islice
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+
+from sortedcontainers import SortedDict
+
+MALLOC = "malloc"
+CALLOC = "calloc"
+REALLOC = "realloc"
+FREE = "free"
+
+
+class HeapEvent(NamedTuple):
+    kind: str
+    #: The pointer returned by the allocation, or the pointer passed to free()
+    address: int
+    #: The requested size, for allocations
+    size: int = 0
+    #: The pointer passed to realloc()
+    freed: int = 0
+    #: The global number of the thread which made the call
+    thread: int = 0
+
+    def __str__(self) -> str:
+        if self.kind == FREE:
+            return f"free({self.address:#x})"
+        if self.kind == REALLOC:
+            return f"realloc({self.freed:#x}, {self.size}) -> {self.address:#x}"
+        return f"{self.kind}({self.size}) -> {self.address:#x}"
+
+
+class EventLog:
+    """
+    A ring buffer of the most recent heap events, which remembers how many of
+    them were replayed already.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.events: Deque[HeapEvent] = deque(maxlen=capacity)
+        #: Number of events ever appended
+        self.total = 0
+        #: Number of events handed out by `take`
+        self.taken = 0
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.taken
+
+    def append(self, event: HeapEvent) -> bool:
+        """
+        Appends an event. Returns True when the log is full of events which were
+        not taken yet, in which case they must be taken before the next append.
+        """
+        self.events.append(event)
+        self.total += 1
+        return len(self.events) == self.events.maxlen and self.pending >= len(self.events)
+
+    def take(self) -> List[HeapEvent]:
+        """Returns the events appended since the last call, oldest first."""
+        pending = self.pending
+        self.taken = self.total
+        return list(islice(self.events, len(self.events) - pending, None))
+
+    def recent(self, count: int) -> List[HeapEvent]:
+        """Returns up to `count` of the most recent events, oldest first."""
+        return list(islice(self.events, max(len(self.events) - count, 0), None))
+
+
+class HeapState:
+    """
+    The chunks the heap events say are in use or free, keyed by the address of
+    their user data.
+    """
+
+    def __init__(self) -> None:
+        #: Pointers returned by allocations and not freed yet, with their requested size
+        self.live: SortedDict[int, int] = SortedDict()
+        #: Freed pointers which no allocation returned again since
+        self.freed: SortedDict[int, int] = SortedDict()
+        #: The keys of `freed`, in the order they were freed
+        self.free_order: Dict[int, None] = {}
+        #: Number of events replayed so far
+        self.replayed = 0
+
+    def replay(self, events: List[HeapEvent]) -> List[str]:
+        """Applies the events, oldest first, and returns the issues they show."""
+        issues: List[str] = []
+        for event in events:
+            if event.kind == FREE:
+                self._free(event.address, "free()", issues)
+            elif event.kind == REALLOC:
+                # The chunk may be resized in place, the allocation below takes
+                # the pointer out of the freed ones again in that case
+                if event.freed:
+                    self._free(event.freed, "realloc()", issues)
+                self._allocate(event.address, event.size, str(event), issues)
+            else:
+                self._allocate(event.address, event.size, str(event), issues)
+        self.replayed += len(events)
+        return issues
+
+    def recently_freed(self, count: int) -> List[int]:
+        """Returns up to `count` of the pointers freed last, most recent first."""
+        return list(islice(reversed(self.free_order), count))
+
+    def _free(self, address: int, name: str, issues: List[str]) -> None:
+        size = self.live.pop(address, None)
+        if size is not None:
+            self.freed[address] = size
+            self.free_order[address] = None
+        elif address in self.freed:
+            issues.append(f"{name} double free of pointer {address:#x}")
+        else:
+            issues.append(f"{name} with previously unknown pointer {address:#x}")
+
+    def _allocate(self, address: int, size: int, call: str, issues: List[str]) -> None:
+        end = address + max(size, 1)
+
+        # Freed pointers inside of the new allocation were handed out again
+        for freed in _overlapping(self.freed, address, end):
+            del self.freed[freed]
+            del self.free_order[freed]
+
+        for start in _overlapping(self.live, address, end):
+            issues.append(f"{call} overlaps the chunk in use at {start:#x}")
+            del self.live[start]
+
+        self.live[address] = size
+
+
+def _overlapping(chunks: SortedDict[int, int], address: int, end: int) -> List[int]:
+    """Returns the keys of the chunks which overlap [address, end)."""
+    found = list(chunks.irange(address, end, inclusive=(True, False)))
+    lower = chunks.bisect_left(address)
+    if lower > 0:
+        start, size = chunks.peekitem(lower - 1)
+        if start + max(size, 1) > address:
+            found.insert(0, start)
+    return found
@@ -0,0 +1,160 @@
+"""
+Compact, address-sorted index of kernel symbols which can be stored on disk
+and reused across debugging sessions of the same kernel build.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import struct
+import zlib
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+# Bump the last byte when the layout changes, old files are ignored then
+MAGIC = b"PWNKSYM\x01"
+
+# magic, kernel base the addresses were recorded with, number of symbols
+_HEADER = struct.Struct("<8sQI")
+
+
+class SymbolIndex:
+    """
+    Kernel symbols sorted by address.
+
+    Addresses at or above `kbase` belong to the kernel image and move together
+    with it when KASLR picks a different base, see `rebase`. Addresses below
+    it (e.g. absolute per-cpu offsets) are kept as they are.
+    """
+
+    def __init__(self, kbase: int, addresses: List[int], names: List[str], types: str) -> None:
+        self.kbase = kbase
+        self.addresses = addresses
+        self.names = names
+        self.types = types
+
+    @classmethod
+    def from_symbols(cls, symbols: Dict[str, Tuple[int, str]], kbase: int) -> SymbolIndex:
+        entries = sorted((addr, name, type) for name, (addr, type) in symbols.items())
+        return cls(
+            kbase,
+            [addr for addr, _, _ in entries],
+            [name for _, name, _ in entries],
+            "".join(type for _, _, type in entries),
+        )
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def symbols(self) -> Dict[str, Tuple[int, str]]:
+        """
+        Returns a mapping of symbol names to their address and type.
+        """
+        return {
+            name: (addr, type) for addr, name, type in zip(self.addresses, self.names, self.types)
+        }
+
+    def address(self, name: str) -> int | None:
+        """
+        Returns the address of the symbol called `name`, or None if there is no such symbol.
+        """
+        try:
+            return self.addresses[self.names.index(name)]
+        except ValueError:
+            return None
+
+    def rebase(self, kbase: int) -> SymbolIndex:
+        """
+        Returns an index with the kernel image symbols moved to the new `kbase`.
+        """
+        delta = kbase - self.kbase
+        if delta == 0:
+            return self
+
+        addresses = [addr + delta if addr >= self.kbase else addr for addr in self.addresses]
+        entries = sorted(zip(addresses, self.names, self.types))
+        return SymbolIndex(
+            kbase,
+            [addr for addr, _, _ in entries],
+            [name for _, name, _ in entries],
+            "".join(type for _, _, type in entries),
+        )
+
+    def lookup(self, address: int) -> Tuple[str, str, int] | None:
+        """
+        Returns the name, type and offset of the symbol `address` is in, or None
+        if there is no such symbol.
+
+        Any symbol matches its exact address. Otherwise, the address must be in
+        the kernel image, below the last symbol, and is attributed to the closest
+        image symbol before it. Absolute symbols (e.g. per-cpu offsets at 0)
+        don't cover the memory after them.
+        """
+        idx = bisect.bisect_right(self.addresses, address) - 1
+        if idx < 0:
+            return None
+        if self.addresses[idx] == address:
+            return self.names[idx], self.types[idx], 0
+
+        if not self.kbase <= address <= self.addresses[-1]:
+            return None
+        while idx >= 0 and self.types[idx] in "aA":
+            idx -= 1
+        if idx < 0 or self.addresses[idx] < self.kbase:
+            return None
+        return self.names[idx], self.types[idx], address - self.addresses[idx]
+
+    def to_bytes(self) -> bytes:
+        count = len(self.addresses)
+        payload = b"".join(
+            (
+                struct.pack(f"<{count}Q", *self.addresses),
+                self.types.encode("latin-1"),
+                "\0".join(self.names).encode("latin-1"),
+            )
+        )
+        return _HEADER.pack(MAGIC, self.kbase, count) + zlib.compress(payload)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> SymbolIndex:
+        """
+        Parses an index serialized by `to_bytes`. Raises ValueError if the data is malformed.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("kallsyms index is truncated")
+
+        magic, kbase, count = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a kallsyms index or an unsupported version")
+
+        try:
+            payload = zlib.decompress(data[_HEADER.size :])
+        except zlib.error as e:
+            raise ValueError(f"kallsyms index is corrupted: {e}") from e
+
+        types_start = count * 8
+        names_start = types_start + count
+        if len(payload) < names_start:
+            raise ValueError("kallsyms index is truncated")
+
+        addresses = list(struct.unpack_from(f"<{count}Q", payload))
+        types = payload[types_start:names_start].decode("latin-1")
+        names = payload[names_start:].decode("latin-1").split("\0") if count else []
+        if len(names) != count:
+            raise ValueError("kallsyms index is corrupted: symbol count mismatch")
+
+        return cls(kbase, addresses, names, types)
+
+    def save(self, path: str) -> None:
+        # Write to a temporary file first, so a concurrent session never sees a partial index
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> SymbolIndex:
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
@@ -4,9 +4,20 @@ Reading, writing, and describing memory.
 
 from __future__ import annotations
 
+import bisect
 import os
+import re
+import struct
+from typing import Callable
+from typing import Dict
+from typing import Generator
+from typing import Iterable
+from typing import List
+from typing import Sequence
+from typing import Tuple
 
 import pwndbg.aglib.arch
+import pwndbg.lib.arch
 
 PAGE_SIZE = 0x1000
 PAGE_MASK = ~(PAGE_SIZE - 1)
@@ -48,6 +59,254 @@ def page_offset(address: int) -> int:
     return address & (PAGE_SIZE - 1)
 
 
+def unpack_words(
+    data: bytes | bytearray | memoryview,
+    size: int,
+    endian: str = "little",
+    step: int | None = None,
+) -> List[int]:
+    """unpack_words(data, size, endian="little", step=None) -> list
+
+    Decode the unsigned ``size``-byte words found at offsets ``0, step, 2*step, ...``
+    of ``data``, for every offset at which a whole word fits. ``step`` defaults
+    to ``size``. The decoding is done with one ``struct.iter_unpack`` pass per
+    word alignment instead of unpacking every offset separately.
+    """
+    if step is None:
+        step = size
+    if len(data) < size:
+        return []
+
+    fmts = (
+        pwndbg.lib.arch.FMT_LITTLE_ENDIAN if endian == "little" else pwndbg.lib.arch.FMT_BIG_ENDIAN
+    )
+    fmt = fmts[size]
+    view = memoryview(data)
+    count = (len(data) - size) // step + 1
+
+    if step % size == 0:
+        end = (count - 1) * step + size
+        words = [word for (word,) in struct.iter_unpack(fmt, view[:end])]
+        return words[:: step // size]
+
+    # Unaligned step: decode all words of every alignment, then pick the offsets
+    by_alignment = []
+    for alignment in range(size):
+        end = alignment + (len(data) - alignment) // size * size
+        by_alignment.append([word for (word,) in struct.iter_unpack(fmt, view[alignment:end])])
+
+    return [by_alignment[offset % size][offset // size] for offset in range(0, count * step, step)]
+
+
+def find_pointers(
+    data: bytes | bytearray | memoryview,
+    size: int,
+    low: int,
+    high: int,
+    endian: str = "little",
+    step: int | None = None,
+) -> List[Tuple[int, int]]:
+    """find_pointers(data, size, low, high, endian="little", step=None) -> list
+
+    Return ``(offset, value)`` for every ``size``-byte word at offsets
+    ``0, step, 2*step, ...`` of ``data`` with ``low <= value < high``,
+    sorted by offset. ``step`` defaults to ``size``.
+
+    Every word is still decoded into a tuple and an integer, but the words of
+    each alignment are unpacked by ``struct.iter_unpack`` and filtered in a
+    single comprehension, without slicing ``data`` at every offset.
+    """
+    if step is None:
+        step = size
+    if len(data) < size:
+        return []
+
+    fmts = (
+        pwndbg.lib.arch.FMT_LITTLE_ENDIAN if endian == "little" else pwndbg.lib.arch.FMT_BIG_ENDIAN
+    )
+    fmt = fmts[size]
+    view = memoryview(data)
+
+    if step % size != 0 and size % step != 0:
+        # Irregular steps visit every alignment in a different pattern
+        return [
+            (i * step, value)
+            for i, value in enumerate(unpack_words(data, size, endian, step))
+            if low <= value < high
+        ]
+
+    results: List[Tuple[int, int]] = []
+    if step % size == 0:
+        alignments = [0]
+        word_step = step // size
+    else:
+        alignments = list(range(0, size, step))
+        word_step = 1
+
+    for alignment in alignments:
+        end = alignment + (len(data) - alignment) // size * size
+        words = struct.iter_unpack(fmt, view[alignment:end])
+        results.extend(
+            (alignment + i * size, value)
+            for i, (value,) in enumerate(words)
+            if low <= value < high and i % word_step == 0
+        )
+
+    if len(alignments) > 1:
+        results.sort()
+    return results
+
+
+def next_match_address(address: int, length: int, align: int = 1, step: int = -1) -> int:
+    """next_match_address(address, length, align=1, step=-1) -> int
+
+    Return the lowest address at which a search may report its next match,
+    after a match of ``length`` bytes at ``address``. Without a ``step``,
+    matches don't overlap. With a ``step``, the search moves on to the next
+    ``step``-sized block.
+    """
+    if step > 0:
+        return round_up(round_down(address, step) + step, align)
+    return round_up(address + length, align)
+
+
+def find_in_buffer(
+    data: bytes | bytearray | memoryview,
+    pattern: bytes | bytearray,
+    base: int,
+    start: int | None = None,
+    align: int = 1,
+    step: int = -1,
+) -> Generator[int, None, None]:
+    """find_in_buffer(data, pattern, base, start=None, align=1, step=-1) -> generator
+
+    Yield the addresses of the matches of ``pattern`` in ``data``, which holds
+    the memory at ``base``. Only matches at or above ``start`` whose address is
+    a multiple of ``align`` are reported, and consecutive matches follow
+    :func:`next_match_address`.
+
+    The scanning itself is done by ``bytes.find``, so Python code only runs
+    for candidate matches.
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        data = bytes(data)
+    pattern = bytes(pattern)
+
+    pos = round_up(base if start is None else max(start, base), align) - base
+    while pos + len(pattern) <= len(data):
+        index = data.find(pattern, pos)
+        if index < 0:
+            return
+
+        address = base + index
+        if address & (align - 1):
+            pos = round_up(address, align) - base
+            continue
+
+        yield address
+        pos = next_match_address(address, len(pattern), align, step) - base
+
+
+def address_spans(
+    addresses: Sequence[int], length: int, max_size: int = 0x100000
+) -> List[Tuple[int, int, int, int]]:
+    """address_spans(addresses, length, max_size=0x100000) -> list
+
+    Group the sorted ``addresses``, each followed by ``length`` bytes of
+    interest, into spans of memory that can be read at once.
+
+    Returns ``(start, end, first, last)`` for every span, where the span covers
+    ``addresses[first:last]``. A span only grows into the page right after the
+    ones it already touches, so pages between distant addresses are not read,
+    and no span is longer than ``max_size`` bytes unless a single address needs it.
+    """
+    spans: List[Tuple[int, int, int, int]] = []
+    first = 0
+    start = end = 0
+    for i, address in enumerate(addresses):
+        if i > first and (
+            address >= round_up(end, PAGE_SIZE) + PAGE_SIZE or address + length - start > max_size
+        ):
+            spans.append((start, end, first, i))
+            first = i
+        if i == first:
+            start = address
+            end = address + length
+        else:
+            end = max(end, address + length)
+    if addresses:
+        spans.append((start, end, first, len(addresses)))
+    return spans
+
+
+class PatternSet:
+    """
+    A set of byte patterns which are all matched against a buffer in a
+    single pass.
+
+    Patterns of one width that are searched at an alignment of at least that
+    width are looked up in a hash set of the aligned words of the buffer.
+    Everything else is matched by one regular expression with all patterns
+    as alternatives.
+    """
+
+    def __init__(self, patterns: Iterable[bytes | bytearray]) -> None:
+        #: The distinct, non-empty patterns, in the order they were given
+        self.patterns: Tuple[bytes, ...] = tuple(dict.fromkeys(bytes(p) for p in patterns if p))
+        if not self.patterns:
+            raise ValueError("PatternSet needs at least one non-empty pattern")
+
+        #: Length of the longest pattern
+        self.max_length = max(len(p) for p in self.patterns)
+        widths = {len(p) for p in self.patterns}
+        self.width = self.max_length if len(widths) == 1 else None
+
+        self._words: Dict[int, bytes] | None = None
+        if self.width in pwndbg.lib.arch.FMT_LITTLE_ENDIAN:
+            self._words = {int.from_bytes(p, "little"): p for p in self.patterns}
+
+        # The regex only reports the longest pattern at every position, the
+        # shorter ones matching there are exactly its prefixes
+        by_length = sorted(self.patterns, key=len, reverse=True)
+        self._regex = re.compile(
+            b"(?=(" + b"|".join(re.escape(p) for p in by_length) + b"))", re.DOTALL
+        )
+        self._prefixes: Dict[bytes, List[bytes]] = {
+            p: [q for q in self.patterns if p.startswith(q)] for p in self.patterns
+        }
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def find(
+        self, data: bytes | bytearray | memoryview, base: int, align: int = 1
+    ) -> List[Tuple[int, bytes]]:
+        """
+        Return ``(offset, pattern)`` for every match in ``data``, which holds the
+        memory at ``base``, whose address is a multiple of ``align``. The
+        matches are sorted by offset.
+        """
+        first = round_up(base, align) - base
+
+        if self._words is not None and align >= self.width:
+            words = self._words
+            return [
+                (first + i * align, words[word])
+                for i, word in enumerate(
+                    unpack_words(memoryview(data)[first:], self.width, "little", align)
+                )
+                if word in words
+            ]
+
+        results: List[Tuple[int, bytes]] = []
+        for match in self._regex.finditer(data, first):
+            offset = match.start()
+            if (base + offset) & (align - 1):
+                continue
+            results.extend((offset, p) for p in self._prefixes[match.group(1)])
+        return results
+
+
 class Page:
     """
     Represents the address space and page permissions of at least
@@ -156,3 +415,169 @@ class Page:
 
     def __hash__(self) -> int:
         return hash((self.vaddr, self.memsz, self.flags, self.offset, self.objfile))
+
+
+class PageIndex:
+    """
+    Interval index over a set of pages, answering address lookups with a
+    binary search instead of a linear scan.
+
+    Any objects with ``start`` and ``end`` attributes can be indexed.
+    """
+
+    def __init__(self, pages: Iterable[Page]) -> None:
+        self.pages = tuple(sorted(pages, key=lambda page: page.start))
+        self.starts: List[int] = [page.start for page in self.pages]
+
+        # Running maximum of the end addresses, so that lookups still work
+        # if some of the mappings overlap (e.g. custom or explored pages)
+        self.max_ends: List[int] = []
+        max_end = 0
+        for page in self.pages:
+            max_end = max(max_end, page.end)
+            self.max_ends.append(max_end)
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def find(self, address: int) -> Page | None:
+        """
+        Return the lowest page containing ``address``, or None.
+        """
+        result = None
+        i = bisect.bisect_right(self.starts, address) - 1
+        while i >= 0 and self.max_ends[i] > address:
+            if address < self.pages[i].end:
+                result = self.pages[i]
+            i -= 1
+        return result
+
+    def find_near(self, address: int, max_distance: int) -> Page | None:
+        """
+        Return the highest page for which ``address`` lies within
+        ``max_distance`` bytes of its boundaries, or None.
+        """
+        i = bisect.bisect_right(self.starts, address + max_distance) - 1
+        while i >= 0 and self.max_ends[i] + max_distance > address:
+            if address < self.pages[i].end + max_distance:
+                return self.pages[i]
+            i -= 1
+        return None
+
+    def overlapping(self, start: int, end: int) -> List[Page]:
+        """
+        Return all pages intersecting ``[start, end)`` sorted by address.
+        """
+        result = []
+        i = bisect.bisect_right(self.max_ends, start)
+        while i < len(self.pages) and self.pages[i].start < end:
+            if self.pages[i].end > start:
+                result.append(self.pages[i])
+            i += 1
+        return result
+
+
+class PageCache:
+    """
+    Page-granular cache of inferior memory.
+
+    Reads are served from whole pages fetched through ``reader``, with
+    contiguous runs of missing pages being fetched in a single call. The
+    owner is responsible for calling :meth:`clear` whenever the memory of
+    the inferior may have changed (e.g. on every stop) and :meth:`invalidate`
+    on writes.
+    """
+
+    def __init__(
+        self,
+        reader: Callable[[int, int], bytes | bytearray],
+        max_read_pages: int = 64,
+        max_pages: int = 4096,
+    ) -> None:
+        #: Function reading exactly ``size`` bytes at ``address`` or raising
+        self.reader = reader
+        #: Reads spanning more pages than this bypass the cache
+        self.max_read_pages = max_read_pages
+        #: The cache is flushed once it holds more pages than this
+        self.max_pages = max_pages
+        self.pages: Dict[int, bytes] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def clear(self) -> None:
+        self.pages.clear()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, address: int, size: int) -> None:
+        """
+        Drop all cached pages overlapping ``[address, address + size)``.
+        """
+        if size <= 0 or not self.pages:
+            return
+        first = page_align(address)
+        last = page_align(address + size - 1)
+        for page in range(first, last + PAGE_SIZE, PAGE_SIZE):
+            self.pages.pop(page, None)
+
+    def _fill(self, first: int, last: int) -> bool:
+        """
+        Fetch all missing pages in ``[first, last]``, one read per
+        contiguous run. Returns False if any of them could not be read.
+        """
+        pages = self.pages
+        run_start = None
+        page = first
+        while page <= last + PAGE_SIZE:
+            missing = page <= last and page not in pages
+            if missing and run_start is None:
+                run_start = page
+            elif not missing and run_start is not None:
+                try:
+                    data = bytes(self.reader(run_start, page - run_start))
+                except Exception:
+                    return False
+                if len(data) != page - run_start:
+                    return False
+                for offset in range(0, len(data), PAGE_SIZE):
+                    pages[run_start + offset] = data[offset : offset + PAGE_SIZE]
+                run_start = None
+            page += PAGE_SIZE
+        return True
+
+    def read(self, address: int, size: int) -> bytearray | None:
+        """
+        Return ``size`` bytes at ``address`` from the cache, filling it as
+        needed. Returns None if the read is not cacheable or any of the pages
+        it touches could not be read, in which case the caller should perform
+        an uncached read to get the exact debugger semantics.
+        """
+        if size <= 0:
+            return bytearray()
+
+        first = page_align(address)
+        last = page_align(address + size - 1)
+        if last < first or (last - first) // PAGE_SIZE >= self.max_read_pages:
+            return None
+
+        pages = self.pages
+        if all(page in pages for page in range(first, last + PAGE_SIZE, PAGE_SIZE)):
+            self.hits += 1
+        else:
+            self.misses += 1
+            if len(pages) > self.max_pages:
+                pages.clear()
+            if not self._fill(first, last):
+                return None
+
+        offset = address - first
+        if first == last:
+            return bytearray(pages[first][offset : offset + size])
+
+        data = b"".join(pages[page] for page in range(first, last + PAGE_SIZE, PAGE_SIZE))
+        return bytearray(data[offset : offset + size])
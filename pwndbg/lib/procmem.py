@@ -0,0 +1,258 @@
+"""
+Searching the memory of a local process through ``/proc/<pid>/mem`` with a
+pool of worker processes.
+
+The workers are started by a forkserver rather than forked from the debugger,
+which has threads of its own and reaps the children it doesn't know about.
+They can't open the memory file themselves, as the kernel only allows that
+for the tracer, so the debugger's file descriptor is sent to them.
+"""
+
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import multiprocessing
+import multiprocessing.context
+import multiprocessing.reduction
+import os
+import shutil
+import signal
+import sys
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Generator
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+import pwndbg.lib.memory
+
+#: Number of bytes scanned by a single task
+CHUNK_SIZE = 0x800000
+
+
+def open_mem(pid: int) -> int | None:
+    """
+    Open ``/proc/<pid>/mem`` for reading. Returns None if it can't be opened.
+    """
+    try:
+        return os.open(f"/proc/{pid}/mem", os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def python_executable() -> str | None:
+    """
+    Returns the Python interpreter to start the workers with, or None if there
+    is none matching this one. In a debugger, ``sys.executable`` may be the
+    debugger itself.
+    """
+    if os.path.basename(sys.executable).startswith("python"):
+        return sys.executable
+
+    name = f"python{sys.version_info.major}.{sys.version_info.minor}"
+    for prefix in (sys.exec_prefix, sys.base_exec_prefix):
+        path = os.path.join(prefix, "bin", name)
+        if os.access(path, os.X_OK):
+            return path
+    return shutil.which(name)
+
+
+#: The multiprocessing context the workers are started from, set up by `_get_context`
+_context: multiprocessing.context.BaseContext | None = None
+
+
+def _get_context() -> multiprocessing.context.BaseContext:
+    """
+    Returns the forkserver context, setting it up on first use.
+
+    The interpreter and the preloaded modules of the forkserver are global to
+    multiprocessing, so this also changes the interpreter used by any other
+    spawn or forkserver process started from the debugger. That's why it is
+    only done once, and only when ``sys.executable`` isn't usable.
+    """
+    global _context
+
+    if _context is None:
+        context = multiprocessing.get_context("forkserver")
+        executable = python_executable()
+        if executable is not None and executable != sys.executable:
+            context.set_executable(executable)
+        context.set_forkserver_preload([__name__])
+        _context = context
+    return _context
+
+
+class _MemoryFile:
+    """
+    A file descriptor which is duplicated into the worker processes when they
+    are started.
+    """
+
+    def __init__(self, fd: int) -> None:
+        self.fd = fd
+
+    def __reduce__(self) -> Tuple[Callable[..., int], Tuple[Any]]:
+        # This is only called while a worker is being started, when the
+        # descriptor can be sent along with it
+        return _detach, (multiprocessing.reduction.DupFd(self.fd),)
+
+
+def _detach(dup: Any) -> int:
+    return dup.detach()
+
+
+#: The memory file of the debugged process, in the worker processes
+_worker_fd = -1
+
+
+def _init_worker(fd: int) -> None:
+    global _worker_fd
+
+    _worker_fd = fd
+    # Interrupting a search is handled by the debugger, which stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _scan_in_worker(
+    start: int, end: int, pattern: bytes, align: int, step: int
+) -> Tuple[List[int], int]:
+    return scan_chunk(_worker_fd, start, end, pattern, align, step)
+
+
+def scan_chunk(
+    fd: int,
+    start: int,
+    end: int,
+    pattern: bytes,
+    align: int = 1,
+    step: int = -1,
+    resume: int | None = None,
+) -> Tuple[List[int], int]:
+    """
+    Read ``[start, end)`` from the memory file ``fd`` and return the addresses of
+    the matches of ``pattern`` in it, as :func:`pwndbg.lib.memory.find_in_buffer`
+    reports them from ``resume`` on, along with the address the memory could
+    be read up to. Reads stop at the first unreadable page.
+    """
+    try:
+        data = os.pread(fd, end - start, start)
+    except OSError:
+        return [], start
+    found = list(pwndbg.lib.memory.find_in_buffer(data, pattern, start, resume, align, step))
+    return found, start + len(data)
+
+
+def split_ranges(
+    ranges: Iterable[Tuple[int, int]], overlap: int, chunk_size: int = CHUNK_SIZE
+) -> List[Tuple[int, int, int]]:
+    """
+    Split every ``(start, end)`` range at the multiples of ``chunk_size``.
+
+    Returns ``(start, end, read_end)`` for every chunk, where matches starting in
+    ``[start, end)`` are found by reading up to ``read_end``, which reaches up to
+    ``overlap`` bytes into the next chunk of the same range.
+    """
+    chunks = []
+    for range_start, range_end in ranges:
+        start = range_start
+        while start < range_end:
+            end = min(pwndbg.lib.memory.round_down(start, chunk_size) + chunk_size, range_end)
+            chunks.append((start, end, min(end + overlap, range_end)))
+            start = end
+    return chunks
+
+
+def search(
+    fd: int,
+    ranges: Iterable[Tuple[int, int]],
+    pattern: bytes,
+    align: int = 1,
+    step: int = -1,
+    limit: int | None = None,
+    workers: int | None = None,
+    fallback: Callable[[int, int, int], Iterable[int]] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Generator[int, None, None]:
+    """
+    Search the ``(start, end)`` ranges of the memory file ``fd`` for ``pattern``,
+    with the same semantics as ``find_in_memory`` called once per range.
+
+    The ranges are split into chunks which are scanned by ``workers`` processes
+    (all cores by default). The matches are yielded in address order as soon
+    as the chunks before them are done.
+
+    Chunks are scanned independently, so a worker doesn't know where the last
+    match of the previous chunk ends. When that match reaches into the chunk,
+    the chunk is scanned again in this process from where the match ends.
+    The parts of chunks which can't be read are passed to
+    ``fallback(start, end, resume)`` if given, and skipped otherwise.
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    ranges = list(ranges)
+    chunks = split_ranges(ranges, len(pattern) - 1, chunk_size)
+    range_starts = {start for start, _ in ranges}
+    workers = workers or os.cpu_count() or 1
+
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=_get_context(),
+        initializer=_init_worker,
+        initargs=(_MemoryFile(fd),),
+    )
+    pending: Deque[Tuple[Tuple[int, int, int], concurrent.futures.Future]] = collections.deque()
+    queued = iter(chunks)
+
+    def submit_next() -> None:
+        chunk = next(queued, None)
+        if chunk is not None:
+            start, _, read_end = chunk
+            pending.append(
+                (chunk, executor.submit(_scan_in_worker, start, read_end, pattern, align, step))
+            )
+
+    def chunk_matches(
+        start: int, read_end: int, found: List[int], read_to: int
+    ) -> Generator[int, None, None]:
+        yield from found
+        if read_to < read_end and fallback is not None:
+            # The chunk could only be read up to an unreadable page, matches
+            # ending past it are left to the fallback
+            yield from fallback(start, read_end, max(start, resume, read_to - len(pattern) + 1))
+
+    count = 0
+    resume = 0
+    try:
+        # Keep a few chunks per worker in flight, so that the workers don't
+        # run ahead of the consumer by much
+        for _ in range(2 * workers):
+            submit_next()
+
+        while pending:
+            (start, end, read_end), future = pending.popleft()
+            submit_next()
+
+            if start in range_starts:
+                # Matches only exclude each other within a range
+                resume = start
+
+            found, read_to = future.result()
+            if found and found[0] < resume:
+                found, read_to = scan_chunk(fd, start, read_end, pattern, align, step, resume)
+
+            for address in chunk_matches(start, read_end, found, read_to):
+                # Matches starting past the chunk belong to the next one
+                if address >= end:
+                    break
+                yield address
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+                resume = pwndbg.lib.memory.next_match_address(address, len(pattern), align, step)
+    finally:
+        # Wait for the workers to exit, the chunks they are scanning are small
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -8,6 +8,7 @@ from __future__ import annotations
 from typing import Dict
 from typing import Iterator
 from typing import List
+from typing import Mapping
 from typing import OrderedDict
 from typing import Set
 from typing import Tuple
@@ -100,6 +101,66 @@ class RegisterSet:
         yield from self.all
 
 
+class RegisterSnapshot(Mapping[str, Union[int, None]]):
+    """
+    The values of a fixed list of registers, read at one point in time.
+
+    A snapshot can't be modified. Snapshots of the same registers share their
+    names and their index, so each one only holds a tuple of values, and
+    finding what changed between two of them is a comparison of two tuples.
+    Registers which could not be read have the value None.
+    """
+
+    __slots__ = ("names", "values", "_index")
+
+    def __init__(
+        self,
+        names: Tuple[str, ...] = (),
+        values: Tuple[int | None, ...] = (),
+        index: Dict[str, int] | None = None,
+    ) -> None:
+        assert len(names) == len(values)
+        self.names = names
+        self.values = values
+        self._index = index if index is not None else {name: i for i, name in enumerate(names)}
+
+    def __getitem__(self, name: str) -> int | None:
+        return self.values[self._index[name]]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"RegisterSnapshot({dict(zip(self.names, self.values))!r})"
+
+    def with_values(self, values: Tuple[int | None, ...]) -> RegisterSnapshot:
+        """
+        Returns a snapshot of the same registers with other ``values``.
+        """
+        return RegisterSnapshot(self.names, values, self._index)
+
+    def changed(self, previous: Mapping[str, int | None]) -> List[str]:
+        """
+        Returns the registers of ``previous`` which have another value in this snapshot.
+        """
+        if isinstance(previous, RegisterSnapshot) and previous.names is self.names:
+            if previous.values == self.values:
+                return []
+            return [
+                name
+                for name, old, new in zip(self.names, previous.values, self.values)
+                if old != new
+            ]
+
+        return [name for name, value in previous.items() if name in self and self[name] != value]
+
+
 arm_cpsr_flags = BitFlags(
     [
         ("N", 31),
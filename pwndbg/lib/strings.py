@@ -1,8 +1,115 @@
 from __future__ import annotations
 
 import re
+from typing import List
+from typing import Tuple
 
 
 def strip_colors(text):
     """Remove all ANSI color codes from the text"""
     return re.sub(r"\x1b[^m]*m", "", text)
+
+
+#: Size in bytes of a character of the encodings `StringExtractor` supports
+CHAR_SIZES = {"ascii": 1, "utf-16le": 2}
+
+# One printable character, per encoding
+_CHARACTERS = {"ascii": rb"[ -~]", "utf-16le": rb"[ -~]\x00"}
+
+# The printable characters at the end of a chunk, matched on the reversed chunk.
+# For UTF-16LE, a lone printable byte may be the first half of a character.
+_REVERSED_TAILS = {"ascii": rb"[ -~]*", "utf-16le": rb"[ -~]?(?:\x00[ -~])*"}
+
+
+class StringExtractor:
+    """
+    Finds the printable strings of at least ``min_length`` characters in memory
+    that is fed to it in consecutive chunks.
+
+    The printable characters at the end of a chunk may continue in the next
+    one, so they are carried over instead of being matched right away. Once
+    they are long enough to be a string, they are kept as an open string which
+    the next chunks only extend, so that long printable regions aren't matched
+    again with every chunk.
+    """
+
+    def __init__(self, min_length: int, encoding: str = "ascii") -> None:
+        self.min_length = max(min_length, 1)
+        self.encoding = encoding
+        self.char_size = CHAR_SIZES[encoding]
+        self._regex = re.compile(b"(?:%s){%d,}" % (_CHARACTERS[encoding], self.min_length))
+        self._head = re.compile(b"(?:%s)*" % _CHARACTERS[encoding])
+        self._tail = re.compile(_REVERSED_TAILS[encoding])
+        self._carry = b""
+        # Address and pieces of the string which the last chunk ended in
+        self._run_address: int | None = None
+        self._run: List[bytes] = []
+        # Address right after the last chunk
+        self._next: int | None = None
+
+    def feed(self, address: int, data: bytes | bytearray) -> List[Tuple[int, bytes]]:
+        """
+        Returns ``(address, string)`` for the strings completed by the chunk of
+        memory at ``address``. A chunk that doesn't continue the previous one
+        ends the strings carried over from it.
+        """
+        results = self.finish() if address != self._next else []
+
+        data = self._carry + bytes(data)
+        base = address - len(self._carry)
+        self._next = base + len(data)
+        end = len(data) - self._tail_length(data)
+
+        start = 0
+        if self._run_address is not None:
+            start = self._head.match(data).end()
+            self._run.append(data[:start])
+            if end == 0:
+                # The whole chunk continues the open string
+                self._carry = data[start:]
+                return results
+            results.append(self._close_run())
+
+        results.extend(
+            (base + m.start(), m.group()) for m in self._regex.finditer(data, start, end)
+        )
+        self._carry = data[end:]
+
+        # The carried characters are a string already, keep it open
+        chars = len(self._carry) - len(self._carry) % self.char_size
+        if chars >= self.min_length * self.char_size:
+            self._run_address = base + end
+            self._run = [self._carry[:chars]]
+            self._carry = self._carry[chars:]
+        return results
+
+    def finish(self) -> List[Tuple[int, bytes]]:
+        """
+        Returns the strings carried over from the last chunk, which are complete
+        as no more memory follows it.
+        """
+        results = []
+        if self._run_address is not None:
+            results.append(self._close_run())
+        elif self._next is not None:
+            base = self._next - len(self._carry)
+            results = [(base + m.start(), m.group()) for m in self._regex.finditer(self._carry)]
+        self._carry = b""
+        self._next = None
+        return results
+
+    def _close_run(self) -> Tuple[int, bytes]:
+        result = (self._run_address, b"".join(self._run))
+        self._run_address = None
+        self._run = []
+        return result
+
+    def _tail_length(self, data: bytes) -> int:
+        # Only look at the end of the chunk, unless the string there is longer
+        window = 0x100
+        while True:
+            length = self._tail.match(data[-window:][::-1]).end()
+            # The window may start in the middle of a character
+            if length <= window - self.char_size or window >= len(data):
+                return length
+            window *= 4
@@ -4,10 +4,84 @@ Search the address space for byte patterns.
 
 from __future__ import annotations
 
+import concurrent.futures
+import os
 from typing import Collection
 from typing import Generator
+from typing import Iterable
+from typing import List
+from typing import Tuple
 
+import pwndbg.aglib.memory
+import pwndbg.aglib.proc
+import pwndbg.aglib.remote
 import pwndbg.aglib.vmmap
+import pwndbg.lib.memory
+import pwndbg.lib.procmem
+from pwndbg.color import message
+
+#: Number of bytes fetched from the inferior with a single read by `search_many`
+CHUNK_SIZE = 0x100000
+
+#: Searches over less memory than this are not worth starting worker processes for
+PARALLEL_MIN_SIZE = 2 * pwndbg.lib.procmem.CHUNK_SIZE
+
+search_workers = pwndbg.config.add_param(
+    "search-workers",
+    1,
+    "number of processes scanning memory in parallel for searches (0 for one per core)",
+    help_docstring="""\
+When this is not 1, searches over large amounts of memory of a local process
+read it through /proc/<pid>/mem and scan it with a pool of worker processes.
+If the workers can't be started, searches go back to running in the debugger
+itself for the rest of the session. Remote targets are never searched in
+parallel.
+""",
+)
+
+#: Set once the worker processes failed, so that later searches don't try again
+_parallel_search_failed = False
+
+
+def _parallel_search_workers(maps: Collection[pwndbg.lib.memory.Page]) -> int:
+    """
+    Returns how many worker processes should search the given mappings, or 1
+    if they should be searched by the debugger.
+    """
+    workers = int(search_workers) or os.cpu_count() or 1
+    if workers <= 1 or _parallel_search_failed or pwndbg.aglib.remote.is_remote():
+        return 1
+    if sum(m.memsz for m in maps) < PARALLEL_MIN_SIZE:
+        return 1
+    if pwndbg.lib.procmem.python_executable() is None:
+        return 1
+    return workers
+
+
+def _select_mappings(
+    mappings: Collection[pwndbg.lib.memory.Page] | None,
+    start: int | None,
+    end: int | None,
+    executable: bool,
+    writable: bool,
+) -> List[pwndbg.lib.memory.Page]:
+    maps = list(mappings or pwndbg.aglib.vmmap.get())
+
+    if end and start:
+        assert start < end, "Last address to search must be greater then first address"
+        maps = [m for m in maps if start in m or (end - 1) in m]
+    elif start:
+        maps = [m for m in maps if start in m]
+    elif end:
+        maps = [m for m in maps if (end - 1) in m]
+
+    if executable:
+        maps = [m for m in maps if m.execute]
+
+    if writable:
+        maps = [m for m in maps if m.write]
+
+    return maps
 
 
 def search(
@@ -23,6 +97,9 @@ def search(
 ) -> Generator[int, None, None]:
     """Search inferior memory for a byte sequence.
 
+    Large searches of a local process are done by a pool of worker processes
+    reading ``/proc/<pid>/mem``, see the ``search-workers`` parameter.
+
     Arguments:
         searchfor(bytes): Byte sequence to find
         mappings(list): List of pwndbg.lib.memory.Page objects to search
@@ -40,21 +117,7 @@ def search(
     """
     i = pwndbg.dbg.selected_inferior()
 
-    maps = mappings or pwndbg.aglib.vmmap.get()
-
-    if end and start:
-        assert start < end, "Last address to search must be greater then first address"
-        maps = [m for m in maps if start in m or (end - 1) in m]
-    elif start:
-        maps = [m for m in maps if start in m]
-    elif end:
-        maps = [m for m in maps if (end - 1) in m]
-
-    if executable:
-        maps = [m for m in maps if m.execute]
-
-    if writable:
-        maps = [m for m in maps if m.write]
+    maps = _select_mappings(mappings, start, end, executable, writable)
 
     if len(maps) == 0:
         print("No applicable memory regions found to search in.")
@@ -64,12 +127,48 @@ def search(
     if limit and limit <= 0:
         return
 
+    # Where the sequential search below starts
+    resume = 0
+
+    workers = _parallel_search_workers(maps)
+    fd = pwndbg.lib.procmem.open_mem(pwndbg.aglib.proc.pid) if workers > 1 else None
+    if fd is not None:
+
+        def fallback(start: int, end: int, resume: int) -> Generator[int, None, None]:
+            yield from i.find_in_memory(
+                bytearray(searchfor), resume, end - resume, aligned or 1, -1, step or -1
+            )
+
+        try:
+            for element in pwndbg.lib.procmem.search(
+                fd,
+                [(m.start, m.end) for m in maps],
+                bytes(searchfor),
+                aligned or 1,
+                step or -1,
+                limit or None,
+                workers,
+                fallback,
+            ):
+                yield element
+                count += 1
+                resume = pwndbg.lib.memory.next_match_address(
+                    element, len(searchfor), aligned or 1, step or -1
+                )
+            return
+        except (concurrent.futures.process.BrokenProcessPool, OSError, EOFError) as e:
+            _parallel_search_failure(e)
+        finally:
+            os.close(fd)
+
     for vmmap in maps:
-        start = vmmap.start
+        start = max(vmmap.start, resume)
         end = vmmap.end
 
         if limit and count >= limit:
             break
+        if start >= end:
+            continue
 
         for element in i.find_in_memory(
             bytearray(searchfor),
@@ -81,3 +180,78 @@ def search(
         ):
             yield element
             count += 1
+
+
+def _parallel_search_failure(error: Exception) -> None:
+    """
+    Warns that the search workers failed and stops using them for the session.
+    """
+    global _parallel_search_failed
+
+    _parallel_search_failed = True
+    print(message.warn(f"Parallel search failed ({error!r}), searching in the debugger instead."))
+    print(message.warn("Set search-workers to 1 to always search in the debugger."))
+
+
+def search_many(
+    patterns: Iterable[bytes],
+    mappings: Collection[pwndbg.lib.memory.Page] | None = None,
+    start: int | None = None,
+    end: int | None = None,
+    aligned: int | None = None,
+    limit: int | None = None,
+    executable: bool = False,
+    writable: bool = False,
+) -> Generator[Tuple[int, bytes], None, None]:
+    """Search inferior memory for several byte sequences at once.
+
+    Every mapping is read only once, and all patterns are matched against it
+    together with a :class:`pwndbg.lib.memory.PatternSet`. Unlike `search`,
+    matches of different patterns may overlap.
+
+    Arguments:
+        patterns(list): Byte sequences to find
+        mappings(list): List of pwndbg.lib.memory.Page objects to search
+            By default, uses all available mappings.
+        start(int): First address to search, inclusive.
+        end(int): Last address to search, exclusive.
+        aligned(int): Strict byte alignment for search result
+        limit(int): Maximum number of results to return
+        executable(bool): Restrict search to executable pages
+        writable(bool): Restrict search to writable pages
+
+    Yields:
+        ``(address, pattern)`` for every match, in address order per mapping
+    """
+    pattern_set = pwndbg.lib.memory.PatternSet(patterns)
+    maps = _select_mappings(mappings, start, end, executable, writable)
+
+    if len(maps) == 0:
+        print("No applicable memory regions found to search in.")
+        return
+
+    if limit and limit <= 0:
+        return
+
+    align = aligned or 1
+    # Keep chunks aligned, so that every chunk starts at a candidate address
+    chunk_size = max(CHUNK_SIZE // align, 1) * align
+    count = 0
+
+    for vmmap in maps:
+        for chunk_start in range(vmmap.start, vmmap.end, chunk_size):
+            # Patterns starting at the end of the chunk need a few more bytes
+            chunk_end = min(chunk_start + chunk_size + pattern_set.max_length - 1, vmmap.end)
+            try:
+                data = pwndbg.aglib.memory.read(chunk_start, chunk_end - chunk_start, partial=True)
+            except pwndbg.dbg_mod.Error:
+                continue
+
+            for offset, pattern in pattern_set.find(data, chunk_start, align):
+                # Matches starting past the chunk belong to the next one
+                if offset >= chunk_size:
+                    break
+                yield chunk_start + offset, pattern
+                count += 1
+                if limit and count >= limit:
+                    return
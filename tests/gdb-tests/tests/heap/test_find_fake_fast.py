@@ -72,6 +72,19 @@ def test_find_fake_fast_command(start_binary):
     check_result(result, 0x20)
     gdb.execute("continue")
 
+    # Searching for many targets at once finds the same chunks as searching for them one by one
+    fake_chunk = int(gdb.lookup_global_symbol("fake_chunk").value())
+    result = gdb.execute(
+        f"find_fake_fast &target_address --target {fake_chunk + 0x80:#x} --target &target_address",
+        to_string=True,
+    )
+    expected = gdb.execute("find_fake_fast &target_address", to_string=True)
+    expected += gdb.execute(f"find_fake_fast {fake_chunk + 0x80:#x}", to_string=True)
+    expected += gdb.execute("find_fake_fast &target_address", to_string=True)
+    assert re.findall(r"\bAddr: (0x[0-9a-f]+)", result) == re.findall(
+        r"\bAddr: (0x[0-9a-f]+)", expected
+    )
+
     # setup_mem(0x2F, 0x8)
     result = gdb.execute("find_fake_fast &target_address", to_string=True)
     check_result(result, 0x28)
@@ -6,6 +6,7 @@ import gdb
 import pytest
 
 import pwndbg.aglib.heap
+import pwndbg.aglib.heap.jemalloc
 import pwndbg.aglib.memory
 import pwndbg.aglib.symbol
 import pwndbg.aglib.typeinfo
@@ -593,3 +594,25 @@ def test_jemalloc_heap(start_binary):
 
     for i in range(len(expected_output)):
         assert re.match(expected_output[i], result[i])
+
+
+def test_jemalloc_find_extent_interior_pointer(start_binary):
+    start_binary(HEAP_JEMALLOC_HEAP)
+    gdb.execute("break break_here")
+    gdb.execute("continue")
+    gdb.execute("up")
+
+    rtree = pwndbg.aglib.heap.jemalloc.RTree.get_rtree()
+    # The extent map is built once per stop
+    assert rtree.extent_map is pwndbg.aglib.heap.jemalloc.RTree.get_rtree().extent_map
+
+    # The rtree only maps the boundaries of large extents, the extent map
+    # also finds them from pointers to their other pages
+    ptr2 = int(gdb.parse_and_eval("ptr2"))
+    extent = rtree.find_extent(ptr2)
+    assert extent is not None and extent.size == 0x8000
+    assert extent in rtree.extents
+
+    interior = rtree.find_extent(ptr2 + 0x4000)
+    assert interior is not None
+    assert interior.extent_address == extent.extent_address
@@ -3,6 +3,7 @@ from __future__ import annotations
 import gdb
 import pytest
 
+import pwndbg.aglib.arch
 import pwndbg.aglib.heap
 import pwndbg.aglib.memory
 import pwndbg.aglib.symbol
@@ -159,6 +160,44 @@ def test_heap_bins(start_binary):
     gdb.execute("bins")
 
 
+def test_heap_free_chunks_index(start_binary):
+    """
+    Tests that the free chunk index agrees with the bins, and is kept until the next stop
+    """
+    start_binary(BINARY)
+    gdb.execute("set context-output /dev/null")
+    gdb.execute("b breakpoint", to_string=True)
+    allocator = pwndbg.aglib.heap.current
+
+    # Stop once for each kind of bin filled by the binary
+    for _ in range(6):
+        gdb.execute("continue")
+
+        free_chunks = allocator.free_chunks()
+        assert allocator.free_chunks() is free_chunks
+
+        for bin_type in (
+            BinType.TCACHE,
+            BinType.FAST,
+            BinType.UNSORTED,
+            BinType.SMALL,
+            BinType.LARGE,
+        ):
+            for size, b in allocator.get_bins(bin_type).bins.items():
+                for addr in b.fd_chain[:-1]:
+                    assert any(
+                        entry.bin_type == bin_type
+                        and entry.size == size
+                        and entry.index == b.fd_chain.index(addr)
+                        for entry in free_chunks.get(addr)
+                    )
+
+        for size, b in allocator.tcachebins().bins.items():
+            for addr in b.fd_chain[:-1]:
+                chunk = addr - 2 * pwndbg.aglib.arch.ptrsize
+                assert BinType.TCACHE in free_chunks.bins_containing(size, chunk)
+
+
 def test_largebins_size_range_64bit(start_binary):
     """
     Ensure the "largebins" command displays the correct largebin size ranges.
@@ -239,3 +239,61 @@ def test_command_set_breakpoint_search_asm(start_binary):
         if line.startswith("Breakpoint"):
             result_count += 1
     assert result_count == 2
+
+
+def test_command_search_many(start_binary, tmp_path):
+    """
+    Tests searching for several values at once
+    """
+    start_binary(SEARCH_BINARY)
+
+    gdb.execute("break break_here")
+    gdb.execute("run")
+
+    values = [hex(SEARCH_PATTERN2), "0x1122334455667788"]
+    result_str = gdb.execute(f"search -8 --many {' '.join(values)}", to_string=True)
+    hits = [line for line in result_str.splitlines() if hex(SEARCH_PATTERN2) in line.lower()]
+    assert len(hits) == 3
+    assert all(line.endswith(f"[{values[0]}]") for line in hits)
+
+    # The same values read from a file
+    values_file = tmp_path / "values.txt"
+    values_file.write_text("# markers\n" + "\n".join(values) + "\n")
+    file_result_str = gdb.execute(f"search -8 --many {values_file}", to_string=True)
+    assert file_result_str.splitlines()[1:] == result_str.splitlines()[1:]
+
+    # Both patterns are found by a single search
+    result_str = gdb.execute(
+        f"search -4 -w -a 8 --many {SEARCH_PATTERN} {SEARCH_PATTERN2 & 0xFFFFFFFF}", to_string=True
+    )
+    labels = {line.split()[-1] for line in result_str.splitlines() if line.startswith("[")}
+    assert labels == {f"[{SEARCH_PATTERN}]", f"[{SEARCH_PATTERN2 & 0xFFFFFFFF}]"}
+
+
+def test_command_search_next(start_binary):
+    """
+    Tests narrowing down saved results with --next
+    """
+    start_binary(SEARCH_BINARY)
+
+    gdb.execute("break break_here")
+    gdb.execute("run")
+
+    def hits(result_str):
+        return [line.split()[1] for line in result_str.splitlines() if line.startswith("[anon_")]
+
+    first = hits(gdb.execute(f"search --dword {SEARCH_PATTERN} -w --save", to_string=True))
+    assert len(first) > 0x100
+
+    again = hits(gdb.execute(f"search --dword {SEARCH_PATTERN} -w --next", to_string=True))
+    assert again == sorted(first, key=lambda address: int(address, 16))
+
+    # Change two of the saved values and keep only those
+    changed = again[1::0x80][:2]
+    for address in changed:
+        gdb.execute(f"set *(unsigned int *){address} = 0x41424344")
+    narrowed = hits(gdb.execute("search --dword 0x41424344 -w --next", to_string=True))
+    assert narrowed == changed
+
+    result_str = gdb.execute(f"search --dword {SEARCH_PATTERN} -w --next", to_string=True)
+    assert "Search found 0 items" in result_str
@@ -8,6 +8,7 @@ import pwndbg.aglib.memory
 import pwndbg.aglib.proc
 import pwndbg.aglib.regs
 import pwndbg.aglib.vmmap
+import pwndbg.chain
 import tests
 
 TELESCOPE_BINARY = tests.binaries.get("telescope_binary.out")
@@ -164,3 +165,48 @@ def test_command_telescope_frame_bp_sp_different_vmmaps(start_binary):
         "Cannot display stack frame because base pointer is not on the same page with stack pointer"
         in result_str
     )
+
+
+def test_command_telescope_end_of_mapping(start_binary):
+    """
+    Tests that telescope stops at the end of a mapping and that the chains it
+    follows in bulk match the ones followed one by one
+    """
+    start_binary(TELESCOPE_BINARY)
+
+    gdb.execute("break break_here")
+    gdb.execute("run")
+
+    sp = pwndbg.aglib.regs.sp
+    stack_end = pwndbg.aglib.vmmap.find(sp).end
+    addresses = list(range(stack_end - 0x40, stack_end, 8))
+    assert pwndbg.chain.get_many(addresses) == [pwndbg.chain.get(a) for a in addresses]
+
+    result_lines = gdb.execute(f"telescope {stack_end - 0x20} 10", to_string=True).splitlines()
+    assert result_lines[-1] == f"<Could not read memory at {stack_end:#x}>"
+
+    stack_addresses = list(range(sp, sp + 0x400, 8))
+    assert pwndbg.chain.get_many(stack_addresses) == [pwndbg.chain.get(a) for a in stack_addresses]
+
+
+def test_chain_memoized_until_stop(start_binary):
+    """
+    Tests that pointer chains are followed once per stop and that memory writes
+    are seen by the next lookup
+    """
+    start_binary(TELESCOPE_BINARY)
+
+    gdb.execute("break break_here")
+    gdb.execute("run")
+
+    sp = pwndbg.aglib.regs.sp
+    chain = pwndbg.chain.get(sp)
+    hits = pwndbg.chain.memo_hits
+
+    # Callers get their own copy of the chain
+    chain.append(0)
+    assert pwndbg.chain.get(sp) == chain[:-1]
+    assert pwndbg.chain.memo_hits == hits + 1
+
+    gdb.execute("set *(long *)$sp = 0x41414141")
+    assert pwndbg.chain.get(sp)[:2] == [sp, 0x41414141]
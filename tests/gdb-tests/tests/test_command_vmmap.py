@@ -6,6 +6,7 @@ import gdb
 import pytest
 
 import pwndbg.aglib.proc
+import pwndbg.aglib.vmmap
 import tests
 
 GAPS_MAP_BINARY = tests.binaries.get("mmap_gaps.out")
@@ -207,3 +208,26 @@ def test_vmmap_gaps_option(start_binary):
     assert seen_gap
     assert seen_adjacent
     assert seen_guard
+
+
+def test_vmmap_reused_until_mappings_change(start_binary):
+    start_binary(GAPS_MAP_BINARY)
+    gdb.execute("break break_here")
+    gdb.execute("continue")
+
+    pages = pwndbg.aglib.vmmap.get()
+    index = pwndbg.aglib.vmmap.index()
+
+    # Stepping doesn't map anything, so the parsed mappings are kept
+    gdb.execute("stepi")
+    assert pwndbg.aglib.vmmap.get() is pages
+    assert pwndbg.aglib.vmmap.index() is index
+
+    # Changing the permissions of a mapping is noticed on the next stop
+    page = next(p for p in pages if p.read and not p.execute and not p.write)
+    gdb.execute(f"call (int)mprotect({page.vaddr:#x}, {page.memsz:#x}, 3)")
+    gdb.execute("stepi")
+    new_pages = pwndbg.aglib.vmmap.get()
+    assert new_pages is not pages
+    assert pwndbg.aglib.vmmap.find(page.vaddr).write
+    assert pwndbg.aglib.vmmap.index() is not index
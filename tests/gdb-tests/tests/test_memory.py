@@ -166,3 +166,29 @@ def test_fetch_struct_as_dictionary_exclude_filter(start_binary):
     )
 
     assert result == expected_result
+
+
+def test_memory_page_cache(start_binary):
+    """
+    Tests that repeated reads are served from the page cache and that the
+    cache is invalidated by writes made through gdb and through pwndbg.
+    """
+    start_binary(REFERENCE_BINARY)
+    stack_addr = pwndbg.aglib.regs.rsp
+
+    cache = pwndbg.aglib.memory.page_cache
+    cache.reset_stats()
+
+    original = pwndbg.aglib.memory.u64(stack_addr)
+    assert pwndbg.aglib.memory.u64(stack_addr) == original
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+    pwndbg.aglib.memory.write(stack_addr, b"\x41" * 8)
+    assert pwndbg.aglib.memory.u64(stack_addr) == 0x4141414141414141
+
+    gdb.execute(f"set *(unsigned long long *){stack_addr} = 0x1234")
+    assert pwndbg.aglib.memory.u64(stack_addr) == 0x1234
+
+    gdb.execute("stepi")
+    assert len(cache) == 0
@@ -3,6 +3,8 @@ from __future__ import annotations
 import gdb
 import pytest
 
+import pwndbg.aglib.disasm
+import pwndbg.aglib.memory
 import tests
 
 SYSCALLS_BINARY = tests.binaries.get("syscalls-x64.out")
@@ -184,3 +186,21 @@ def test_nearpc_opcode_invalid_config():
         )
     except gdb.error as e:
         assert expected == str(e)
+
+
+def test_nearpc_decode_cache_follows_code_changes(start_binary):
+    start_binary(SYSCALLS_BINARY)
+    gdb.execute("nextsyscall")
+
+    def line_at(dis, address):
+        return next(line for line in dis.splitlines() if f"{address:#x} " in line)
+
+    dis = gdb.execute("nearpc", to_string=True)
+    assert "add    byte ptr [rax], al" in line_at(dis, 0x40009D)
+    assert len(pwndbg.aglib.disasm.decode_instruction.cache) > 0
+
+    # Decoded instructions are keyed by their bytes, so patched code is decoded again
+    pwndbg.aglib.memory.write(0x40009D, b"\x90\x90")
+    dis = gdb.execute("nearpc", to_string=True)
+    assert "nop" in line_at(dis, 0x40009D)
+    assert "nop" in line_at(dis, 0x40009E)
@@ -60,6 +60,26 @@ def test_command_slab_info():
     assert "not found" in res
 
 
+def test_slab_freelists():
+    if not pwndbg.aglib.kernel.has_debug_syms():
+        return
+
+    for cache in pwndbg.aglib.kernel.slab.caches():
+        for cpu_cache in cache.cpu_caches:
+            slab = cpu_cache.active_slab
+            if slab is None:
+                continue
+
+            start, size = slab.region
+            for freelist in slab.freelists:
+                assert not freelist.is_corrupted
+                objects = list(freelist)
+                assert len(freelist) == len(objects)
+                assert all(start <= obj < start + size for obj in objects)
+                for obj, next_obj in zip(objects, objects[1:]):
+                    assert freelist.find_next(obj) == next_obj
+
+
 def test_command_slab_contains():
     if not pwndbg.aglib.kernel.has_debug_syms():
         res = gdb.execute("slab contains 0x123", to_string=True)
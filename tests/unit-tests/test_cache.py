@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import gc
+
+import pytest
+
+from pwndbg.lib import cache
+
+
+def test_cache_generation_invalidation():
+    calls = []
+
+    @cache.cache_until("stop")
+    def foo(a, b=0):
+        calls.append((a, b))
+        return a + b
+
+    assert foo(1) == foo(1) == 1
+    assert foo(1, b=2) == foo(1, b=2) == 3
+    assert calls == [(1, 0), (1, 2)]
+    assert foo.cache.hits == 2
+    assert foo.cache.misses == 2
+
+    # Firing an event only bumps the generation, the entries are dropped lazily
+    cache.clear_cache("stop")
+    assert len(foo.cache.data) == 2
+    assert len(foo.cache) == 0
+
+    assert foo(1) == 1
+    assert calls == [(1, 0), (1, 2), (1, 0)]
+
+    # Unrelated events don't invalidate the cache
+    cache.clear_cache("objfile")
+    assert foo(1) == 1
+    assert len(calls) == 3
+
+
+def test_cache_multiple_events():
+    calls = []
+
+    @cache.cache_until("start", "exit")
+    def foo():
+        calls.append(1)
+        return len(calls)
+
+    assert foo() == foo() == 1
+    cache.clear_cache("start")
+    assert foo() == 2
+    cache.clear_cache("exit")
+    assert foo() == 3
+    assert foo() == 3
+
+
+def test_cache_maxsize_lru():
+    @cache.cache_until("stop", maxsize=2)
+    def square(a):
+        return a * a
+
+    square(1)
+    square(2)
+    # Touch 1 so that 2 is the least recently used entry
+    square(1)
+    square(3)
+
+    assert list(square.cache) == [(1,), (3,)]
+    assert square.cache.evictions == 1
+
+    with pytest.raises(ValueError):
+        cache.cache_until("stop", maxsize=0)
+
+
+def test_cache_stats_registry():
+    @cache.cache_until("forever")
+    def foo():
+        return "value"
+
+    foo()
+    foo()
+    assert foo.cache in cache.ALL_CACHES
+    assert foo.cache.approximate_size() > 0
+
+    foo.cache.reset_stats()
+    assert foo.cache.hits == foo.cache.misses == 0
+
+    # The registry doesn't keep the caches of functions which are gone alive
+    registered = len(cache.ALL_CACHES)
+    del foo
+    gc.collect()
+    assert len(cache.ALL_CACHES) == registered - 1
+
+
+def test_register_cache_is_cleared_eagerly():
+    cleared = []
+
+    class Clearable:
+        def clear(self):
+            cleared.append(1)
+
+    clearable = Clearable()
+    cache.register_cache(clearable, "thread")
+    try:
+        cache.clear_cache("thread")
+        assert cleared == [1]
+    finally:
+        cache.unregister_cache(clearable, "thread")
+
+    cache.clear_cache("thread")
+    assert cleared == [1]
@@ -21,6 +21,7 @@ import mocks.gdb
 import mocks.gdblib  # noqa: F401
 
 # We must import the function under test after all the mocks are imported
+from pwndbg.lib.heap.helpers import find_fake_fast_sizes
 from pwndbg.lib.heap.helpers import find_fastbin_size
 
 
@@ -74,3 +75,23 @@ def test_unaligned():
     assert 0x1 == next(find_fastbin_size(buf, max_size, 1))
     with pytest.raises(StopIteration):
         next(find_fastbin_size(buf, max_size, 8))
+
+
+def test_fake_fast_sizes():
+    offsets = {
+        0x0: 0x10,
+        0x8: 0x2F,
+        0x11: 0x80,
+        0x20: 0x90,
+    }
+    buf = setup_mem(0x30, offsets)
+    assert find_fake_fast_sizes(buf, 0x1000, 8, 0x20, 0x80, 0xF) == [
+        (0x1008, 0x20),
+        (0x1011, 0x80),
+    ]
+    assert find_fake_fast_sizes(buf, 0x1000, 8, 0x20, 0x80, 0xF, step=8) == [(0x1008, 0x20)]
+
+    # The glibc fastbin bug only considers the low 4 bytes of the size field
+    buf = setup_mem(0x10, {0x8: 0xAABBCCDD00000020})
+    assert find_fake_fast_sizes(buf, 0x1000, 8, 0x20, 0x80, 0xF) == []
+    assert find_fake_fast_sizes(buf, 0x1000, 4, 0x20, 0x80, 0xF) == [(0x1008, 0x20)]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pwndbg.lib.heap.tracking import CALLOC
+from pwndbg.lib.heap.tracking import FREE
+from pwndbg.lib.heap.tracking import MALLOC
+from pwndbg.lib.heap.tracking import REALLOC
+from pwndbg.lib.heap.tracking import EventLog
+from pwndbg.lib.heap.tracking import HeapEvent
+from pwndbg.lib.heap.tracking import HeapState
+
+
+def test_event_log_take():
+    log = EventLog(4)
+    events = [HeapEvent(MALLOC, 0x1000 + i * 0x20, 0x18) for i in range(7)]
+
+    assert not log.append(events[0])
+    assert not log.append(events[1])
+    assert log.take() == events[:2]
+    assert log.take() == []
+
+    for event in events[2:5]:
+        assert not log.append(event)
+    # The log is full of events which were not taken yet
+    assert log.append(events[5])
+    assert log.take() == events[2:6]
+
+    assert not log.append(events[6])
+    assert log.recent(2) == events[5:7]
+    assert log.recent(10) == events[3:7]
+    assert log.total == 7 and log.pending == 1
+
+
+def test_heap_state_replay():
+    state = HeapState()
+    issues = state.replay(
+        [
+            HeapEvent(MALLOC, 0x1010, 0x18),
+            HeapEvent(CALLOC, 0x1030, 0x18),
+            HeapEvent(FREE, 0x1010),
+            HeapEvent(FREE, 0x1030),
+        ]
+    )
+    assert issues == []
+    assert list(state.live) == []
+    assert state.recently_freed(1) == [0x1030]
+
+    # Allocating a freed pointer again takes it out of the freed ones
+    assert state.replay([HeapEvent(MALLOC, 0x1030, 0x18)]) == []
+    assert state.recently_freed(2) == [0x1010]
+
+    issues = state.replay(
+        [
+            HeapEvent(FREE, 0x1010),
+            HeapEvent(FREE, 0x5000),
+            HeapEvent(MALLOC, 0x1040, 0x10),
+        ]
+    )
+    assert issues == [
+        "free() double free of pointer 0x1010",
+        "free() with previously unknown pointer 0x5000",
+        "malloc(16) -> 0x1040 overlaps the chunk in use at 0x1030",
+    ]
+    assert state.replayed == 8
+
+
+def test_heap_state_realloc():
+    state = HeapState()
+    issues = state.replay(
+        [
+            HeapEvent(REALLOC, 0x1010, 0x18),
+            HeapEvent(REALLOC, 0x1010, 0x28, 0x1010),
+            HeapEvent(REALLOC, 0x2010, 0x100, 0x1010),
+        ]
+    )
+    assert issues == []
+    assert dict(state.live) == {0x2010: 0x100}
+    assert state.recently_freed(10) == [0x1010]
+
+    assert state.replay([HeapEvent(REALLOC, 0x3010, 0x10, 0x4010)]) == [
+        "realloc() with previously unknown pointer 0x4010"
+    ]
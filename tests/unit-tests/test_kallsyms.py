@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from pwndbg.lib.kernel.kallsyms import SymbolIndex
+
+KBASE = 0xFFFFFFFF81000000
+
+SYMBOLS = {
+    "_text": (KBASE, "T"),
+    "commit_creds": (KBASE + 0x1230, "T"),
+    "prepare_kernel_cred": (KBASE + 0x1500, "T"),
+    "linux_banner": (KBASE + 0x200000, "D"),
+    "fixed_percpu_data": (0x0, "A"),
+}
+
+
+def test_symbol_index_lookup():
+    idx = SymbolIndex.from_symbols(SYMBOLS, KBASE)
+
+    assert len(idx) == len(SYMBOLS)
+    assert idx.symbols() == SYMBOLS
+    assert idx.addresses == sorted(idx.addresses)
+
+    assert idx.lookup(KBASE + 0x1230) == ("commit_creds", "T", 0)
+    assert idx.lookup(KBASE + 0x1234) == ("commit_creds", "T", 4)
+    assert idx.lookup(KBASE + 0x200000) == ("linux_banner", "D", 0)
+    assert idx.lookup(KBASE + 0x200001) is None
+    # Absolute symbols only match their exact address
+    assert idx.lookup(0x0) == ("fixed_percpu_data", "A", 0)
+    assert idx.lookup(0x7FFC12345678) is None
+    assert idx.lookup(KBASE - 8) is None
+    assert idx.address("prepare_kernel_cred") == KBASE + 0x1500
+    assert idx.address("missing") is None
+
+
+def test_symbol_index_rebase():
+    idx = SymbolIndex.from_symbols(SYMBOLS, KBASE)
+    assert idx.rebase(KBASE) is idx
+
+    new_base = KBASE + 0x2A00000
+    rebased = idx.rebase(new_base)
+
+    assert rebased.kbase == new_base
+    assert rebased.address("commit_creds") == new_base + 0x1230
+    # Absolute symbols below the kernel base are not relocated
+    assert rebased.address("fixed_percpu_data") == 0x0
+    assert rebased.rebase(KBASE).symbols() == SYMBOLS
+
+
+def test_symbol_index_serialization(tmp_path):
+    idx = SymbolIndex.from_symbols(SYMBOLS, KBASE)
+    path = str(tmp_path / "index")
+    idx.save(path)
+
+    loaded = SymbolIndex.load(path)
+    assert loaded.kbase == KBASE
+    assert loaded.symbols() == SYMBOLS
+
+    data = idx.to_bytes()
+    with pytest.raises(ValueError):
+        SymbolIndex.from_bytes(data[:-4])
+    with pytest.raises(ValueError):
+        SymbolIndex.from_bytes(b"X" + data[1:])
@@ -14,8 +14,17 @@ import mocks.gdb
 import mocks.gdblib  # noqa: F401
 
 # We must import the function under test after all the mocks are imported
+from pwndbg.lib.memory import Page
+from pwndbg.lib.memory import PageCache
+from pwndbg.lib.memory import PageIndex
+from pwndbg.lib.memory import PatternSet
+from pwndbg.lib.memory import address_spans
+from pwndbg.lib.memory import find_in_buffer
+from pwndbg.lib.memory import find_pointers
+from pwndbg.lib.memory import next_match_address
 from pwndbg.lib.memory import round_down
 from pwndbg.lib.memory import round_up
+from pwndbg.lib.memory import unpack_words
 
 
 def test_basic_rounding():
@@ -31,3 +40,226 @@ def test_many_rounding():
             up = round_up(n, alignment)
             assert down <= n and down + alignment > n and down % alignment == 0
             assert up >= n and up - alignment < n and up % alignment == 0
+
+
+class FakeMemory:
+    """Readable memory at [0x10000, 0x14000) filled with the low byte of each address."""
+
+    start = 0x10000
+    end = 0x14000
+
+    def __init__(self):
+        self.reads = []
+
+    def read(self, address, size):
+        self.reads.append((address, size))
+        if address < self.start or address + size > self.end:
+            raise ValueError("unreadable")
+        return bytearray(a & 0xFF for a in range(address, address + size))
+
+
+def test_page_cache_serves_repeated_reads():
+    mem = FakeMemory()
+    cache = PageCache(mem.read)
+
+    assert cache.read(0x10010, 8) == mem.read(0x10010, 8)
+    mem.reads.clear()
+
+    assert cache.read(0x10020, 8) == bytearray(range(0x20, 0x28))
+    assert cache.read(0x10FFC, 4) == bytearray(range(0xFC, 0x100))
+    assert mem.reads == []
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_page_cache_fills_contiguous_pages_in_one_read():
+    mem = FakeMemory()
+    cache = PageCache(mem.read)
+
+    data = cache.read(0x10FF0, 0x2020)
+    assert data == bytearray(a & 0xFF for a in range(0x10FF0, 0x13010))
+    assert mem.reads == [(0x10000, 0x4000)]
+
+    # Only the invalidated page is fetched again
+    cache.invalidate(0x11008, 1)
+    mem.reads.clear()
+    cache.read(0x10000, 0x4000)
+    assert mem.reads == [(0x11000, 0x1000)]
+
+
+def test_page_cache_unreadable_and_uncacheable():
+    mem = FakeMemory()
+    cache = PageCache(mem.read, max_read_pages=2)
+
+    # Crossing into unmapped memory is left to the caller
+    assert cache.read(0x13FF8, 0x10) is None
+    assert 0x13000 not in cache.pages
+
+    # Too large reads bypass the cache
+    assert cache.read(0x10000, 0x3000) is None
+    assert len(cache) == 0
+
+    cache.read(0x10000, 1)
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_page_index_matches_linear_scan():
+    pages = [
+        Page(start, 0x1000 * (i % 3 + 1), 4, 0)
+        for i, start in enumerate(range(0x400000, 0x500000, 0x5000))
+    ]
+    index = PageIndex(reversed(pages))
+
+    for addr in range(0x3FF000, 0x502000, 0x800):
+        expected = next((page for page in pages if addr in page), None)
+        assert index.find(addr) is expected
+
+    assert index.find(0) is None
+    assert index.find(0x400000) is pages[0]
+    assert index.find(0x401000) is None
+
+
+def test_page_index_find_near():
+    low = Page(0x1000, 0x1000, 4, 0)
+    high = Page(0x4000, 0x1000, 4, 0)
+    index = PageIndex([low, high])
+
+    assert index.find_near(0x2010, 0x20) is low
+    assert index.find_near(0x3FF0, 0x20) is high
+    assert index.find_near(0x3000, 0x20) is None
+    # The highest matching page wins, like the original linear scan
+    assert index.find_near(0x3000, 0x1000) is high
+
+
+def test_page_index_overlapping():
+    outer = Page(0x1000, 0x10000, 4, 0)
+    inner = Page(0x2000, 0x1000, 4, 0)
+    after = Page(0x20000, 0x1000, 4, 0)
+    index = PageIndex([after, inner, outer])
+
+    assert index.find(0x2800) is outer
+    assert index.find(0x8000) is outer
+    assert index.overlapping(0x2800, 0x20001) == [outer, inner, after]
+    assert index.overlapping(0x11000, 0x20000) == []
+
+
+def test_unpack_words():
+    data = bytes(range(32))
+
+    def naive(size, endian, step):
+        return [
+            int.from_bytes(data[offset : offset + size], endian)
+            for offset in range(0, len(data) - size + 1, step)
+        ]
+
+    for size in (1, 2, 4, 8):
+        for endian in ("little", "big"):
+            for step in (1, 2, 3, 4, 5, 8, 16):
+                assert unpack_words(data, size, endian, step) == naive(size, endian, step)
+
+    assert unpack_words(data, 8) == naive(8, "little", 8)
+    assert unpack_words(data[:7], 8) == []
+
+
+def test_find_pointers():
+    data = bytes(range(64))
+
+    def naive(size, low, high, endian, step):
+        words = [
+            (offset, int.from_bytes(data[offset : offset + size], endian))
+            for offset in range(0, len(data) - size + 1, step)
+        ]
+        return [(offset, value) for offset, value in words if low <= value < high]
+
+    for size in (4, 8):
+        for endian in ("little", "big"):
+            for step in (1, 2, 3, 4, 8, 16):
+                low = int.from_bytes(data[5 : 5 + size], endian)
+                high = int.from_bytes(data[40 : 40 + size], endian)
+                assert find_pointers(data, size, low, high, endian, step) == naive(
+                    size, low, high, endian, step
+                )
+
+    assert find_pointers(data[:3], 8, 0, 1 << 64) == []
+
+
+def test_next_match_address():
+    assert next_match_address(0x1003, 4) == 0x1007
+    assert next_match_address(0x1000, 4, 8) == 0x1008
+    assert next_match_address(0x1008, 4, 8, 0x100) == 0x1100
+    assert next_match_address(0x10F8, 16, 8, 0x100) == 0x1100
+
+
+def test_find_in_buffer():
+    base = 0x10003
+    data = b"AAAA" * 8 + b"xyAAz"
+
+    assert list(find_in_buffer(data, b"AA", base)) == [base + i for i in range(0, 32, 2)] + [
+        base + 34
+    ]
+    assert list(find_in_buffer(data, b"AA", base, align=4)) == [
+        0x10004,
+        0x10008,
+        0x1000C,
+        0x10010,
+        0x10014,
+        0x10018,
+        0x1001C,
+        0x10020,
+    ]
+    assert list(find_in_buffer(data, b"AA", base, align=4, step=0x10)) == [
+        0x10004,
+        0x10010,
+        0x10020,
+    ]
+    assert list(find_in_buffer(data, b"AA", base, start=0x1001F)) == [0x1001F, 0x10021, 0x10025]
+    assert list(find_in_buffer(memoryview(data), b"xyAAz", base)) == [base + 32]
+    assert list(find_in_buffer(data, b"zz", base)) == []
+
+
+def test_pattern_set():
+    data = bytes(range(64)) * 2
+    patterns = [bytes(range(i, i + 3)) for i in (1, 8, 30, 61)] + [b"\x08\x09"]
+
+    def naive(align):
+        return [
+            (offset, pattern)
+            for offset in range(len(data))
+            for pattern in dict.fromkeys(patterns)
+            if data.startswith(pattern, offset) and (0x1000 + offset) % align == 0
+        ]
+
+    pattern_set = PatternSet(patterns + [patterns[0]])
+    assert len(pattern_set) == 5
+    for align in (1, 2, 4, 8):
+        assert pattern_set.find(data, 0x1000, align) == naive(align)
+
+    # Fixed-width patterns searched at their own alignment are looked up by word
+    words = PatternSet([bytes(range(i, i + 4)) for i in (0, 4, 6, 60)])
+    assert words.find(data, 0x1000, 4) == [
+        (0, bytes(range(0, 4))),
+        (4, bytes(range(4, 8))),
+        (60, bytes(range(60, 64))),
+        (64, bytes(range(0, 4))),
+        (68, bytes(range(4, 8))),
+        (124, bytes(range(60, 64))),
+    ]
+    # Addresses, not offsets, have to be aligned
+    assert words.find(data, 0x1002, 4) == [(6, bytes(range(6, 10))), (70, bytes(range(6, 10)))]
+
+
+def test_address_spans():
+    assert address_spans([], 8) == []
+
+    addresses = [0x1000, 0x1008, 0x1FFC, 0x2010, 0x4000, 0x4001, 0x5FF8, 0x6000, 0x8000]
+    assert address_spans(addresses, 8) == [
+        (0x1000, 0x2018, 0, 4),
+        (0x4000, 0x6008, 4, 8),
+        (0x8000, 0x8008, 8, 9),
+    ]
+
+    # Spans are split once they grow too long
+    assert address_spans(addresses[:4], 8, 0x1000) == [
+        (0x1000, 0x1010, 0, 2),
+        (0x1FFC, 0x2018, 2, 4),
+    ]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import ctypes
+import mmap
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Replace `pwndbg.commands` module with a mock to prevent import errors, as well
+# as the `load_commands` function
+module_name = "pwndbg.commands"
+module = MagicMock(__name__=module_name, load_commands=lambda: None)
+sys.modules[module_name] = module
+
+# Load the mocks for the `gdb` and `gdblib` modules
+import mocks.gdb
+import mocks.gdblib  # noqa: F401
+
+# We must import the function under test after all the mocks are imported
+from pwndbg.lib import procmem
+from pwndbg.lib.memory import find_in_buffer
+
+
+def search_buffer(data, ranges, pattern, **kwargs):
+    # Place the data at an aligned address, so that offsets and addresses
+    # have the same alignment
+    buffer = ctypes.create_string_buffer(len(data) + 0x4000)
+    base = (ctypes.addressof(buffer) + 0x3FFF) & ~0x3FFF
+    ctypes.memmove(base, data, len(data))
+    fd = procmem.open_mem(os.getpid())
+    try:
+        found = procmem.search(
+            fd, [(base + start, base + end) for start, end in ranges], pattern, **kwargs
+        )
+        return [address - base for address in found]
+    finally:
+        os.close(fd)
+
+
+def test_split_ranges():
+    assert procmem.split_ranges([(0x1800, 0x3100), (0x4000, 0x4800)], 3, 0x1000) == [
+        (0x1800, 0x2000, 0x2003),
+        (0x2000, 0x3000, 0x3003),
+        (0x3000, 0x3100, 0x3100),
+        (0x4000, 0x4800, 0x4800),
+    ]
+
+
+def test_search_matches_across_chunks():
+    data = b"ab" * 0x4000
+    ranges = [(0, 0x3000), (0x3000, 0x8000)]
+
+    def expected(align, step):
+        return [
+            offset
+            for start, end in ranges
+            for offset in find_in_buffer(data[start:end], b"aba", start, align=align, step=step)
+        ]
+
+    for align, step in ((1, -1), (2, -1), (4, -1), (1, 0x40), (2, 0x2000)):
+        found = search_buffer(data, ranges, b"aba", align=align, step=step, chunk_size=0x1000)
+        assert found == expected(align, step)
+
+    assert search_buffer(data, ranges, b"aba", limit=5, chunk_size=0x1000) == [0, 4, 8, 12, 16]
+
+
+def test_search_falls_back_after_unreadable_page():
+    mapping = mmap.mmap(-1, 0x4000)
+    mapping.write(b"xyz" * (0x4000 // 3))
+    base = ctypes.addressof(ctypes.c_char.from_buffer(mapping))
+    # Reading the memory file stops at the hole, a page past the end of an
+    # empty file (unmapping the page would let other mappings take its place)
+    libc = ctypes.CDLL(None)
+    libc.mmap.restype = ctypes.c_void_p
+    libc.mmap.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_size_t,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_long,
+    ]
+    map_fixed = 0x10  # Not exported by the mmap module
+    empty = os.memfd_create("hole")
+    try:
+        hole = libc.mmap(
+            base + 0x1000, 0x1000, mmap.PROT_READ, mmap.MAP_SHARED | map_fixed, empty, 0
+        )
+    finally:
+        os.close(empty)
+    assert hole == base + 0x1000
+
+    unread = []
+
+    def fallback(start, end, resume):
+        unread.append((start - base, end - base, resume - base))
+        return []
+
+    fd = procmem.open_mem(os.getpid())
+    try:
+        found = procmem.search(
+            fd, [(base, base + 0x4000)], b"xyz", workers=2, fallback=fallback, chunk_size=0x1000
+        )
+        found = [address - base for address in found]
+    finally:
+        os.close(fd)
+
+    assert found == [*range(0, 0xFFD, 3), *range(0x2001, 0x3FFE, 3)]
+    # The rest of a chunk cut short by the hole is left to the fallback, from
+    # where a match could still begin
+    assert unread == [(0, 0x1002, 0xFFF), (0x1000, 0x2002, 0x1000)]
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+
+from pwndbg.lib.regs import RegisterSnapshot
+from pwndbg.lib.regs import reg_sets
+
+
+def test_register_snapshot_lookup():
+    snapshot = RegisterSnapshot(("rax", "rbx", "rip"), (1, None, 0x401000))
+
+    assert snapshot["rax"] == 1
+    assert snapshot["rbx"] is None
+    assert snapshot.get("rcx", 0) == 0
+    assert "rip" in snapshot and "rcx" not in snapshot
+    assert list(snapshot) == ["rax", "rbx", "rip"]
+    assert dict(snapshot) == {"rax": 1, "rbx": None, "rip": 0x401000}
+    with pytest.raises(KeyError):
+        snapshot["rcx"]
+
+
+def test_register_snapshot_changed():
+    names = tuple(reg_sets["x86-64"].common)
+    first = RegisterSnapshot(names, tuple(range(len(names))))
+    second = first.with_values(tuple(range(len(names) - 1)) + (-1,))
+
+    assert second.names is first.names
+    assert second.changed(first) == [names[-1]]
+    assert first.changed(first.with_values(first.values)) == []
+
+    # Nothing is reported as changed on the first stop
+    assert first.changed(RegisterSnapshot()) == []
+    # Other mappings are compared by name
+    assert second.changed({names[0]: 5, names[1]: 1, "unknown": 3}) == [names[0]]
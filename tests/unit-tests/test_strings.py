@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import re
+
+from pwndbg.lib.strings import StringExtractor
+
+
+def extract_in_chunks(data, min_length, encoding, chunk_size):
+    extractor = StringExtractor(min_length, encoding)
+    found = []
+    for offset in range(0, len(data), chunk_size):
+        found += extractor.feed(0x1000 + offset, data[offset : offset + chunk_size])
+    return found + extractor.finish()
+
+
+def test_string_extractor_ascii():
+    data = b"\x00hello\x01ab\x00" + b"A" * 100 + b"\xffxyz"
+    expected = [(0x1001, b"hello"), (0x100A, b"A" * 100)]
+
+    for chunk_size in (1, 3, 7, 64, len(data)):
+        assert extract_in_chunks(data, 4, "ascii", chunk_size) == expected
+    assert extract_in_chunks(data, 2, "ascii", 5) == [
+        (0x1001, b"hello"),
+        (0x1007, b"ab"),
+        (0x100A, b"A" * 100),
+        (0x106F, b"xyz"),
+    ]
+
+
+def test_string_extractor_utf16():
+    data = b"\x01" + "hello".encode("utf-16le") + b"\x00\x00" + "abc".encode("utf-16le") + b"xy"
+    expected = [(m.start() + 0x1000, m.group()) for m in re.finditer(rb"(?:[ -~]\x00){3,}", data)]
+    assert [value.decode("utf-16le") for _, value in expected] == ["hello", "abc"]
+
+    for chunk_size in (1, 2, 3, 5, len(data)):
+        assert extract_in_chunks(data, 3, "utf-16le", chunk_size) == expected
+
+
+def test_string_extractor_gap():
+    extractor = StringExtractor(3)
+    assert extractor.feed(0x1000, b"\x00abc") == []
+    # Memory that doesn't continue the previous chunk ends the carried string
+    assert extractor.feed(0x2000, b"def\x00") == [(0x1001, b"abc"), (0x2000, b"def")]
+    assert extractor.finish() == []
+
+
+def test_string_extractor_long_run():
+    # A printable region much longer than the chunks is kept as one open string
+    data = b"\x00" + b"A" * 0x10000 + b"\x01xyz\x01" + "Bc".encode("utf-16le") * 0x1000 + b"\x01"
+    assert extract_in_chunks(data, 4, "ascii", 0x100) == [(0x1001, b"A" * 0x10000)]
+    assert extract_in_chunks(data, 3, "ascii", 0x100) == [
+        (0x1001, b"A" * 0x10000),
+        (0x11002, b"xyz"),
+    ]
+    for chunk_size in (0x100, 0x101):
+        assert extract_in_chunks(data, 4, "utf-16le", chunk_size) == [
+            (0x11006, "Bc".encode("utf-16le") * 0x1000)
+        ]